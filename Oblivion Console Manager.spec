@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('styles.qss', '.'), ('icons', 'icons'), ('data', 'data'), ('styles.qss', '.')],
-    hiddenimports=['PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.sip', 'pyautogui', 'psutil', 'json_loader', 'game_connector', 'ui_builder', 'enhanced_ui_main'],
+    hiddenimports=['PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.sip', 'pyautogui', 'pyperclip', 'psutil', 'json_loader', 'catalog_records', 'catalog_store', 'catalog_model', 'formid_index', 'search_index', 'fuzzy_search', 'search_worker', 'lazy_imports', 'input_timing', 'game_backends', 'perf_metrics', 'game_connector', 'command_dispatcher', 'game_monitor', 'ui_builder', 'enhanced_ui_main'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
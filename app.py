@@ -1,20 +1,63 @@
+import importlib.util
 import sys
+import threading
 from PyQt6.QtWidgets import QApplication, QSplashScreen, QProgressBar, QVBoxLayout, QLabel, QWidget
 from PyQt6.QtGui import QIcon, QPixmap, QFont
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QObject, QEventLoop, pyqtSignal
 import os
 import PyQt6
 
+# Splash screen text and progress range (start %, end %) for each startup stage
+STARTUP_STAGES = {
+    "manifest": ("Scanning data files...", 0, 10),
+    "catalog": ("Loading catalog...", 10, 85),
+    "ui": ("Building interface...", 85, 100),
+}
+
+
+class StartupLoader(QObject):
+    """Loads the catalog on a worker thread while the splash screen paints.
+    
+    Progress and completion are signals, so the splash screen is updated
+    on the GUI thread.
+    """
+    
+    # stage, done, total (see OblivionDataLoader.load_all_json_data)
+    progressChanged = pyqtSignal(str, int, int)
+    # whether the data files loaded, and why not if they didn't
+    finished = pyqtSignal(bool, str)
+    
+    def __init__(self, data_loader, parent=None):
+        super().__init__(parent)
+        self.data_loader = data_loader
+        self._thread = threading.Thread(target=self._run, name="StartupLoader", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def _run(self):
+        error = ""
+        try:
+            loaded = self.data_loader.load_all_json_data(progress=self.progressChanged.emit)
+            if not loaded:
+                error = f"Data directory not found: {self.data_loader.data_directory}"
+        except Exception as e:
+            print(f"Error loading data files: {e}")
+            loaded = False
+            error = str(e)
+        self.finished.emit(loaded, error)
+
 def check_requirements():
-    """Check if required packages are installed"""
+    """Check if required packages are installed, without importing them"""
     try:
-        from PyQt6.QtMultimedia import QMediaPlayer
-        from PyQt6.QtMultimediaWidgets import QVideoWidget
-        return True
+        found = all(importlib.util.find_spec(name) is not None
+                    for name in ("PyQt6.QtMultimedia", "PyQt6.QtMultimediaWidgets"))
     except ImportError:
+        found = False
+    if not found:
         print("Missing required packages for video functionality.")
         print("Install required packages with: pip install PyQt6-Qt6 PyQt6-sip PyQt6-tools PyQt6-QtMultimedia")
-        return False
+    return found
 
 def ensure_data_directory():
     """Make sure the data directory exists and properly prepare it"""
@@ -61,7 +104,7 @@ def show_splash_screen():
     layout = QVBoxLayout()
     layout.setContentsMargins(20, splash_pix.height() - 50, 20, 20)
     
-    # Add loading text
+    # Add loading text (updated with the current startup stage)
     loading_label = QLabel("Loading Oblivion Console Manager...")
     loading_label.setStyleSheet("color: white; font-weight: bold;")
     loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -91,19 +134,59 @@ def show_splash_screen():
     container.setLayout(layout)
     container.setFixedWidth(splash_pix.width())
     
+    # Keep the widgets that show the startup stage
+    splash.loading_label = loading_label
+    splash.progress = progress
+    
     # Show splash screen
     splash.show()
-    
-    # Simulate loading progress
-    for i in range(1, 101):
-        progress.setValue(i)
-        QApplication.processEvents()
-        # Add small delays to show progress
-        import time
-        time.sleep(0.02)
+    QApplication.processEvents()
     
     return splash
 
+def update_splash(splash, stage, done, total):
+    """Show a startup stage's progress on the splash screen"""
+    if stage not in STARTUP_STAGES:
+        return
+    text, start, end = STARTUP_STAGES[stage]
+    splash.loading_label.setText(text)
+    splash.progress.setValue(start + (end - start) * done // max(total, 1))
+
+def load_catalog(splash):
+    """Load the catalog on a worker thread, keeping the splash screen painted.
+    
+    Returns the loaded OblivionDataLoader. Raises RuntimeError if the
+    data files could not be loaded.
+    """
+    from json_loader import OblivionDataLoader
+    
+    # Item categories are loaded on first use, or by the main window once it is shown
+    data_loader = OblivionDataLoader("data", lazy=True)
+    loader = StartupLoader(data_loader)
+    loader.progressChanged.connect(lambda stage, done, total: update_splash(splash, stage, done, total))
+    
+    result = {}
+    loop = QEventLoop()
+    
+    def on_finished(loaded, error):
+        result["loaded"] = loaded
+        result["error"] = error
+        loop.quit()
+    
+    loader.finished.connect(on_finished)
+    loader.start()
+    
+    # Import the UI module on this thread while the catalog loads
+    import enhanced_ui_main
+    
+    # Queued signals are only delivered by the event loop, so none can be missed here
+    if "loaded" not in result:
+        loop.exec()
+    
+    if not result["loaded"]:
+        raise RuntimeError(f"Failed to load data files: {result['error']}")
+    return data_loader
+
 def main():
     # Check requirements
     requirements_met = check_requirements()
@@ -127,12 +210,19 @@ def main():
         
     # Create and show main window
     try:
+        # Load the catalog behind the splash screen
+        data_loader = load_catalog(splash)
+        
+        update_splash(splash, "ui", 0, 1)
+        QApplication.processEvents()
+        
         # Use the enhanced UI version
         from enhanced_ui_main import MainWindow
-        window = MainWindow()
+        window = MainWindow(data_loader)
         window.show()
         
-        # Close splash screen after main window appears
+        # Close splash screen as soon as the main window appears
+        update_splash(splash, "ui", 1, 1)
         splash.finish(window)
         
         # If missing requirements, show warning
@@ -150,6 +240,7 @@ def main():
         sys.exit(app.exec())
     except Exception as e:
         from PyQt6.QtWidgets import QMessageBox
+        splash.close()
         error_box = QMessageBox()
         error_box.setIcon(QMessageBox.Icon.Critical)
         error_box.setWindowTitle("Startup Error")
@@ -159,4 +250,8 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Large catalogs are compiled in worker processes; in a frozen build
+    # they start from this executable and must run their job, not the app
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
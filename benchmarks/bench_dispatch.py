@@ -0,0 +1,166 @@
+"""Command dispatcher throughput and latency through the loopback backend.
+
+Runs the real CommandDispatcher and game_connector sessions (process
+check, timing profile, console session) against game_backends'
+LoopbackBackend, so it needs neither Windows nor the game and can run in
+CI. The timing profile's sleeps are multiplied by --time-scale to keep
+the run short; latencies are from submit() to the command arriving at the
+loopback game.
+
+Workloads:
+  interactive  one command at a time, each waited for, like clicking
+  burst        --count single commands submitted at once
+  batch        one bulk job of --count commands (typed, in one session)
+  mixed        a bulk job of --count commands, with an interactive command
+               submitted every 0.1 s meanwhile; only those are measured
+
+Prints JSON; --compare checks it against an earlier --output file.
+
+    python benchmarks/bench_dispatch.py [--count 50] [--time-scale 0.02]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop
+
+import game_connector
+from command_dispatcher import BULK, INTERACTIVE, CommandDispatcher
+from game_backends import LoopbackBackend, set_backend
+from input_timing import TimingProfile
+
+
+def wait_for(condition, timeout=120.0, raise_on_timeout=True):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            if not raise_on_timeout:
+                return
+            raise RuntimeError("the dispatcher did not finish in time")
+        QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def summarize(submitted, backend, started, finished):
+    """Return throughput and latency stats for the commands in submitted"""
+    arrived = {command: at for at, command in backend.commands}
+    latencies = sorted((arrived[command] - at) * 1000
+                       for command, at in submitted.items() if command in arrived)
+    if not latencies:
+        return {"received": 0, "commands": len(submitted)}
+    return {
+        "commands": len(submitted),
+        "received": len(latencies),
+        "dropped_input": backend.dropped,
+        "commands_per_s": round(len(latencies) / (finished - started), 2),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies), 1),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+            "max": round(latencies[-1], 1),
+        },
+    }
+
+
+def run_workload(name, count, dispatcher, backend):
+    backend.clear()
+    finished_jobs = []
+    dispatcher.jobFinished.connect(lambda job_id, results, context: finished_jobs.append(job_id))
+    commands = [f"player.additem 0000000F {name}{n}" for n in range(count)]
+    submitted = {}
+
+    started = time.perf_counter()
+    if name == "interactive":
+        for command in commands:
+            submitted[command] = time.perf_counter()
+            dispatcher.submit([command])
+            wait_for(lambda: len(finished_jobs) == len(submitted))
+    elif name == "burst":
+        for command in commands:
+            submitted[command] = time.perf_counter()
+            dispatcher.submit([command])
+        wait_for(lambda: len(finished_jobs) == count)
+    elif name == "mixed":
+        dispatcher.submit(commands, lane=BULK)
+        while dispatcher.pending(BULK):
+            command = f"tgm {len(submitted)}"
+            submitted[command] = time.perf_counter()
+            dispatcher.submit([command], lane=INTERACTIVE)
+            wait_for(lambda: False, timeout=0.1, raise_on_timeout=False)
+        wait_for(lambda: len(finished_jobs) == len(submitted) + 1)
+    else:
+        at = time.perf_counter()
+        submitted = dict.fromkeys(commands, at)
+        dispatcher.submit(commands, lane=BULK)
+        wait_for(lambda: finished_jobs)
+    finished = time.perf_counter()
+
+    dispatcher.jobFinished.disconnect()
+    return summarize(submitted, backend, started, finished)
+
+
+def compare(results, baseline, tolerance):
+    """Return messages for workloads slower than baseline by more than tolerance"""
+    messages = []
+    for name, stats in results["workloads"].items():
+        before = baseline.get("workloads", {}).get(name)
+        if not before or "commands_per_s" not in before or "commands_per_s" not in stats:
+            continue
+        if stats["commands_per_s"] < before["commands_per_s"] / (1 + tolerance):
+            messages.append(f"{name}: {stats['commands_per_s']} commands/s, "
+                            f"was {before['commands_per_s']}")
+        if stats["received"] < stats["commands"]:
+            messages.append(f"{name}: only {stats['received']} of {stats['commands']} received")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50, help="commands per workload")
+    parser.add_argument("--time-scale", type=float, default=0.02,
+                        help="multiplier for the timing profile's sleeps")
+    parser.add_argument("--workloads", default="interactive,burst,batch,mixed")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="fail if slower than this earlier --output file")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed throughput drop for --compare, as a fraction")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    backend = LoopbackBackend()
+    set_backend(backend)
+    game_connector.DISPATCH_MODE = "type"
+    game_connector.set_timing_profile(
+        TimingProfile(path=None, sleep=lambda seconds: time.sleep(seconds * args.time_scale)))
+    dispatcher = CommandDispatcher()
+
+    results = {"count": args.count, "time_scale": args.time_scale, "workloads": {}}
+    try:
+        for name in args.workloads.split(","):
+            # The game's console log is noise here
+            with contextlib.redirect_stdout(io.StringIO()):
+                results["workloads"][name] = run_workload(name, args.count, dispatcher, backend)
+    finally:
+        dispatcher.stop()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            messages = compare(results, json.load(f), args.tolerance)
+        for message in messages:
+            print(f"REGRESSION {message}")
+        sys.exit(1 if messages else 0)
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Per-keystroke latency of the ranked global search on a synthetic catalog.
+
+Builds a SearchIndex over N generated item names (100k by default), then
+types each query one character at a time and times search_ranked() for
+every prefix, the way the search box sees it. Prints JSON with the
+median, p95 and max latency per query and overall.
+
+    python benchmarks/bench_search.py [--records 100000] [--limit 200]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+PREFIXES = ["Akaviri", "Elven", "Glass", "Daedric", "Ebony", "Dwarven", "Iron",
+            "Steel", "Silver", "Orcish", "Fine", "Rusty", "Enchanted", "Blessed",
+            "Cursed", "Ancient", "Shadow", "Frost", "Flame", "Storm"]
+NOUNS = ["Dai-Katana", "Katana", "Longsword", "Shortsword", "Claymore", "Dagger",
+         "Mace", "Warhammer", "Battle Axe", "War Axe", "Bow", "Cuirass", "Greaves",
+         "Helmet", "Shield", "Gauntlets", "Boots", "Ring", "Amulet", "Potion",
+         "Scroll", "Robe", "Hood", "Staff", "Arrow"]
+SUFFIXES = ["", "", "", "of Fire", "of Frost", "of Shock", "of the Mage",
+            "of Fortify Strength", "of Absorb Health", "of Silence"]
+
+# Clean queries, subsequences and typos, typed keystroke by keystroke
+QUERIES = ["dai katana", "dai katan", "akavri", "akaviri dai", "glass longsword",
+           "glss lngswrd", "daedirc", "ebony shield of", "potion", "0001c3"]
+
+
+def build_catalog(records, seed):
+    """Generate (name, form_id) pairs"""
+    rng = random.Random(seed)
+    catalog = []
+    for number in range(records):
+        name = " ".join(part for part in (rng.choice(PREFIXES), rng.choice(NOUNS),
+                                          rng.choice(SUFFIXES)) if part)
+        catalog.append((name, f"{0x10000 + number:08X}"))
+    return catalog
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(timings):
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.records, args.seed)
+    start = time.perf_counter()
+    index = SearchIndex()
+    for row, (name, form_id) in enumerate(catalog):
+        index.add_document(("item", "Weapons", row), (name, form_id))
+    build_seconds = time.perf_counter() - start
+
+    # The first fuzzy search builds the key blob; keep that out of the keystrokes
+    index.search_ranked("warmup", args.limit)
+
+    all_timings = []
+    queries = {}
+    for query in QUERIES:
+        timings = []
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = index.search_ranked(query[:length], args.limit)
+            timings.append(time.perf_counter() - start)
+        all_timings.extend(timings)
+        top = catalog[results[0][1][2]][0] if results else None
+        queries[query] = dict(summarize(timings), results=len(results), top=top)
+
+    print(json.dumps({
+        "records": args.records,
+        "limit": args.limit,
+        "index_build_s": round(build_seconds, 3),
+        "keystrokes": len(all_timings),
+        "overall": summarize(all_timings),
+        "queries": queries,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
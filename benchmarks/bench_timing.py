@@ -0,0 +1,111 @@
+"""Input timing against a fake console: calibration, adaptation and back-off.
+
+Drives game_connector's real console sessions into game_backends'
+LoopbackBackend with the game's latencies, on a virtual clock, so nothing
+is typed anywhere and the run takes a moment. Prints JSON with, for the
+default delays, the calibrated delays and the adapted delays: how long a
+single command and a 29-line batch take (virtual seconds), how long a
+second batch sent straight after takes, and whether every command
+arrived. It then makes the game slower to take focus to show the profile
+backing off.
+
+    python benchmarks/bench_timing.py [--focus 0.3] [--open 0.25] [--sessions 60]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_connector
+from game_backends import LoopbackBackend, set_backend
+from input_timing import TimingProfile
+
+BATCH = [f'player.setav "{name}" 100' for name in (
+    "Acrobatics", "Alchemy", "Alteration", "Armorer", "Athletics", "Blade", "Block",
+    "Blunt", "Conjuration", "Destruction", "HandtoHand", "HeavyArmor", "Illusion",
+    "LightArmor", "Marksman", "Mercantile", "Mysticism", "Restoration", "Security",
+    "Sneak", "Speechcraft", "Strength", "Intelligence", "Willpower", "Agility",
+    "Speed", "Endurance", "Personality", "Luck")]
+
+
+def run_session(game, commands, pace="line", from_app=False):
+    """Send commands in one session; return (virtual seconds, all received).
+
+    from_app=True clicks the app first, as before a command picked in it;
+    otherwise the session directly follows the last one, as queued jobs do.
+    """
+    if from_app:
+        game.click_app()
+    before = len(game.commands)
+    start = game.now()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_connector.send_commands_to_game(commands, pace=pace)
+    return game.now() - start, game.received()[before:] == list(commands)
+
+
+def measure(game, profile):
+    dropped = game.dropped
+    single_seconds, single_ok = run_session(game, ["tgm"], pace="single_line", from_app=True)
+    batch_seconds, batch_ok = run_session(game, BATCH, from_app=True)
+    next_seconds, next_ok = run_session(game, BATCH)
+    return {
+        "delays": {name: round(value, 3) for name, value in profile.delays.items()},
+        "single_s": round(single_seconds, 3),
+        "batch_s": round(batch_seconds, 3),
+        "next_batch_s": round(next_seconds, 3),
+        "all_received": single_ok and batch_ok and next_ok,
+        "dropped_keys": game.dropped - dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--focus", type=float, default=0.3, help="fake focus latency (s)")
+    parser.add_argument("--open", type=float, default=0.25, help="fake console open latency (s)")
+    parser.add_argument("--sessions", type=int, default=60,
+                        help="successful sessions to adapt over")
+    args = parser.parse_args()
+
+    game = LoopbackBackend(focus_latency=args.focus, open_latency=args.open, key_time=0.002,
+                           virtual_clock=True)
+    profile = TimingProfile(path=None, sleep=game.sleep)
+    set_backend(game)
+    game_connector.is_game_running = lambda *args, **kwargs: True
+    game_connector.set_timing_profile(profile)
+    results = {"fake_latencies": {"focus": args.focus, "open": args.open}}
+
+    results["default"] = measure(game, profile)
+
+    def trial():
+        return run_session(game, [game_connector.CALIBRATION_COMMAND], pace="single_line",
+                           from_app=True)[1]
+
+    results["calibration_scale"] = round(profile.calibrate(trial, attempts=3), 3)
+    results["calibrated"] = measure(game, profile)
+
+    # Sessions that keep succeeding shrink the delays further; every other
+    # one follows the last directly, with the game still focused
+    failures = 0
+    for session in range(args.sessions):
+        failures += not run_session(game, ["tgm"], from_app=session % 2 == 0)[1]
+    results["adapted"] = dict(measure(game, profile), failed_sessions=failures)
+
+    # The machine gets slower to switch windows: the profile backs off.
+    # (A slower console would go unnoticed until the next calibration;
+    # game_connector can only check focus)
+    game.focus_latency *= 3
+    recovery = 0
+    while (not run_session(game, ["tgm"], pace="single_line", from_app=True)[1]
+           and recovery < 20):
+        recovery += 1
+    results["slowed_down"] = dict(measure(game, profile), sessions_to_recover=recovery)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
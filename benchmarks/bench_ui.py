@@ -0,0 +1,197 @@
+"""Startup and interaction timings of the app, headless.
+
+Runs the real loader and main window on Qt's offscreen platform against a
+fake game (see qt_harness.py), for the stock data/ set and for synthetic
+catalogs 10x and 100x its size. For each catalog it times:
+
+  load_cold        OblivionDataLoader.load_all_json_data with no cache
+  load_warm        the same with the compiled cache in place
+  construct        MainWindow(data_loader)
+  first_paint      MainWindow.show() until the window first paints
+  search_keystroke one keystroke in the global search box until its
+                   results are shown (debounce disabled)
+  selector_filter  one keystroke in an item selector's filter box
+  favorites_add    adding a favorite and saving settings
+  favorites_load   reading favorites back from settings and listing them
+
+Prints JSON with the median, p95 and max of each, in milliseconds. With
+--compare, a previous run's JSON is checked too, and the exit status is 1
+if any median got slower by more than --tolerance.
+
+    python benchmarks/bench_ui.py [--scales 1,10,100] [--repeat 3]
+                                  [--output run.json] [--compare base.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import qt_harness
+from bench_search import summarize
+
+# Typed keystroke by keystroke into the global search box
+SEARCH_QUERIES = ["glass", "akavri", "daedric dagger", "0001"]
+# Typed into the selector's filter box, per category
+SELECTOR_QUERIES = {"Weapons": "glass long", "Armor": "ebony", "Spells": "fire"}
+FAVORITES = 25
+
+
+def time_call(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_catalog(data_dir, scratch_dir, repeat, timings):
+    """Run every benchmark against the data in data_dir, adding to timings"""
+    from PyQt6.QtCore import QSettings
+    from json_loader import OblivionDataLoader
+    import enhanced_ui_main
+
+    def record(name, seconds):
+        timings.setdefault(name, []).append(seconds)
+
+    data_loader = None
+    for run in range(repeat):
+        cache_path = os.path.join(scratch_dir, f"catalog-{run}.cache")
+        for name in ("load_cold", "load_warm"):
+            data_loader = OblivionDataLoader(data_dir, cache_path=cache_path)
+            seconds, loaded = time_call(data_loader.load_all_json_data)
+            if not loaded:
+                raise RuntimeError(f"loading {data_dir} failed")
+            record(name, seconds)
+
+    for run in range(repeat):
+        QSettings("OblivionConsoleManager", "Settings").clear()
+        seconds, window = time_call(enhanced_ui_main.MainWindow, data_loader)
+        record("construct", seconds)
+        record("first_paint", qt_harness.time_to_first_paint(window))
+        if run == 0:
+            bench_search(window, record)
+            bench_selectors(window, record)
+            bench_favorites(window, record)
+        window.search_worker.stop()
+        qt_harness.close_window(window)
+
+
+def bench_search(window, record):
+    """Time each keystroke of the global search until its results are on screen"""
+    worker = window.search_worker
+    worker._debounce_timer.setInterval(0)
+    # Index building is startup work, not a keystroke
+    window.data_loader.build_search_index()
+
+    shown = []
+    worker.resultsReady.connect(lambda generation, query, results: shown.append(query))
+    for query in SEARCH_QUERIES:
+        for length in range(1, len(query) + 1):
+            typed = query[:length]
+            del shown[:]
+            start = time.perf_counter()
+            window.search_box.setText(typed)
+            if not qt_harness.wait_until(lambda: typed in shown):
+                raise RuntimeError(f"no results shown for '{typed}'")
+            record("search_keystroke", time.perf_counter() - start)
+        window.search_box.setText("")
+
+
+def bench_selectors(window, record):
+    """Time each keystroke typed into an item selector's filter box"""
+    for category, query in SELECTOR_QUERIES.items():
+        if category not in window.item_page_categories:
+            continue
+        selector = window.ensure_item_page(category)
+        for length in range(1, len(query) + 1):
+            seconds, _ = time_call(selector.search_box.setText, query[:length])
+            record("selector_filter", seconds)
+        selector.search_box.setText("")
+
+
+def bench_favorites(window, record):
+    """Time adding favorites one by one, then loading them back"""
+    builder = window.builder_widget
+    commands = list(window.data_loader.get_all_commands().items())[:FAVORITES]
+    for name, data in commands:
+        builder.current_command = name
+        builder.current_data = data
+        seconds, _ = time_call(window.add_to_favorites)
+        record("favorites_add", seconds)
+
+    def load_favorites():
+        window.initialize_category_items()
+        window.load_settings()
+        window.on_command_category_clicked("Favorites")
+
+    for _ in range(5):
+        seconds, _ = time_call(load_favorites)
+        record("favorites_load", seconds)
+    if window.command_list.count() != len(commands):
+        raise RuntimeError(f"{window.command_list.count()} favorites listed, "
+                           f"expected {len(commands)}")
+
+
+def compare(results, baseline, tolerance):
+    """Return the benchmarks whose median regressed against baseline"""
+    regressions = []
+    for catalog, benchmarks in results["catalogs"].items():
+        for name, summary in benchmarks.items():
+            before = baseline.get("catalogs", {}).get(catalog, {}).get(name)
+            if before and summary["median_ms"] > before["median_ms"] * (1 + tolerance) + 1:
+                regressions.append(f"{catalog} {name}: median {summary['median_ms']} ms, "
+                                   f"was {before['median_ms']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated catalog sizes as multiples of data/")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="also write the JSON to this file")
+    parser.add_argument("--compare", help="JSON of an earlier run to check against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown of a median against --compare")
+    args = parser.parse_args()
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    with tempfile.TemporaryDirectory(prefix="ocm-bench-") as scratch_dir:
+        # Keep the application alive for the whole run
+        app, game = qt_harness.setup(scratch_dir)
+        results = {"repeat": args.repeat, "catalogs": {}}
+        for scale in scales:
+            name = "stock" if scale == 1 else f"{scale}x"
+            if scale == 1:
+                data_dir = qt_harness.STOCK_DATA
+            else:
+                data_dir = qt_harness.write_scaled_catalog(
+                    os.path.join(scratch_dir, f"data-{scale}x"), scale)
+            catalog_scratch = os.path.join(scratch_dir, name)
+            os.makedirs(catalog_scratch, exist_ok=True)
+
+            timings = {}
+            bench_catalog(data_dir, catalog_scratch, max(1, args.repeat), timings)
+            results["catalogs"][name] = {
+                benchmark: dict(summarize(values), samples=len(values))
+                for benchmark, values in timings.items()
+            }
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        results["regressions"] = regressions
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    # Skip Qt's teardown of the remaining objects; the numbers are out
+    sys.stdout.flush()
+    os._exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
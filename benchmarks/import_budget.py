@@ -0,0 +1,135 @@
+"""Import-time budget for the startup path, measured with python -X importtime.
+
+Imports the modules the app needs before its window appears in a fresh
+interpreter, several times, and keeps the fastest cumulative time of
+each module. Prints JSON with the totals, the app's own modules and the
+budget, and exits with status 1 when:
+
+  * a module listed under "deferred" in the budget was imported at all
+    (pyautogui, psutil and QtMultimedia must load on first use), or
+  * the total or an app module takes longer than its recorded time by
+    more than the budget's tolerance.
+
+    python benchmarks/import_budget.py [--runs 5] [--update]
+
+--update records the current times as the new budget. Times depend on the
+machine, so record the budget on the machine that checks it.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+# What app.main() imports before the main window is shown
+STARTUP_IMPORTS = "import app, enhanced_ui_main"
+
+DEFAULT_BUDGET = {
+    "deferred": ["pyautogui", "psutil", "PyQt6.QtMultimedia", "PyQt6.QtMultimediaWidgets"],
+    # Allowed slowdown as a fraction of the recorded time, plus a fixed
+    # allowance so sub-millisecond modules don't trip on noise
+    "tolerance": 0.5,
+    "slack_ms": 5.0,
+    "total_ms": None,
+    "modules": {},
+}
+
+
+def import_times(statement):
+    """Run statement under -X importtime and return [(depth, name, cumulative_ms)]"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+    return entries
+
+
+def measure(runs):
+    """Return (total_ms, app module times, every imported module name), fastest of runs"""
+    # Modules the bare interpreter imports on its own are not the app's cost
+    interpreter = {name for _, name, _ in import_times("pass")}
+    app_modules = {name[:-3] for name in os.listdir(ROOT) if name.endswith(".py")}
+
+    total = None
+    modules = {}
+    imported = set()
+    for _ in range(runs):
+        entries = import_times(STARTUP_IMPORTS)
+        run_total = sum(ms for depth, name, ms in entries
+                        if depth == 0 and name not in interpreter)
+        total = run_total if total is None else min(total, run_total)
+        for _, name, ms in entries:
+            imported.add(name)
+            if name in app_modules:
+                modules[name] = min(modules.get(name, ms), ms)
+    return total, modules, imported
+
+
+def check(budget, total, modules, imported):
+    """Return a list of budget violations"""
+    problems = []
+    for name in budget["deferred"]:
+        if name in imported:
+            problems.append(f"{name} is imported at startup")
+
+    def over(recorded, measured):
+        return measured > recorded * (1 + budget["tolerance"]) + budget["slack_ms"]
+
+    if budget["total_ms"] is not None and over(budget["total_ms"], total):
+        problems.append(f"startup imports took {total:.1f} ms, budget {budget['total_ms']:.1f} ms")
+    for name, recorded in sorted(budget["modules"].items()):
+        measured = modules.get(name)
+        if measured is not None and over(recorded, measured):
+            problems.append(f"{name} took {measured:.1f} ms, budget {recorded:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true",
+                        help="record the current times as the budget")
+    args = parser.parse_args()
+
+    budget = dict(DEFAULT_BUDGET)
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH, "r", encoding="utf-8") as f:
+            budget.update(json.load(f))
+
+    total, modules, imported = measure(max(1, args.runs))
+
+    if args.update:
+        budget["total_ms"] = round(total, 1)
+        budget["modules"] = {name: round(ms, 1) for name, ms in sorted(modules.items())}
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+
+    problems = check(budget, total, modules, imported)
+    print(json.dumps({
+        "statement": STARTUP_IMPORTS,
+        "runs": args.runs,
+        "total_ms": round(total, 1),
+        "modules": {name: round(ms, 1) for name, ms in sorted(modules.items())},
+        "deferred_imported": sorted(name for name in budget["deferred"] if name in imported),
+        "budget": {"total_ms": budget["total_ms"], "tolerance": budget["tolerance"],
+                   "slack_ms": budget["slack_ms"]},
+        "problems": problems,
+    }, indent=2))
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Headless harness for the UI benchmarks.
+
+Runs the app on Qt's offscreen platform with game_backends'
+LoopbackBackend as the game (and a game process that is always found),
+silent message boxes and settings kept in a scratch directory, so a
+benchmark never touches the game, the user's settings or the user's
+catalog cache. Also writes synthetic data directories that scale the
+stock catalog up.
+"""
+import json
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STOCK_DATA = os.path.join(ROOT, "data")
+
+# Words appended to the names of synthetic copies so they stay searchable
+VARIANTS = ["Replica", "Ancient", "Gilded", "Worn", "Blessed", "Cursed", "Fine",
+            "Rusty", "Shadow", "Frost", "Flame", "Storm"]
+
+
+def _pyautogui_stub():
+    """Return an empty pyautogui module; input goes to the loopback game instead"""
+    module = types.ModuleType("pyautogui")
+    module.FAILSAFE = False
+    module.PAUSE = 0
+    return module
+
+
+class SilentMessageBox:
+    """QMessageBox stand-in that answers every dialog without showing it"""
+
+    StandardButton = None
+
+    @classmethod
+    def _answer(cls, *args, **kwargs):
+        return cls.StandardButton.Yes
+
+    information = warning = critical = question = _answer
+
+
+def setup(scratch_dir, game=None):
+    """Prepare an offscreen QApplication and return (app, game).
+
+    game is the LoopbackBackend console sessions go to (a new one by
+    default); the session delays are zero. Must run before the app's
+    modules are imported: pyautogui is replaced in sys.modules, and
+    settings and the catalog cache go to scratch_dir.
+    """
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(scratch_dir, "config")
+    os.environ["XDG_CACHE_HOME"] = os.path.join(scratch_dir, "cache")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    # The app loads icons and data relative to its own directory
+    os.chdir(ROOT)
+
+    sys.modules["pyautogui"] = _pyautogui_stub()
+
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    app = QApplication.instance() or QApplication([])
+
+    import enhanced_ui_main
+    import game_connector
+    from game_backends import LoopbackBackend, set_backend
+    from input_timing import TimingProfile
+
+    game = game or LoopbackBackend()
+    set_backend(game)
+    game_connector.set_timing_profile(TimingProfile(path=None, sleep=lambda seconds: None))
+    game_connector.DISPATCH_MODE = "type"
+    SilentMessageBox.StandardButton = QMessageBox.StandardButton
+    enhanced_ui_main.QMessageBox = SilentMessageBox
+    game_connector.is_game_running = lambda *args, **kwargs: True
+    return app, game
+
+
+def wait_until(condition, timeout=30.0):
+    """Process events until condition() is true; return False on timeout"""
+    from PyQt6.QtCore import QEventLoop
+    from PyQt6.QtWidgets import QApplication
+
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    return True
+
+
+def time_to_first_paint(window, timeout=30.0):
+    """Show window and return the seconds until any of its widgets paints"""
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication, QWidget
+
+    painted = []
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, receiver, event):
+            if (not painted and event.type() == QEvent.Type.Paint
+                    and isinstance(receiver, QWidget) and receiver.window() is window):
+                painted.append(time.perf_counter())
+            return False
+
+    watcher = PaintWatcher()
+    app = QApplication.instance()
+    app.installEventFilter(watcher)
+    try:
+        start = time.perf_counter()
+        window.show()
+        if not wait_until(lambda: painted, timeout):
+            raise RuntimeError("the window never painted")
+        return painted[0] - start
+    finally:
+        app.removeEventFilter(watcher)
+
+
+def close_window(window):
+    """Close a benchmark window and let Qt delete it"""
+    from PyQt6.QtCore import QEvent
+    from PyQt6.QtWidgets import QApplication
+
+    window.close()
+    window.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    QApplication.processEvents()
+
+
+def write_scaled_catalog(target_dir, scale):
+    """Write the stock data files to target_dir with every item repeated scale times.
+
+    Copies get a variant word in their name and a distinct ID (also
+    patched into the item's console command). Command files are copied
+    as they are. Returns target_dir.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    for file_name in sorted(os.listdir(STOCK_DATA)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(STOCK_DATA, file_name), "r", encoding="utf-8") as f:
+            records = json.load(f)
+
+        if scale > 1 and isinstance(records, list) and records and "Command" not in records[0]:
+            scaled = []
+            for record in records:
+                scaled.append(record)
+                for copy in range(1, scale):
+                    scaled.append(_copy_record(record, copy))
+            records = scaled
+
+        with open(os.path.join(target_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+    return target_dir
+
+
+def _copy_record(record, copy):
+    """Return a renamed, re-IDed copy of an item record"""
+    suffix = f"{copy:X}"
+    variant = f"{VARIANTS[copy % len(VARIANTS)]} {copy}"
+    result = dict(record)
+    for key, value in record.items():
+        if not isinstance(value, str):
+            continue
+        if key.endswith("ID") and value:
+            result[key] = value + suffix
+        elif key in ("Name", "Effect") and value:
+            result[key] = f"{value} {variant}"
+    cheat = result.get("Copy Paste Cheat")
+    if isinstance(cheat, str):
+        for key, value in record.items():
+            if key.endswith("ID") and isinstance(value, str) and value and value in cheat:
+                result["Copy Paste Cheat"] = cheat.replace(value, result[key])
+                break
+    return result
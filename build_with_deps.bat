@@ -37,9 +37,23 @@ pyinstaller --name="Oblivion Console Manager" ^
     --hidden-import=PyQt6.QtWidgets ^
     --hidden-import=PyQt6.sip ^
     --hidden-import=pyautogui ^
+    --hidden-import=pyperclip ^
     --hidden-import=psutil ^
     --hidden-import=json_loader ^
+    --hidden-import=catalog_records ^
+    --hidden-import=catalog_store ^
+    --hidden-import=catalog_model ^
+    --hidden-import=formid_index ^
+    --hidden-import=search_index ^
+    --hidden-import=fuzzy_search ^
+    --hidden-import=search_worker ^
+    --hidden-import=lazy_imports ^
+    --hidden-import=input_timing ^
+    --hidden-import=game_backends ^
+    --hidden-import=perf_metrics ^
     --hidden-import=game_connector ^
+    --hidden-import=command_dispatcher ^
+    --hidden-import=game_monitor ^
     --hidden-import=ui_builder ^
     --hidden-import=enhanced_ui_main ^
     --exclude-module=PyQt5 ^
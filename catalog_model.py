@@ -0,0 +1,129 @@
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, QSortFilterProxyModel, Qt
+
+
+class CatalogModel(QAbstractItemModel):
+    """Shared two-level model over the item catalog: categories, then their items.
+
+    Every item selector views the same model. A category's items are
+    listed in name order and are only read from the data loader when a
+    view first asks for them. Item indexes carry their store row ID under
+    Qt.ItemDataRole.UserRole.
+    """
+
+    # Internal ID of category indexes; item indexes use category position + 1
+    _CATEGORY = 0
+
+    def __init__(self, data_loader, parent=None):
+        super().__init__(parent)
+        self.data_loader = data_loader
+        self._categories = []
+        self._category_positions = {}
+        # category position -> row IDs in name order
+        self._rows = {}
+
+    def category_index(self, category):
+        """Return the index of a category, adding it to the model if needed"""
+        position = self._category_positions.get(category)
+        if position is None:
+            position = len(self._categories)
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._categories.append(category)
+            self._category_positions[category] = position
+            self.endInsertRows()
+        return self.index(position, 0)
+
+    def row_id(self, parent, position):
+        """Return the store row ID of the item at position under a category index"""
+        return self._item_rows(parent.row())[position]
+
+    def _item_rows(self, category_position):
+        rows = self._rows.get(category_position)
+        if rows is None:
+            category = self._categories[category_position]
+            # The store caches the name order, so this is a dict lookup after the first time
+            rows = self.data_loader.get_category_items(category).sorted("name").rows
+            self._rows[category_position] = rows
+        return rows
+
+    # QAbstractItemModel interface
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row < len(self._categories):
+                return self.createIndex(row, 0, self._CATEGORY)
+            return QModelIndex()
+        if parent.internalId() == self._CATEGORY and row < len(self._item_rows(parent.row())):
+            return self.createIndex(row, 0, parent.row() + 1)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == self._CATEGORY:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, self._CATEGORY)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._categories)
+        if parent.internalId() == self._CATEGORY:
+            return len(self._item_rows(parent.row()))
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == self._CATEGORY:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._categories[index.row()]
+            return None
+
+        row = self._item_rows(index.internalId() - 1)[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.data_loader.store.value("name", row)
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.internalId() == self._CATEGORY:
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class CategoryFilterModel(QSortFilterProxyModel):
+    """One category of a shared CatalogModel, filtered to a set of row IDs.
+
+    Rows arrive in name order from the shared model, so the proxy never
+    sorts. Filtering replaces the accepted set and re-tests this
+    category's rows only; other categories are rejected at the top level
+    and never mapped.
+    """
+
+    def __init__(self, catalog_model, category, parent=None):
+        super().__init__(parent)
+        self.category = category
+        self._matching_rows = None
+        self._category_position = catalog_model.category_index(category).row()
+        self.setSourceModel(catalog_model)
+
+    def root_index(self):
+        """Return the proxy index whose children are this category's items"""
+        return self.mapFromSource(self.sourceModel().category_index(self.category))
+
+    def set_matching_rows(self, rows):
+        """Show only the items whose row IDs are in rows, or every item for None"""
+        self._matching_rows = None if rows is None else set(rows)
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not source_parent.isValid():
+            return source_row == self._category_position
+        if self._matching_rows is None:
+            return True
+        return self.sourceModel().row_id(source_parent, source_row) in self._matching_rows
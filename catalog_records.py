@@ -0,0 +1,110 @@
+import sys
+
+
+class _Record:
+    """Base for compact catalog records with dict-style read access.
+
+    The UI reads records as item_data["name"] or cmd_data.get("syntax"),
+    so records answer the same lookups a plain dict did. Subclasses list
+    their readable fields in _fields.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, _Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        """Get a field value, or default if the record has no such field"""
+        if key in self._fields:
+            return getattr(self, key)
+        return default
+
+    def keys(self):
+        """Get the field names"""
+        return list(self._fields)
+
+    def items(self):
+        """Get (field, value) pairs"""
+        return [(key, getattr(self, key)) for key in self._fields]
+
+    def to_dict(self):
+        """Get a plain dict copy (for QSettings and JSON)"""
+        return {key: getattr(self, key) for key in self._fields}
+
+
+class ItemRecord(_Record):
+    """An item, NPC, spell or location, viewed as one row of a CatalogStore"""
+
+    __slots__ = ("_store", "_row")
+    _fields = ("name", "id", "command", "category", "original_data")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def row_id(self):
+        return self._row
+
+    @property
+    def name(self):
+        return self._store.value("name", self._row)
+
+    @property
+    def id(self):
+        return self._store.value("id", self._row)
+
+    @property
+    def command(self):
+        return self._store.value("command", self._row)
+
+    @property
+    def category(self):
+        return self._store.category(self._row)
+
+    @property
+    def original_data(self):
+        # Rebuilt from the store's shared strings on each access
+        return self._store.original_data(self._row)
+
+
+class CommandRecord(_Record):
+    """A console command from one of the command files"""
+
+    __slots__ = _fields = ("description", "syntax", "parameters", "category", "example")
+
+    def __init__(self, description, syntax, parameters, category, example):
+        self.description = description
+        self.syntax = syntax
+        self.parameters = parameters
+        # Category names repeat on every record, so share a single string
+        self.category = sys.intern(category)
+        self.example = example
+
+    def __getstate__(self):
+        return tuple(getattr(self, key) for key in self._fields)
+
+    def __setstate__(self, state):
+        for key, value in zip(self._fields, state):
+            setattr(self, key, value)
@@ -0,0 +1,248 @@
+from array import array
+from collections.abc import Mapping, Sequence
+
+from catalog_records import ItemRecord
+
+
+class StringTable:
+    """Shared intern table mapping each distinct string to an integer code"""
+
+    def __init__(self):
+        self.strings = []
+        # text -> code; None until the next intern() needs it again
+        self._codes = {}
+        self._lowered = []
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getstate__(self):
+        # The reverse lookups are rebuilt on load rather than stored twice
+        return self.strings
+
+    def __setstate__(self, strings):
+        self.strings = strings
+        self._codes = None
+        self._lowered = []
+
+    def intern(self, text):
+        """Return the code for text, adding it to the table if needed"""
+        codes = self._codes
+        if codes is None:
+            codes = self._codes = {text: code for code, text in enumerate(self.strings)}
+        code = codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            codes[text] = code
+            self.strings.append(text)
+        return code
+
+    def append_table(self, other):
+        """Append another table's strings and return the offset added to their codes.
+
+        Strings both tables hold are not merged, so a string may end up
+        with two codes; lookups and substring matching don't mind.
+        """
+        offset = len(self.strings)
+        self.strings.extend(other.strings)
+        self._codes = None
+        return offset
+
+    def lookup(self, code):
+        """Return the string stored under code"""
+        return self.strings[code]
+
+    def lowered_strings(self):
+        """Return the lowercased strings, indexed by code"""
+        lowered = self._lowered
+        for code in range(len(lowered), len(self.strings)):
+            # Source records may hold numbers as well as strings
+            lowered.append(str(self.strings[code]).lower())
+        return lowered
+
+    def matching_codes(self, text):
+        """Return the codes of every string containing text (case-insensitive).
+
+        Each distinct string is tested once, however many rows share it.
+        """
+        text = text.lower()
+        return {code for code, value in enumerate(self.lowered_strings()) if text in value}
+
+
+class CatalogStore(Mapping):
+    """Columnar storage for catalog items.
+
+    Every field lives in its own contiguous array of codes into one shared
+    StringTable, and items are addressed by integer row IDs. Reading the
+    store as a mapping yields ItemRecord views over single rows.
+    """
+
+    FIELDS = ("name", "id", "command")
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.categories = StringTable()
+        self.columns = {field: array('I') for field in self.FIELDS}
+        self.category_codes = array('H')
+        # Each row's source record: its field names (a layout, shared by
+        # every record with the same fields) and one string code per field,
+        # starting at the row's offset into source_values
+        self.layouts = StringTable()
+        self.layout_codes = array('H')
+        self.source_offsets = array('I')
+        self.source_values = array('I')
+        self._sorted_rows = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Sort orders are cheap to redo, so the catalog cache leaves them out
+        state["_sorted_rows"] = {}
+        return state
+
+    # Mapping interface: row ID -> ItemRecord
+
+    def __getitem__(self, row):
+        if not isinstance(row, int) or not 0 <= row < len(self.category_codes):
+            raise KeyError(row)
+        return ItemRecord(self, row)
+
+    def __iter__(self):
+        return iter(range(len(self.category_codes)))
+
+    def __len__(self):
+        return len(self.category_codes)
+
+    # Column access
+
+    def value(self, field, row):
+        """Return one field of one row"""
+        return self.strings.strings[self.columns[field][row]]
+
+    def category(self, row):
+        """Return the category name of a row"""
+        return self.categories.strings[self.category_codes[row]]
+
+    def original_data(self, row):
+        """Return a row's source record as a new dict"""
+        fields = self.layouts.strings[self.layout_codes[row]]
+        start = self.source_offsets[row]
+        strings = self.strings.strings
+        return {field: strings[code]
+                for field, code in zip(fields, self.source_values[start:start + len(fields)])}
+
+    def append(self, category, name, item_id, command, source):
+        """Add one item and return its row ID; source is the item's source record"""
+        intern = self.strings.intern
+        self.columns["name"].append(intern(name))
+        self.columns["id"].append(intern(item_id))
+        self.columns["command"].append(intern(command))
+        self.category_codes.append(self.categories.intern(category))
+        self.layout_codes.append(self.layouts.intern(tuple(source)))
+        self.source_offsets.append(len(self.source_values))
+        self.source_values.extend(intern(value) for value in source.values())
+        return len(self.category_codes) - 1
+
+    def merge(self, other):
+        """Append every row of another store and return the row ID of its first row"""
+        start = len(self)
+        # The other store's codes and offsets, shifted past this store's
+        self.source_offsets.extend(map(len(self.source_values).__add__, other.source_offsets))
+        shift = self.strings.append_table(other.strings).__add__
+        for field in self.FIELDS:
+            self.columns[field].extend(map(shift, other.columns[field]))
+        self.source_values.extend(map(shift, other.source_values))
+        shift = self.categories.append_table(other.categories).__add__
+        self.category_codes.extend(map(shift, other.category_codes))
+        shift = self.layouts.append_table(other.layouts).__add__
+        self.layout_codes.extend(map(shift, other.layout_codes))
+        return start
+
+    # Bulk operations
+
+    def filter_rows(self, rows, text, fields=("name", "id")):
+        """Return the rows whose fields contain text (case-insensitive), in order"""
+        columns = [self.columns[field] for field in fields]
+        if len(rows) * len(columns) < len(self.strings):
+            # Few rows (usually an already narrowed result): test them directly
+            text = text.lower()
+            lowered = self.strings.lowered_strings()
+            return [row for row in rows
+                    if any(text in lowered[column[row]] for column in columns)]
+        codes = self.strings.matching_codes(text)
+        return [row for row in rows if any(column[row] in codes for column in columns)]
+
+    def sort_rows(self, rows, field="name"):
+        """Return rows ordered by a field, caching the order for row ranges"""
+        cache_key = (rows.start, rows.stop, field) if isinstance(rows, range) else None
+        if cache_key is not None and cache_key in self._sorted_rows:
+            return self._sorted_rows[cache_key]
+
+        strings = self.strings.strings
+        column = self.columns[field]
+        ordered = sorted(rows, key=lambda row: strings[column[row]])
+
+        if cache_key is not None:
+            self._sorted_rows[cache_key] = ordered
+        return ordered
+
+
+class CategoryView(Sequence):
+    """Read-only view over a set of store rows, yielding (row_id, ItemRecord)"""
+
+    __slots__ = ("store", "rows")
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CategoryView(self.store, self.rows[index])
+        row = self.rows[index]
+        return row, ItemRecord(self.store, row)
+
+    def __iter__(self):
+        store = self.store
+        for row in self.rows:
+            yield row, ItemRecord(store, row)
+
+    def filter(self, text, fields=("name", "id")):
+        """Return a view over the rows whose fields contain text"""
+        if not text:
+            return self
+        return CategoryView(self.store, self.store.filter_rows(self.rows, text, fields))
+
+    def sorted(self, field="name"):
+        """Return a view over the same rows ordered by a field"""
+        return CategoryView(self.store, self.store.sort_rows(self.rows, field))
+
+
+class RefiningFilter:
+    """Filters one view as a query is typed, narrowing the last result when it can.
+
+    Typing one more character can only remove rows, so when the new text
+    contains the previous text only the previous matches are tested again.
+    Any other edit (backspace, replacing the text) filters the full view.
+    """
+
+    def __init__(self, view, fields=("name", "id")):
+        self.view = view
+        self.fields = fields
+        self._last_text = ""
+        self._last_result = view
+
+    def filter(self, text):
+        """Return a view over the rows of the full view whose fields contain text"""
+        text = text.lower()
+        if not text:
+            result = self.view
+        elif self._last_text and self._last_text in text:
+            result = self._last_result.filter(text, self.fields)
+        else:
+            result = self.view.filter(text, self.fields)
+        self._last_text = text
+        self._last_result = result
+        return result
@@ -0,0 +1,291 @@
+import itertools
+import threading
+
+from collections import deque
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import game_connector
+
+# Lanes a job can be submitted to
+INTERACTIVE = "interactive"
+BULK = "bulk"
+# Jobs of up to this many commands go to the interactive lane by default
+INTERACTIVE_MAX_COMMANDS = 3
+# Bulk commands queued or in progress before new bulk jobs are turned away
+MAX_PENDING_BULK = 200
+# The same for interactive commands: clicks piling up while the game is
+# slow to respond would otherwise all run long after they were wanted
+MAX_PENDING_INTERACTIVE = 20
+
+
+class _Job:
+    """A submitted job and how far it has got"""
+
+    def __init__(self, job_id, commands, context, lane):
+        self.job_id = job_id
+        self.commands = commands
+        self.context = context
+        self.lane = lane
+        self.results = []
+        self.cancelled = False
+
+    @property
+    def remaining(self):
+        return len(self.commands) - len(self.results)
+
+    def unsent_results(self):
+        """Return the results for the commands not sent: None, as they were cancelled"""
+        return [(command, None) for command in self.commands[len(self.results):]]
+
+
+class CommandDispatcher(QObject):
+    """Sends console commands to the game on a background thread.
+
+    Sending commands takes seconds of focus switching and console delays,
+    so callers only queue commands and carry on. Jobs (lists of commands)
+    go to one of two lanes and run on a single worker thread:
+
+    - interactive: one-off commands
+    - bulk: long jobs, such as setting every skill
+
+    Every job is sent in one console session. While a bulk job's session
+    runs, queued interactive jobs are typed into the same open console
+    between two of its commands, so they don't wait for the whole job and
+    no extra focus switch is needed. Within a lane jobs run in the order
+    they were submitted.
+
+    The bulk lane holds at most max_pending commands. submit() turns bulk
+    jobs away beyond that, and backpressureChanged tells the UI when the
+    lane fills up (three quarters of max_pending) and when it has drained
+    again (a quarter). The interactive lane holds at most
+    max_interactive commands, and jobs beyond that are turned away
+    the same way. Progress and the per-command results come back to
+    the GUI thread through signals; a result is True when the command was
+    sent, game_connector.SENT_IN_SCRIPT when the console script holding
+    it was run, False when it failed and None when it was cancelled
+    first.
+    """
+
+    # job ID, commands sent so far, commands in the job, command just sent
+    jobProgress = pyqtSignal(int, int, int, str)
+    # job ID, [(command, success)], context given to submit()
+    jobFinished = pyqtSignal(int, object, object)
+    # True when the bulk lane is filling up, False once it has drained
+    backpressureChanged = pyqtSignal(bool)
+
+    def __init__(self, send_batch=None, max_pending=MAX_PENDING_BULK,
+                 max_interactive=MAX_PENDING_INTERACTIVE, parent=None):
+        super().__init__(parent)
+        # None sends through game_connector.send_commands, looked up
+        # per job so a replaced sender takes effect
+        self._send_batch = send_batch
+        self.max_pending = max_pending
+        self.max_interactive = max_interactive
+
+        self._job_ids = itertools.count(1)
+        self._queues = {INTERACTIVE: deque(), BULK: deque()}
+        # The job whose session is running, and commands of it not yet sent
+        self._current_job = None
+        self._current_remaining = 0
+        self._cancel_current = False
+        # An interactive job being typed into the current bulk session
+        self._inline_job = None
+        self._backpressure = False
+        self._condition = threading.Condition()
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="CommandDispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, commands, context=None, lane=None):
+        """Queue commands to be sent as one job and return its job ID.
+
+        lane is INTERACTIVE or BULK; by default jobs of up to
+        INTERACTIVE_MAX_COMMANDS commands are interactive. Returns None if
+        the lane is too full to take the job.
+        """
+        commands = [command for command in commands if command and command.strip()]
+        if lane is None:
+            lane = INTERACTIVE if len(commands) <= INTERACTIVE_MAX_COMMANDS else BULK
+        with self._condition:
+            if lane == BULK:
+                pending, limit = self._pending_bulk(), self.max_pending
+            else:
+                pending, limit = self._pending_interactive(), self.max_interactive
+            # An empty lane takes any job, or it could never run
+            if pending and pending + len(commands) > limit:
+                return None
+            job_id = next(self._job_ids)
+            self._queues[lane].append(_Job(job_id, commands, context, lane))
+            self._condition.notify()
+        self._update_backpressure()
+        return job_id
+
+    def pending(self, lane=None):
+        """Return the number of commands queued or not yet sent by running jobs, in lane or all"""
+        with self._condition:
+            if lane == BULK:
+                return self._pending_bulk()
+            if lane == INTERACTIVE:
+                return self._pending_interactive()
+            return self._pending_interactive() + self._pending_bulk()
+
+    def is_busy(self):
+        with self._condition:
+            return self._current_job is not None or self._has_work()
+
+    @property
+    def backpressure(self):
+        """Whether the bulk lane is currently too full for more bulk work"""
+        return self._backpressure
+
+    def cancel(self, lane=None):
+        """Cancel the jobs in lane (or in every lane).
+
+        Queued jobs are dropped, and a running job stops after its current
+        command.
+        """
+        lanes = [lane] if lane else [INTERACTIVE, BULK]
+        dropped = []
+        with self._condition:
+            for name in lanes:
+                dropped.extend(self._queues[name])
+                self._queues[name].clear()
+            current = self._current_job
+            if current is not None and current.lane in lanes:
+                current.cancelled = True
+                self._cancel_current = True
+            if self._inline_job is not None and INTERACTIVE in lanes:
+                self._inline_job.cancelled = True
+        for job in dropped:
+            self.jobFinished.emit(job.job_id, job.unsent_results(), job.context)
+        self._update_backpressure()
+
+    def cancel_bulk(self):
+        """Drop the queued bulk jobs and stop the running one after its current command"""
+        self.cancel(BULK)
+
+    def stop(self):
+        """Cancel everything and stop the worker thread"""
+        self.cancel()
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
+
+    def _pending_interactive(self):
+        """Interactive commands queued or not yet sent; call with the condition held"""
+        pending = sum(job.remaining for job in self._queues[INTERACTIVE])
+        current = self._current_job
+        if current is not None and current.lane == INTERACTIVE:
+            pending += self._current_remaining
+        if self._inline_job is not None:
+            pending += self._inline_job.remaining
+        return pending
+
+    def _pending_bulk(self):
+        """Bulk commands queued or not yet sent; call with the condition held"""
+        pending = sum(job.remaining for job in self._queues[BULK])
+        current = self._current_job
+        if current is not None and current.lane == BULK:
+            pending += self._current_remaining
+        return pending
+
+    def _update_backpressure(self):
+        """Emit backpressureChanged when the bulk lane crosses its watermarks"""
+        with self._condition:
+            pending = self._pending_bulk()
+            if not self._backpressure and pending >= self.max_pending * 3 // 4:
+                self._backpressure = True
+            elif self._backpressure and pending <= self.max_pending // 4:
+                self._backpressure = False
+            else:
+                return
+            state = self._backpressure
+        self.backpressureChanged.emit(state)
+
+    def _has_work(self):
+        return any(self._queues.values())
+
+    def _next_job(self):
+        """Pop the job to send next; call with the condition held"""
+        if self._queues[INTERACTIVE]:
+            return self._queues[INTERACTIVE].popleft()
+        return self._queues[BULK].popleft()
+
+    def _send_job(self, job):
+        """Send a job in one console session and return [(command, success)]"""
+        sent = [0]
+
+        def progress(done, total, command):
+            with self._condition:
+                self._current_remaining = total - done
+            sent[0] = done
+            self.jobProgress.emit(job.job_id, done, len(job.commands), command)
+            self._update_backpressure()
+
+        def should_stop():
+            return self._cancel_current
+
+        checkpoint = self._send_interactive_inline if job.lane == BULK else None
+        send_batch = self._send_batch or game_connector.send_commands
+        try:
+            results = send_batch(job.commands, progress=progress, should_stop=should_stop,
+                                 checkpoint=checkpoint)
+        except Exception as e:
+            print(f"Error sending commands: {e}")
+            results = [(command, False) for command in job.commands]
+
+        if self._cancel_current:
+            # Stopped part way: the commands never typed were cancelled, not failed
+            results = results[:sent[0]] + [(command, None) for command, _ in results[sent[0]:]]
+        return results
+
+    def _send_interactive_inline(self, send_line):
+        """Type the queued interactive jobs into a running bulk session (its checkpoint)"""
+        while True:
+            with self._condition:
+                if self._cancel_current or not self._queues[INTERACTIVE]:
+                    return
+                job = self._inline_job = self._queues[INTERACTIVE].popleft()
+            try:
+                for command in job.commands:
+                    if job.cancelled:
+                        break
+                    sent = send_line(command)
+                    with self._condition:
+                        job.results.append((command, sent))
+                    self.jobProgress.emit(job.job_id, len(job.results), len(job.commands), command)
+            except Exception:
+                # The session broke; the rest of this job failed with it
+                with self._condition:
+                    job.results.extend((command, False) for command in job.commands[len(job.results):])
+                raise
+            finally:
+                with self._condition:
+                    job.results.extend(job.unsent_results())
+                    self._inline_job = None
+                self.jobFinished.emit(job.job_id, job.results, job.context)
+
+    def _run(self):
+        """Worker loop: send the next job, interactive ones first"""
+        while True:
+            with self._condition:
+                while self._running and not self._has_work():
+                    self._condition.wait()
+                if not self._running:
+                    return
+                job = self._next_job()
+                self._current_job = job
+                self._current_remaining = len(job.commands)
+                self._cancel_current = False
+
+            results = self._send_job(job) if job.commands else []
+
+            with self._condition:
+                job.results.extend(results)
+                job.results.extend(job.unsent_results())
+                self._current_job = None
+            self.jobFinished.emit(job.job_id, job.results, job.context)
+            self._update_backpressure()
@@ -4,17 +4,26 @@ from PyQt6.QtWidgets import (QMainWindow, QTreeWidget, QTreeWidgetItem,
                            QWidget, QLabel, QSplitter, QTextEdit, QStackedWidget,
                            QSizePolicy, QFrame, QMenu, QMessageBox, QTabWidget,
                            QComboBox, QGroupBox, QGraphicsOpacityEffect, QSpinBox, QApplication,
-                           QListWidget, QListWidgetItem, QScrollArea)
+                           QListWidget, QListWidgetItem, QScrollArea, QListView,
+                           QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
 from PyQt6.QtCore import Qt, QSettings, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve, QPoint, QSize, QRect, QEvent
 from PyQt6.QtGui import (QIcon, QFont, QPixmap, QPainter, QColor, QPen, QPolygon, QBrush, 
                         QTextCursor, QTextCharFormat)
-import pyautogui
-import psutil
 import os
 import webbrowser
 from json_loader import OblivionDataLoader
-from game_connector import send_command_to_game, is_game_running
+from game_connector import SENT_IN_SCRIPT, pyautogui, psutil
+from lazy_imports import preload
 from ui_builder import CommandBuilderWidget
+from search_worker import SearchWorker
+from catalog_store import RefiningFilter
+from catalog_model import CatalogModel, CategoryFilterModel
+from command_dispatcher import BULK, CommandDispatcher
+from game_monitor import GameMonitor
+from perf_metrics import STAGE_LABELS, metrics
+
+# Global search ranks fuzzy matches and only shows the best this many
+SEARCH_RESULT_LIMIT = 200
 
 
 class EnhancedItemSelector(QWidget):
@@ -22,12 +31,19 @@ class EnhancedItemSelector(QWidget):
     
     # Signal emitted when a command is selected
     commandSelected = pyqtSignal(str, dict)
+    # Command to send to the game; MainWindow queues it on its dispatcher
+    executeRequested = pyqtSignal(str)
     
-    def __init__(self, data_loader, category):
+    def __init__(self, data_loader, category, catalog_model=None):
         super().__init__()
         self.data_loader = data_loader
         self.category = category
+        # Selectors normally share the main window's model of the whole catalog
+        self.catalog_model = catalog_model if catalog_model is not None else CatalogModel(data_loader, self)
         self.items = data_loader.get_category_items(category)
+        # Items sorted by name (the store caches the order per category);
+        # filtering keeps that order and narrows the last result while typing
+        self.item_filter = RefiningFilter(self.items.sorted("name"), ("name", "id"))
         self.setup_ui()
         
     def setup_ui(self):
@@ -59,7 +75,25 @@ class EnhancedItemSelector(QWidget):
         self.item_combo = QComboBox()
         self.item_combo.setMinimumWidth(300)
         self.item_combo.setMinimumHeight(30)  # ADD THIS LINE
-        self.populate_items()
+        # Set item height for the combo box once, before it has items to restyle
+        self.item_combo.setStyleSheet("""
+            QComboBox {
+                min-height: 25px;
+            }
+            QComboBox QAbstractItemView {
+                min-height: 25px;
+            }
+        """)
+        # Size from the minimum width rather than measuring every item, and let
+        # the popup lay out uniform rows in batches while the event loop is idle
+        self.item_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.item_combo.view().setUniformItemSizes(True)
+        self.item_combo.view().setLayoutMode(QListView.LayoutMode.Batched)
+        # The combo box views this category's branch of the shared catalog model
+        self.item_model = CategoryFilterModel(self.catalog_model, self.category, self)
+        self.item_combo.setModel(self.item_model)
+        self.item_combo.setRootModelIndex(self.item_model.root_index())
+        self.item_combo.setCurrentIndex(0 if self.item_combo.count() else -1)
         self.item_combo.currentIndexChanged.connect(self.update_preview)
         main_layout.addWidget(self.item_combo)
         
@@ -130,42 +164,28 @@ class EnhancedItemSelector(QWidget):
             self.update_preview(0)
         
     def populate_items(self, filtered_items=None):
-       """Populate the item dropdown with all or filtered items"""
-       self.item_combo.clear()
+       """Show all or filtered items in the dropdown and select the first one"""
+       # Only the proxy's accepted rows change; no combo box entries are rebuilt
+       self.item_model.set_matching_rows(None if filtered_items is None else filtered_items.rows)
        
-       items_to_show = filtered_items if filtered_items is not None else self.items
-       
-       # Sort items alphabetically by name
-       sorted_items = sorted(items_to_show, key=lambda x: x[1].get("name", ""))
-       
-       for item_key, item_data in sorted_items:
-           self.item_combo.addItem(item_data["name"], item_key)
-       
-       # Set item height for the combo box
-       self.item_combo.setStyleSheet("""
-           QComboBox {
-               min-height: 25px;
-           }
-           QComboBox QAbstractItemView {
-               min-height: 25px;
-           }
-       """)  # ADD THIS STYLE
+       index = 0 if self.item_combo.count() > 0 else -1
+       if self.item_combo.currentIndex() == index:
+           # Same position, but possibly a different item now
+           self.update_preview(index)
+       else:
+           self.item_combo.setCurrentIndex(index)
     
     def filter_items(self):
         """Filter items based on search text"""
         search_text = self.search_box.text().lower()
         
+        # Search in name and ID
+        filtered_items = self.item_filter.filter(search_text)
+        
         if not search_text:
             self.populate_items()
             return
         
-        filtered_items = []
-        for item_key, item_data in self.items:
-            # Search in name and ID
-            if (search_text in item_data["name"].lower() or 
-                search_text in item_data["id"].lower()):
-                filtered_items.append((item_key, item_data))
-        
         self.populate_items(filtered_items)
         
     def update_preview(self, index):
@@ -177,18 +197,11 @@ class EnhancedItemSelector(QWidget):
             return
         
         item_key = self.item_combo.itemData(index)
-        if not item_key:
+        if item_key is None:
             return
             
-        # Find item data
-        item_data = None
-        for key, data in self.items:
-            if key == item_key:
-                item_data = data
-                break
-                
-        if not item_data:
-            return
+        # Look up item data by row ID
+        item_data = self.data_loader.get_item(item_key)
             
         # Update fields
         self.id_field.setText(item_data["id"])
@@ -207,18 +220,11 @@ class EnhancedItemSelector(QWidget):
             return
             
         item_key = self.item_combo.itemData(index)
-        if not item_key:
+        if item_key is None:
             return
             
-        # Find item data
-        item_data = None
-        for key, data in self.items:
-            if key == item_key:
-                item_data = data
-                break
-                
-        if not item_data:
-            return
+        # Look up item data by row ID
+        item_data = self.data_loader.get_item(item_key)
             
         # Get base command
         command = item_data["command"]
@@ -243,7 +249,7 @@ class EnhancedItemSelector(QWidget):
         """Copy the command to clipboard"""
         command = self.cmd_field.text()
         if command:
-            pyautogui.hotkey('ctrl', 'c')
+            QApplication.clipboard().setText(command)
             QMessageBox.information(self, "Command Copied", 
                                     "Command has been copied to clipboard")
             
@@ -254,18 +260,11 @@ class EnhancedItemSelector(QWidget):
             return
             
         item_key = self.item_combo.itemData(index)
-        if not item_key:
+        if item_key is None:
             return
             
-        # Find item data
-        item_data = None
-        for key, data in self.items:
-            if key == item_key:
-                item_data = data
-                break
-                
-        if not item_data:
-            return
+        # Look up item data by row ID
+        item_data = self.data_loader.get_item(item_key)
             
         command = self.cmd_field.text()
         
@@ -287,21 +286,28 @@ class EnhancedItemSelector(QWidget):
         if not command:
             return
             
-        # Check if game is running
-        if not is_game_running():
-            QMessageBox.warning(self, "Game Not Running", 
-                               "The game is not running. Command cannot be executed.")
-            return
-            
-        # Send command to game
-        success = send_command_to_game(command)
-        
-        if success:
-            QMessageBox.information(self, "Command Executed", 
-                                   "Command has been executed in the game.")
-        else:
-            QMessageBox.warning(self, "Command Failed", 
-                               "Failed to execute command in the game.")
+        # The main window checks the game is running, sends the command in
+        # the background and reports the result
+        self.executeRequested.emit(command)
+
+
+class ItemPagePlaceholder(QLabel):
+    """Stands in for an item selector page until the page is built.
+    
+    Pages are built in idle time after the window is shown, or as soon as
+    the placeholder itself becomes visible.
+    """
+    
+    def __init__(self, category, build_page):
+        super().__init__(f"Loading {category}...")
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.category = category
+        self.build_page = build_page
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Build after this event returns; the stacked widget can't swap pages mid-show
+        QTimer.singleShot(0, lambda: self.build_page(self.category))
 
 
 class DonateButton(QWidget):
@@ -416,8 +422,12 @@ class DonateButton(QWidget):
             # Show with fade-in effect
             self.fade_in_widget(popup)
             
-            # Auto-hide after 5 seconds
-            QTimer.singleShot(5000, lambda: self.fade_out_widget(popup))
+            # Auto-hide after 5 seconds; the timer belongs to the popup so it
+            # never fires for a popup that was already destroyed
+            hide_timer = QTimer(popup)
+            hide_timer.setSingleShot(True)
+            hide_timer.timeout.connect(lambda: self.fade_out_widget(popup))
+            hide_timer.start(5000)
     
     def fade_in_widget(self, widget):
         """Fade in a widget with animation"""
@@ -511,7 +521,8 @@ class DonateArrowIndicator(QWidget):
         painter.drawText(QPoint(30, 28), "Support")
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, data_loader=None):
+        """Create the main window, loading the catalog unless a loaded data_loader is passed in"""
         super().__init__()
         self.setWindowTitle("Oblivion Console Manager")
         self.setMinimumSize(900, 700)
@@ -519,11 +530,29 @@ class MainWindow(QMainWindow):
         # Create settings object first
         self.settings = QSettings("OblivionConsoleManager", "Settings")
         
-        # Load data
-        self.data_loader = OblivionDataLoader("data")  # Adjust path as needed
-        if not self.data_loader.load_all_json_data():
-            QMessageBox.critical(self, "Error", "Failed to load data files.")
-            return
+        # Load data (app.py loads it on a worker thread behind the splash screen)
+        if data_loader is not None:
+            self.data_loader = data_loader
+        else:
+            self.data_loader = OblivionDataLoader("data")  # Adjust path as needed
+            if not self.data_loader.load_all_json_data():
+                QMessageBox.critical(self, "Error", "Failed to load data files.")
+                return
+        
+        # One model of the whole catalog, shared by every item selector
+        self.catalog_model = CatalogModel(self.data_loader, self)
+        
+        # Global search runs on a background thread
+        self.search_worker = SearchWorker(self.data_loader, limit=SEARCH_RESULT_LIMIT, parent=self)
+        self.search_worker.resultsReady.connect(self.show_search_results)
+        
+        # Commands are sent to the game on a background thread
+        self.command_dispatcher = CommandDispatcher(parent=self)
+        self.command_dispatcher.jobProgress.connect(self.on_dispatch_progress)
+        self.command_dispatcher.jobFinished.connect(self.on_dispatch_finished)
+        self.command_dispatcher.backpressureChanged.connect(self.on_dispatch_backpressure)
+        # Buttons that queue bulk jobs, disabled while the bulk lane is full
+        self.bulk_buttons = []
         
         # Check if icons exist
         self.check_icons()
@@ -535,12 +564,12 @@ class MainWindow(QMainWindow):
         self.setup_ui_contents()
         
         # Load settings
+        self.initialize_category_items()
         self.load_settings()
         
         # Set up game status checker
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self.check_game_status)
-        self.status_timer.start(2000)  # Check every 2 seconds
+        self.game_monitor = GameMonitor(parent=self)
+        self.game_monitor.statusChanged.connect(self.update_game_status)
         
     def check_icons(self):
         """Check if required icons exist, create default ones if necessary"""
@@ -721,11 +750,15 @@ class MainWindow(QMainWindow):
         """)
         apply_btn.clicked.connect(self.apply_attribute_skill_changes)
         button_layout.addWidget(apply_btn)
+        self.bulk_buttons.append(apply_btn)
         
         # Max all button
         max_all_btn = QPushButton("Max All Selected")
         max_all_btn.clicked.connect(self.max_selected_attributes_skills)
         button_layout.addWidget(max_all_btn)
+        self.bulk_buttons.append(max_all_btn)
+        for button in (apply_btn, max_all_btn):
+            button.setEnabled(not self.command_dispatcher.backpressure)
         
         # Reset button
         reset_btn = QPushButton("Reset to Defaults")
@@ -742,9 +775,7 @@ class MainWindow(QMainWindow):
 
     def apply_attribute_skill_changes(self):
         """Apply the selected attribute and skill changes"""
-        if not is_game_running():
-            QMessageBox.warning(self, "Game Not Running", 
-                              "Oblivion must be running to execute commands.")
+        if not self.check_game_running("Oblivion must be running to execute commands."):
             return
         
         # Prepare commands
@@ -767,14 +798,9 @@ class MainWindow(QMainWindow):
                                   "No attributes or skills are selected for change.")
             return
         
-        # Execute commands
-        for command in commands:
-            success = send_command_to_game(command)
-            if success:
-                self.history_text.append(f"> {command}")
-        
-        QMessageBox.information(self, "Changes Applied", 
-                              f"{len(commands)} attributes/skills have been updated.")
+        # Sent in the background; successes are added to the history when done
+        self.dispatch_commands(commands, done_message=(
+            "Changes Applied", f"{len(commands)} attributes/skills have been updated."), lane=BULK)
     
     def max_selected_attributes_skills(self):
         """Max all selected attributes and skills"""
@@ -926,15 +952,18 @@ class MainWindow(QMainWindow):
         self.main_tabs = QTabWidget()
         self.main_tabs.setDocumentMode(True)  # Modern tab appearance
         
-        # Create the three main tabs
+        # Create the main tabs
         commands_tab = self.create_commands_tab()
         items_tab = self.create_items_tab()
         history_tab = self.create_history_tab()
+        self.performance_tab = self.create_performance_tab()
         
         # Add the tabs to the main tab widget
         self.main_tabs.addTab(commands_tab, "Commands")
         self.main_tabs.addTab(items_tab, "Items")
         self.main_tabs.addTab(history_tab, "History")
+        self.main_tabs.addTab(self.performance_tab, "Performance")
+        self.main_tabs.currentChanged.connect(self.on_main_tab_changed)
         
         self.main_layout.addWidget(self.main_tabs)
         
@@ -947,14 +976,36 @@ class MainWindow(QMainWindow):
         
         status_bar.addStretch()
         
+        # Progress of commands being sent to the game
+        self.dispatch_label = QLabel("")
+        self.dispatch_label.setStyleSheet("color: #007ACC; font-size: 9pt;")
+        status_bar.addWidget(self.dispatch_label)
+        
+        # Shown while bulk jobs are queued or running
+        self.cancel_bulk_btn = QPushButton("Cancel")
+        self.cancel_bulk_btn.setToolTip("Cancel the bulk commands not sent yet")
+        self.cancel_bulk_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3E3E42;
+                color: white;
+                border: none;
+                border-radius: 3px;
+                padding: 2px 8px;
+                font-size: 9pt;
+            }
+            QPushButton:hover {
+                background-color: #504F52;
+            }
+        """)
+        self.cancel_bulk_btn.clicked.connect(self.cancel_bulk_commands)
+        self.cancel_bulk_btn.hide()
+        status_bar.addWidget(self.cancel_bulk_btn)
+        
         help_label = QLabel("Right-click items for more options | Select a command to see details")
         help_label.setStyleSheet("color: #808080; font-size: 9pt;")
         status_bar.addWidget(help_label)
         
         self.main_layout.addLayout(status_bar)
-        
-        # Initial setup
-        self.check_game_status()
 
     def create_commands_tab(self):
         """Create the commands tab with category buttons and command list/details"""
@@ -1188,6 +1239,8 @@ class MainWindow(QMainWindow):
             button = QPushButton(f"{cat_info['icon']} {category}")
             button.setProperty("category", category)
             button.setCheckable(True)
+            # The count comes from the catalog's index, without loading the category
+            button.setToolTip(f"{cat_info['description']} ({self.data_loader.get_category_count(category)})")
             button.setStyleSheet("""
                 QPushButton {
                     background-color: #3E3E42;
@@ -1223,6 +1276,8 @@ class MainWindow(QMainWindow):
             button = QPushButton(f"{cat_info['icon']} {category}")
             button.setProperty("category", category)
             button.setCheckable(True)
+            # The count comes from the catalog's index, without loading the category
+            button.setToolTip(f"{cat_info['description']} ({self.data_loader.get_category_count(category)})")
             button.setStyleSheet("""
                 QPushButton {
                     background-color: #3E3E42;
@@ -1251,19 +1306,76 @@ class MainWindow(QMainWindow):
         self.item_content = QStackedWidget()
         tab_layout.addWidget(self.item_content)
         
-        # Create selector widgets for each category
-        for category in item_categories_row1 + item_categories_row2:
-            selector = EnhancedItemSelector(self.data_loader, category)
-            selector.commandSelected.connect(self.item_command_selected)
-            self.item_content.addWidget(selector)
+        # Selector pages start as placeholders; each is built on its first
+        # visit or by the idle-time builder once the window has been shown
+        self.item_page_categories = item_categories_row1 + item_categories_row2
+        for category in self.item_page_categories:
+            self.item_content.addWidget(ItemPagePlaceholder(category, self.ensure_item_page))
         
-        # Select the first category by default
+        self.item_page_timer = QTimer(self)
+        self.item_page_timer.setInterval(0)
+        self.item_page_timer.timeout.connect(self.build_next_item_page)
+        
+        # Select the first category by default (without building its page yet)
         if item_categories_row1:
             self.item_category_buttons[item_categories_row1[0]].setChecked(True)
-            self.on_item_category_clicked(item_categories_row1[0])
+            self.item_content.setCurrentIndex(0)
         
         return tab_widget
     
+    def ensure_item_page(self, category):
+        """Build the selector page for a category if it's still a placeholder and return it"""
+        index = self.item_page_categories.index(category)
+        page = self.item_content.widget(index)
+        if isinstance(page, EnhancedItemSelector):
+            return page
+        
+        selector = EnhancedItemSelector(self.data_loader, category, self.catalog_model)
+        selector.commandSelected.connect(self.item_command_selected)
+        selector.executeRequested.connect(self.execute_requested_command)
+        
+        # Put the selector in the placeholder's slot, keeping it current if it was
+        was_current = self.item_content.currentIndex() == index
+        self.item_content.insertWidget(index, selector)
+        if was_current:
+            self.item_content.setCurrentIndex(index)
+        self.item_content.removeWidget(page)
+        page.deleteLater()
+        return selector
+    
+    def build_next_item_page(self):
+        """Build one not-yet-built selector page per idle tick"""
+        for index, category in enumerate(self.item_page_categories):
+            if not isinstance(self.item_content.widget(index), EnhancedItemSelector):
+                self.ensure_item_page(category)
+                return
+        self.item_page_timer.stop()
+    
+    def changeEvent(self, event):
+        """Check the game right away when the user comes back to the window"""
+        super().changeEvent(event)
+        if (event.type() == QEvent.Type.ActivationChange and self.isActiveWindow()
+                and hasattr(self, "game_monitor")):
+            self.game_monitor.check_now()
+    
+    def showEvent(self, event):
+        """Start the deferred startup work once the window is on screen"""
+        super().showEvent(event)
+        if not hasattr(self, "item_page_timer"):
+            # The data failed to load and the window was never built
+            return
+        # Build the remaining item pages in idle time...
+        if not self.item_page_timer.isActive():
+            self.item_page_timer.start()
+        # ...the item categories still waiting to load, in page order...
+        self.data_loader.prefetch_categories(self.item_page_categories)
+        # ...and the search index on the search thread, ahead of the first search
+        self.search_worker.prepare()
+        # Watch the game from its own thread; the first check imports psutil
+        self.game_monitor.start()
+        # Warm the automation modules before the first command needs them
+        preload(psutil, pyautogui)
+    
     def create_history_tab(self):
         """Create the history tab with command execution history"""
         tab_widget = QWidget()
@@ -1365,6 +1477,163 @@ class MainWindow(QMainWindow):
         
         return tab_widget
     
+    def create_performance_tab(self):
+        """Create the tab showing how long each stage of sending commands takes"""
+        tab_widget = QWidget()
+        tab_layout = QVBoxLayout(tab_widget)
+        tab_layout.setContentsMargins(0, 0, 0, 0)
+        
+        perf_frame = QFrame()
+        perf_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        perf_frame.setStyleSheet("""
+            QFrame {
+                background-color: #252526;
+                border-radius: 5px;
+                padding: 10px;
+            }
+        """)
+        perf_layout = QVBoxLayout(perf_frame)
+        
+        # Header with title and buttons
+        header_layout = QHBoxLayout()
+        
+        perf_title = QLabel("Command Timings")
+        perf_title.setStyleSheet("font-weight: bold; font-size: 12pt; color: #00B050;")
+        header_layout.addWidget(perf_title)
+        
+        header_layout.addStretch()
+        
+        button_style = """
+            QPushButton {
+                background-color: #3E3E42;
+                color: white;
+                border: none;
+                border-radius: 3px;
+                padding: 4px 8px;
+            }
+            QPushButton:hover {
+                background-color: #504F52;
+            }
+        """
+        for text, handler in (("Refresh", self.refresh_performance),
+                              ("Reset", self.reset_performance),
+                              ("Export JSON", self.export_performance_json),
+                              ("Export CSV", self.export_performance_csv)):
+            button = QPushButton(text)
+            button.setStyleSheet(button_style)
+            button.clicked.connect(handler)
+            header_layout.addWidget(button)
+        
+        perf_layout.addLayout(header_layout)
+        
+        # One row per stage; select a row to see its histogram below
+        self.perf_table = QTableWidget(len(STAGE_LABELS), 6)
+        self.perf_table.setHorizontalHeaderLabels(["Stage", "Count", "Mean (ms)",
+                                                   "p50 (ms)", "p95 (ms)", "Max (ms)"])
+        self.perf_table.verticalHeader().setVisible(False)
+        self.perf_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.perf_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.perf_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.perf_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.perf_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #1E1E1E;
+                border: 1px solid #3F3F46;
+                color: #E6E6E6;
+                gridline-color: #3F3F46;
+            }
+            QHeaderView::section {
+                background-color: #2D2D30;
+                color: #E6E6E6;
+                border: none;
+                padding: 4px;
+            }
+        """)
+        self.perf_table.itemSelectionChanged.connect(self.show_performance_histogram)
+        perf_layout.addWidget(self.perf_table)
+        
+        self.perf_histogram = QTextEdit()
+        self.perf_histogram.setReadOnly(True)
+        self.perf_histogram.setStyleSheet("""
+            QTextEdit {
+                background-color: #1E1E1E;
+                border: 1px solid #3F3F46;
+                border-radius: 3px;
+                color: #E6E6E6;
+                padding: 5px;
+                font-family: Consolas, Monaco, monospace;
+            }
+        """)
+        perf_layout.addWidget(self.perf_histogram)
+        
+        tab_layout.addWidget(perf_frame)
+        
+        self.perf_snapshot = {}
+        return tab_widget
+    
+    def on_main_tab_changed(self, index):
+        """Refresh the timings when their tab is opened"""
+        if self.main_tabs.widget(index) is self.performance_tab:
+            self.refresh_performance()
+    
+    def refresh_performance(self):
+        """Show the current stage timings in the performance table"""
+        self.perf_snapshot = metrics.snapshot()
+        for row, (stage, label) in enumerate(STAGE_LABELS.items()):
+            data = self.perf_snapshot.get(stage, {})
+            values = [label, data.get("count", 0), data.get("mean_ms"),
+                      data.get("p50_ms"), data.get("p95_ms"), data.get("max_ms")]
+            for column, value in enumerate(values):
+                if value is None:
+                    text = "-"
+                elif isinstance(value, float):
+                    text = f"{value:.1f}"
+                else:
+                    text = str(value)
+                item = QTableWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, stage)
+                self.perf_table.setItem(row, column, item)
+        self.show_performance_histogram()
+    
+    def show_performance_histogram(self):
+        """Draw the histogram of the selected stage (the whole session if none)"""
+        selected = self.perf_table.selectedItems()
+        stage = selected[0].data(Qt.ItemDataRole.UserRole) if selected else "session"
+        data = self.perf_snapshot.get(stage)
+        if not data or not data["count"]:
+            self.perf_histogram.setPlainText(f"{STAGE_LABELS[stage]}: no commands sent yet")
+            return
+        
+        largest = max(data["buckets"].values())
+        lines = [f"{STAGE_LABELS[stage]} ({data['count']} samples)", ""]
+        for label, count in data["buckets"].items():
+            bar = f"{'#' * round(40 * count / largest)} {count}" if count else ""
+            lines.append(f"{label:>12} | {bar}".rstrip())
+        self.perf_histogram.setPlainText("\n".join(lines))
+    
+    def reset_performance(self):
+        """Clear the recorded timings"""
+        metrics.reset()
+        self.refresh_performance()
+    
+    def export_performance_json(self):
+        """Save the timings as JSON"""
+        self.export_performance("JSON files (*.json)", ".json", metrics.export_json)
+    
+    def export_performance_csv(self):
+        """Save the timings as CSV, one row per stage"""
+        self.export_performance("CSV files (*.csv)", ".csv", metrics.export_csv)
+    
+    def export_performance(self, file_filter, extension, export):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings",
+                                              "command_timings" + extension, file_filter)
+        if not path:
+            return
+        try:
+            export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not save the timings:\n{e}")
+    
     def on_command_category_clicked(self, category):
         """Handle command category selection"""
         # Update button states
@@ -1415,17 +1684,10 @@ class MainWindow(QMainWindow):
         for cat, button in self.item_category_buttons.items():
             button.setChecked(cat == category)
         
-        # Find the index of the category in our stacked widget
-        all_categories = [
-            "Weapons", "Armor", "Spells", "Potions", 
-            "Books", "Clothing", "Miscellaneous", "NPCs",
-            "Locations", "Keys", "Horses", "Soul Gems", 
-            "Sigil Stones", "Alchemy Equipment", "Alchemy Ingredients", "Arrows"
-        ]
-        
-        if category in all_categories:
-            index = all_categories.index(category)
-            self.item_content.setCurrentIndex(index)
+        # Show the category's page, building it on first visit
+        if category in self.item_page_categories:
+            self.ensure_item_page(category)
+            self.item_content.setCurrentIndex(self.item_page_categories.index(category))
     
     def copy_selected_history(self):
         """Copy selected text from history"""
@@ -1444,23 +1706,20 @@ class MainWindow(QMainWindow):
         
         selected_text = cursor.selectedText()
         
-        # Extract command (remove '>' prefix if present)
+        # Extract command (remove '>' prefix and the notes after it if present)
         if selected_text.startswith('> '):
             selected_text = selected_text[2:]
+        for note in (" (in script)", " (re-run)"):
+            selected_text = selected_text.removesuffix(note)
         
         if not selected_text:
             return
         
         # Execute the command
-        if not is_game_running():
-            QMessageBox.warning(self, "Game Not Running", 
-                               "The game is not running. Command cannot be executed.")
+        if not self.check_game_running():
             return
         
-        success = send_command_to_game(selected_text)
-        
-        if success:
-            self.history_text.append(f"> {selected_text} (re-run)")
+        self.dispatch_commands([selected_text], history_suffix=" (re-run)")
             
     def setup_context_menu(self):
         """Set up context menu for the command tree"""
@@ -1529,9 +1788,7 @@ class MainWindow(QMainWindow):
     def max_all_skills_attributes(self):
         """Max all attributes to 255 and all skills to 100"""
         # Check if game is running first
-        if not is_game_running():
-            QMessageBox.warning(self, "Game Not Running", 
-                              "Oblivion must be running to execute commands.")
+        if not self.check_game_running("Oblivion must be running to execute commands."):
             return
         
         # Ask for confirmation
@@ -1566,67 +1823,9 @@ class MainWindow(QMainWindow):
         for skill in skills:
             commands.append(f'player.setav "{skill}" 100')
         
-        # Show instructions dialog
-        QMessageBox.information(self, "Instructions", 
-                              "1. Click OK on this message\n"
-                              "2. Switch to Oblivion (Alt+Tab)\n"
-                              "3. Wait while commands are executed (10-15 seconds)\n"
-                              "4. You'll see a completion message when done")
-        
-        # Get the game window and activate it
-        import time
-        
-        # Find and switch to the Oblivion window
-        # This uses the game_connector's approach for sending commands
-        try:
-            # Find the Oblivion process
-            for process in psutil.process_iter(['pid', 'name']):
-                # Check for Oblivion process
-                if "oblivion" in process.info['name'].lower():
-                    # Switch to it using Alt+Tab
-                    pyautogui.keyDown('alt')
-                    pyautogui.press('tab')
-                    pyautogui.keyUp('alt')
-                    time.sleep(1)  # Give it time to switch
-                    break
-                    
-            # Wait briefly to ensure the game window is active
-            time.sleep(0.5)
-            
-            # Open console
-            pyautogui.press('`')
-            time.sleep(0.3)
-            
-            # Execute all commands
-            for command in commands:
-                # Type command
-                pyautogui.write(command)
-                time.sleep(0.1)
-                # Press Enter
-                pyautogui.press('enter')
-                # Record in history
-                self.history_text.append(f"> {command}")
-                # Small delay between commands
-                time.sleep(0.1)
-            
-            # Close console
-            time.sleep(0.3)
-            pyautogui.press('`')
-            
-            # Switch back to the app
-            time.sleep(0.5)
-            pyautogui.keyDown('alt')
-            pyautogui.press('tab')
-            pyautogui.keyUp('alt')
-            
-            # Show completion message
-            QMessageBox.information(self, "Operation Complete", 
-                                "All attributes set to 255 and all skills set to 100!")
-                                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", 
-                               f"Failed to apply settings: {str(e)}\n\n"
-                               "Try using individual commands instead.")
+        # One console session for all of them, in the background
+        self.dispatch_commands(commands, done_message=(
+            "Operation Complete", "All attributes set to 255 and all skills set to 100!"), lane=BULK)
     
     def populate_command_tree(self):
         """Populate command tree with categories and commands"""
@@ -1750,7 +1949,7 @@ class MainWindow(QMainWindow):
         self.builder_widget.manual_edit.setText(item_data["command"])
             
     def filter_commands(self):
-        """Global search across all tabs and content"""
+        """Global search across all tabs and content (debounced, runs off the GUI thread)"""
         search_text = self.search_box.text().lower()
         
         # Create search results panel if not exists
@@ -1758,7 +1957,8 @@ class MainWindow(QMainWindow):
             self.create_search_results_panel()
         
         if not search_text:
-            # Hide the search results
+            # Drop any search still in flight and hide the search results
+            self.search_worker.cancel()
             self.search_results_frame.setVisible(False)
             
             # Just apply the current tab's filtering
@@ -1776,39 +1976,20 @@ class MainWindow(QMainWindow):
             
             return
         
-        # Perform search across all content
-        commands_results = []
-        items_results = []
-        
-        # Search in commands
-        for category in self.data_loader.category_map:
-            if category in ["Weapons", "Armor", "Spells", "Potions", "Books", 
-                          "Clothing", "Miscellaneous", "NPCs", "Locations", 
-                          "Keys", "Horses", "Soul Gems", "Sigil Stones", 
-                          "Alchemy Equipment", "Alchemy Ingredients", "Arrows"]:
-                # Search in items
-                category_items = self.data_loader.get_category_items(category)
-                for item_key, item_data in category_items:
-                    if (search_text in item_data["name"].lower() or 
-                        search_text in item_data["id"].lower()):
-                        items_results.append({
-                            "type": "item",
-                            "name": item_data["name"],
-                            "category": category,
-                            "data": item_data
-                        })
-            else:
-                # Search in commands
-                category_commands = self.data_loader.get_category_commands(category)
-                for cmd_name, cmd_data in category_commands:
-                    if (search_text in cmd_name.lower() or 
-                        search_text in cmd_data["description"].lower()):
-                        commands_results.append({
-                            "type": "command",
-                            "name": cmd_name,
-                            "category": category,
-                            "data": cmd_data
-                        })
+        # The search itself runs on the worker thread; results arrive in show_search_results
+        self.search_worker.request(search_text)
+    
+    def show_search_results(self, generation, search_text, results):
+        """Display one batch of global search results from the search worker"""
+        # Drop results for a query the user has already typed past
+        if (generation != self.search_worker.generation or
+                search_text != self.search_box.text().lower()):
+            return
+        
+        commands_results, items_results = results
+        
+        # Rebuild the list in one batch without repainting per row
+        self.search_results_list.setUpdatesEnabled(False)
         
         # Clear previous results
         self.search_results_list.clear()
@@ -1841,9 +2022,14 @@ class MainWindow(QMainWindow):
                 item.setData(Qt.ItemDataRole.UserRole, result)
                 self.search_results_list.addItem(item)
         
+        self.search_results_list.setUpdatesEnabled(True)
+        
         # Show results count
         total_results = len(commands_results) + len(items_results)
-        self.search_results_label.setText(f"Found {total_results} results for '{search_text}'")
+        if total_results >= SEARCH_RESULT_LIMIT:
+            self.search_results_label.setText(f"Top {total_results} results for '{search_text}'")
+        else:
+            self.search_results_label.setText(f"Found {total_results} results for '{search_text}'")
         
         # Show search results panel
         self.search_results_frame.setVisible(total_results > 0)
@@ -1963,20 +2149,26 @@ class MainWindow(QMainWindow):
             # Get the selector widget and find the item
             current_selector = self.item_content.currentWidget()
             if isinstance(current_selector, EnhancedItemSelector):
-                # Find the item in the combo box
-                item_name = result_data["name"]
-                for i in range(current_selector.item_combo.count()):
-                    if current_selector.item_combo.itemText(i) == item_name:
-                        current_selector.item_combo.setCurrentIndex(i)
-                        break
+                # Find the item in the combo box by its row ID
+                index = current_selector.item_combo.findData(result_data["data"].row_id)
+                if index >= 0:
+                    current_selector.item_combo.setCurrentIndex(index)
         
         # Hide the search results
         self.search_results_frame.setVisible(False)
     
     def filter_command_list(self, search_text):
         """Filter the command list in the commands tab"""
+        # A longer query can only hide more rows, so rows the last query hid stay hidden
+        last_text = getattr(self, "_command_filter_text", "")
+        narrowing = bool(last_text) and last_text in search_text
+        self._command_filter_text = search_text
+        
         for i in range(self.command_list.count()):
             item = self.command_list.item(i)
+            if narrowing and item.isHidden():
+                continue
+            
             item_data = item.data(Qt.ItemDataRole.UserRole)
             
             if not item_data:
@@ -2042,23 +2234,11 @@ class MainWindow(QMainWindow):
             return
             
         # Check if game is running
-        if not is_game_running():
-            self.status_label.setText("Game Status: Not Running - Can't Execute Command")
-            QMessageBox.warning(self, "Game Not Running", 
-                               "The game is not running. Command cannot be executed.")
+        if not self.check_game_running():
             return
             
-        # Send command to game
-        success = send_command_to_game(command)
-        
-        # Update history
-        if success:
-            self.history_text.append(f"> {command}")
-            QMessageBox.information(self, "Command Executed", 
-                                  "Command has been executed in the game.")
-        else:
-            QMessageBox.warning(self, "Command Failed", 
-                              "Failed to execute command in the game.")
+        # Send command to game in the background
+        self.dispatch_command(command)
     
     def execute_command_from_menu(self, item):
         """Execute command from context menu"""
@@ -2076,23 +2256,103 @@ class MainWindow(QMainWindow):
             return
             
         # Check if game is running
-        if not is_game_running():
-            self.status_label.setText("Game Status: Not Running - Can't Execute Command")
-            QMessageBox.warning(self, "Game Not Running", 
-                              "The game is not running. Command cannot be executed.")
+        if not self.check_game_running():
             return
             
-        # Send command to game
-        success = send_command_to_game(command)
+        # Send command to game in the background
+        self.dispatch_command(command)
+            
+    def check_game_running(self, message="The game is not running. Command cannot be executed."):
+        """Warn and return False if the game monitor last saw the game not running.
+        
+        Uses the monitor's last known state, so nothing is scanned on the
+        GUI thread; before its first check the command is let through.
+        """
+        if self.game_monitor.game_running is False:
+            # Look again now in case the game has only just started
+            self.game_monitor.check_now()
+            QMessageBox.warning(self, "Game Not Running", message)
+            return False
+        return True
+    
+    def execute_requested_command(self, command):
+        """Send a command an item selector asked for, if the game is running"""
+        if self.check_game_running():
+            self.dispatch_command(command)
+    
+    def dispatch_command(self, command):
+        """Queue one command to be sent to the game"""
+        self.dispatch_commands([command])
+    
+    def dispatch_commands(self, commands, history_suffix="", done_message=None, lane=None):
+        """Queue commands to be sent to the game without blocking the window.
+        
+        done_message is an optional (title, text) shown once they have all
+        been sent. lane is the dispatcher lane; by default a few commands
+        are interactive and run ahead of bulk jobs.
+        """
+        job_id = self.command_dispatcher.submit(commands, (history_suffix, done_message), lane)
+        if job_id is None:
+            QMessageBox.warning(self, "Too Many Commands Queued",
+                                "Wait for the queued commands to be sent, or cancel them, "
+                                "before queueing more.")
+            return
+        self.update_dispatch_status("Sending commands to the game...")
+    
+    def update_dispatch_status(self, text):
+        """Show text with the queue length, and the cancel button while bulk work is left"""
+        pending = self.command_dispatcher.pending()
+        self.dispatch_label.setText(f"{text} ({pending} queued)" if pending else text)
+        self.cancel_bulk_btn.setVisible(self.command_dispatcher.pending(BULK) > 0)
+    
+    def cancel_bulk_commands(self):
+        """Cancel the bulk commands not sent yet"""
+        self.command_dispatcher.cancel_bulk()
+        self.update_dispatch_status("Cancelling bulk commands...")
+    
+    def on_dispatch_progress(self, job_id, done, total, command):
+        """Show which command the dispatcher just sent"""
+        self.update_dispatch_status(f"Sent {done}/{total}: {command}")
+    
+    def on_dispatch_backpressure(self, full):
+        """Stop queueing bulk jobs while the dispatcher's bulk lane is full"""
+        for button in self.bulk_buttons:
+            button.setEnabled(not full)
+        if full:
+            self.update_dispatch_status("Command queue full - waiting for the game...")
+    
+    def on_dispatch_finished(self, job_id, results, context):
+        """Record the sent commands in the history and report any failures"""
+        history_suffix, done_message = context
+        failed = []
+        cancelled = 0
+        for command, success in results:
+            if success == SENT_IN_SCRIPT:
+                # Only the script's bat line was seen to go through
+                self.history_text.append(f"> {command}{history_suffix} (in script)")
+            elif success:
+                self.history_text.append(f"> {command}{history_suffix}")
+            elif success is None:
+                cancelled += 1
+            else:
+                failed.append(command)
         
-        # Update history
-        if success:
-            self.history_text.append(f"> {command}")
-            QMessageBox.information(self, "Command Executed", 
-                                  "Command has been executed in the game.")
-        else:
+        if failed:
+            self.update_dispatch_status(f"{len(failed)} command(s) failed")
             QMessageBox.warning(self, "Command Failed", 
-                              "Failed to execute command in the game.")
+                              "Failed to execute in the game:\n" + "\n".join(failed[:10]))
+        elif cancelled:
+            self.update_dispatch_status(f"Cancelled {cancelled} command(s)")
+        else:
+            if not self.command_dispatcher.is_busy():
+                self.update_dispatch_status(f"Sent {len(results)} command(s) to the game")
+            else:
+                self.update_dispatch_status("Sending commands to the game...")
+            if done_message:
+                QMessageBox.information(self, *done_message)
+        
+        if self.main_tabs.currentWidget() is self.performance_tab:
+            self.refresh_performance()
             
     def add_to_favorites(self):
         """Add the current command to favorites"""
@@ -2105,18 +2365,15 @@ class MainWindow(QMainWindow):
         
         # Check if already in favorites
         favorites = self.category_items["Favorites"]
-        for i in range(favorites.childCount()):
-            child_data = favorites.child(i).data(0, Qt.ItemDataRole.UserRole)
-            if child_data and child_data["type"] == "command" and child_data["name"] == cmd_name:
+        for child_data in favorites:
+            if child_data["type"] == "command" and child_data["name"] == cmd_name:
                 # Show message that it's already in favorites
                 QMessageBox.information(self, "Already in Favorites", 
                                        f"{cmd_name} is already in your favorites.")
                 return  # Already in favorites
                 
         # Add to favorites
-        fav_item = QTreeWidgetItem(favorites)
-        fav_item.setText(0, cmd_name)
-        fav_item.setData(0, Qt.ItemDataRole.UserRole, {
+        favorites.append({
             "type": "command",
             "name": cmd_name,
             "data": cmd_data
@@ -2136,16 +2393,13 @@ class MainWindow(QMainWindow):
             
         # Check if already in favorites
         favorites = self.category_items["Favorites"]
-        for i in range(favorites.childCount()):
-            child_data = favorites.child(i).data(0, Qt.ItemDataRole.UserRole)
-            if (child_data and child_data["type"] == item_data["type"] and 
+        for child_data in favorites:
+            if (child_data["type"] == item_data["type"] and 
                 child_data["name"] == item_data["name"]):
                 return  # Already in favorites
                 
         # Add to favorites
-        fav_item = QTreeWidgetItem(favorites)
-        fav_item.setText(0, item.text(0))
-        fav_item.setData(0, Qt.ItemDataRole.UserRole, item_data)
+        favorites.append(item_data)
         
         # Save favorites to settings
         self.save_settings()
@@ -2155,12 +2409,13 @@ class MainWindow(QMainWindow):
     
     def remove_from_favorites(self, item):
         """Remove the selected item from favorites"""
-        parent_item = item.parent()
-        if not parent_item or "Favorites" not in parent_item.text(0):
+        item_data = item.data(0, Qt.ItemDataRole.UserRole)
+        favorites = self.category_items["Favorites"]
+        if item_data not in favorites:
             return
             
-        # Remove from tree
-        parent_item.removeChild(item)
+        # Remove from favorites
+        favorites.remove(item_data)
         
         # Save updated favorites to settings
         self.save_settings()
@@ -2178,12 +2433,8 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.No:
             return
             
-        # Get favorites category
-        favorites = self.category_items["Favorites"]
-        
-        # Remove all children
-        while favorites.childCount() > 0:
-            favorites.removeChild(favorites.child(0))
+        # Remove all favorites
+        self.category_items["Favorites"].clear()
         
         # Save updated favorites to settings
         self.save_settings()
@@ -2209,8 +2460,9 @@ class MainWindow(QMainWindow):
                 container_layout = QVBoxLayout()
                 
                 # Add the existing useful cheats selector
-                selector = EnhancedItemSelector(self.data_loader, category)
+                selector = EnhancedItemSelector(self.data_loader, category, self.catalog_model)
                 selector.commandSelected.connect(self.item_command_selected)
+                selector.executeRequested.connect(self.execute_requested_command)
                 container_layout.addWidget(selector)
                 
                 # Add our attribute/skill commands section
@@ -2224,8 +2476,9 @@ class MainWindow(QMainWindow):
                 self.item_tabs.addTab(container, f"{cat_info['icon']} {category}")
             else:
                 # Regular category tabs
-                selector = EnhancedItemSelector(self.data_loader, category)
+                selector = EnhancedItemSelector(self.data_loader, category, self.catalog_model)
                 selector.commandSelected.connect(self.item_command_selected)
+                selector.executeRequested.connect(self.execute_requested_command)
                 
                 # Get category info for icon
                 cat_info = self.data_loader.get_category_info(category)
@@ -2244,17 +2497,10 @@ class MainWindow(QMainWindow):
         # Also update the search box to clear any existing filters
         self.search_box.clear()
         
-        # Find the appropriate index for this category
-        all_categories = [
-            "Weapons", "Armor", "Spells", "Potions", 
-            "Books", "Clothing", "Miscellaneous", "NPCs",
-            "Locations", "Keys", "Horses", "Soul Gems", 
-            "Sigil Stones", "Alchemy Equipment", "Alchemy Ingredients", "Arrows"
-        ]
-        
-        if category in all_categories:
-            index = all_categories.index(category)
-            self.item_content.setCurrentIndex(index)
+        # Find the appropriate page for this category
+        if category in self.item_page_categories:
+            self.ensure_item_page(category)
+            self.item_content.setCurrentIndex(self.item_page_categories.index(category))
         
     def item_command_selected(self, command, cmd_data):
         """Handle item commands from the item selector"""
@@ -2279,9 +2525,9 @@ class MainWindow(QMainWindow):
         import webbrowser
         webbrowser.open("https://discord.gg/92NKqFrM")
             
-    def check_game_status(self):
-        """Check if the game is running and update status label"""
-        if is_game_running():
+    def update_game_status(self, running):
+        """Update the status label when the game starts or exits"""
+        if running:
             self.status_label.setText("Game Status: Running ✅")
             self.status_label.setStyleSheet("color: #00B050; font-weight: bold;")  # Green text
         else:
@@ -2316,18 +2562,21 @@ class MainWindow(QMainWindow):
         """Save user settings and favorites"""
         # Save favorites
         favorites = []
-        favorites_item = self.category_items["Favorites"]
         
-        for i in range(favorites_item.childCount()):
-            item_data = favorites_item.child(i).data(0, Qt.ItemDataRole.UserRole)
+        for item_data in self.category_items["Favorites"]:
             if item_data:
+                # Catalog records are slotted objects - store plain dicts in settings
+                if hasattr(item_data.get("data"), "to_dict"):
+                    item_data = dict(item_data, data=item_data["data"].to_dict())
                 favorites.append(item_data)
                 
         self.settings.setValue("favorites", favorites)
     
     def closeEvent(self, event):
         """Handle close event"""
-        # No need to stop a timer that doesn't exist
-        # Just save settings before closing
+        # Stop the worker threads and save settings before closing
+        self.search_worker.stop()
+        self.command_dispatcher.stop()
+        self.game_monitor.stop()
         self.save_settings()
         event.accept()
\ No newline at end of file
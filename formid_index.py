@@ -0,0 +1,104 @@
+import re
+
+# A FormID is up to eight hex digits, optionally written with a 0x prefix
+_FORM_ID_PATTERN = re.compile(r"(?:0x)?([0-9a-fA-F]{1,8})")
+_FORM_ID_TOKEN = re.compile(r"\b(?:0x)?[0-9a-fA-F]{1,8}\b")
+# Without a 0x prefix, text needs this many hex digits (a decimal digit among
+# them) to be taken for a typed FormID rather than a word such as "bed"
+MIN_TYPED_DIGITS = 5
+
+
+def normalize_form_id(text):
+    """Return the canonical form of a FormID, or None if text is not one.
+
+    Matching ignores case, surrounding whitespace, a 0x prefix and leading
+    zeros, so "000ca154", "0xCA154" and "CA154" all normalize to "CA154".
+    """
+    if not text:
+        return None
+    match = _FORM_ID_PATTERN.fullmatch(text.strip())
+    if match is None:
+        return None
+    return match.group(1).lstrip("0").upper() or "0"
+
+
+def looks_like_form_id(text):
+    """Check whether text is a FormID as someone would type or paste one.
+
+    "0xF", "0000000F" and "ca154" qualify; "f", "bed" and "faced" are
+    valid hex but far more likely words or counts.
+    """
+    text = (text or "").strip()
+    match = _FORM_ID_PATTERN.fullmatch(text)
+    if match is None:
+        return False
+    if text.startswith("0x"):
+        return True
+    digits = match.group(1)
+    return len(digits) >= MIN_TYPED_DIGITS and any(char.isdigit() for char in digits)
+
+
+def is_id_field(field_name):
+    """Check whether a source field holds an ID ("ID", "Weapon ID", "Latent ID", ...)"""
+    return field_name == "ID" or field_name.endswith(" ID")
+
+
+class FormIdIndex:
+    """Hash index from normalized FormID to the catalog rows that use it.
+
+    Every ID field of a source record is indexed, so all five Sigil Stone
+    tiers resolve to their stone, not just the Ascendent ID the catalog
+    shows. Editor IDs such as location names are not FormIDs and are
+    skipped.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_row(self, row, original_data):
+        """Index every FormID field of one store row"""
+        for field_name, value in original_data.items():
+            if not isinstance(value, str) or not is_id_field(field_name):
+                continue
+            form_id = normalize_form_id(value)
+            if form_id is not None:
+                self._entries.setdefault(form_id, []).append((row, field_name))
+
+    def merge(self, other, row_offset):
+        """Add the entries of another index, whose rows start at row_offset here"""
+        for form_id, matches in other._entries.items():
+            self._entries.setdefault(form_id, []).extend(
+                (row + row_offset, field_name) for row, field_name in matches)
+
+    def lookup(self, text):
+        """Return [(row, field_name), ...] for a FormID, or an empty list"""
+        return self._entries.get(normalize_form_id(text), [])
+
+    def contains(self, text):
+        """Check whether a FormID belongs to any catalog record"""
+        return normalize_form_id(text) in self._entries
+
+    def resolve(self, text):
+        """Find the first known FormID in pasted text such as a full command.
+
+        Only IDs that look typed count (see looks_like_form_id), so the
+        words and counts of a command are passed over. Returns
+        (form_id, [(row, field_name), ...]) or None.
+        """
+        # A bare ID is by far the common paste, so try it before tokenizing
+        if looks_like_form_id(text):
+            form_id = normalize_form_id(text)
+            matches = self._entries.get(form_id)
+            return (form_id, matches) if matches else None
+
+        for token in _FORM_ID_TOKEN.findall(text or ""):
+            if not looks_like_form_id(token):
+                continue
+            form_id = normalize_form_id(token)
+            matches = self._entries.get(form_id)
+            if matches:
+                return form_id, matches
+        return None
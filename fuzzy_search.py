@@ -0,0 +1,151 @@
+import re
+
+# Score bands. Every substring match outranks every subsequence match, which
+# outranks every typo match, so a band only has to be searched when the
+# bands above it produced fewer results than were asked for.
+SUBSTRING_SCORE = 40000
+SUBSEQUENCE_SCORE = 10000
+TYPO_SCORE = 0
+# Points per query character a subsequence match needs before it is offered
+# at all; below this the characters are scattered across the name ("iron" in
+# "history of lock picking") and the match would only pad the results
+SUBSEQUENCE_MIN_PER_CHAR = 6
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_key(text):
+    """Lowercase text and collapse punctuation and whitespace into single spaces"""
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def substring_score(query, key, text):
+    """Score a document that contains query as a plain substring.
+
+    key is the normalized primary field (the name); text is the lowered
+    text of all searchable fields. Prefix and word-boundary hits in the
+    name score highest, hits only in secondary fields lowest, and shorter
+    names win ties.
+    """
+    if key.startswith(query):
+        bonus = 70 if len(key) == len(query) else 60
+    elif " " + query in key:
+        bonus = 40
+    elif query in key:
+        bonus = 20
+    else:
+        # Only a secondary field (ID, description) matched
+        bonus = 10 if text.find(query) == 0 else 0
+    return SUBSTRING_SCORE + bonus * 1000 - min(len(key), 999)
+
+
+def subsequence_score(query, key):
+    """Score query as an in-order subsequence of key, or None if it isn't one.
+
+    Characters that start a word or follow the previous match earn
+    bonuses; skipped characters cost a point each. Matches scoring under
+    SUBSEQUENCE_MIN_PER_CHAR per query character count as no match.
+    """
+    score = 0
+    position = -1
+    previous = -2
+    for char in query:
+        position = key.find(char, position + 1)
+        if position < 0:
+            return None
+        if position == 0 or key[position - 1] == " ":
+            score += 15
+        if position == previous + 1:
+            score += 10
+        else:
+            score -= position - previous - 1
+        previous = position
+    if key.startswith(query[:1]):
+        score += 20
+    if score < SUBSEQUENCE_MIN_PER_CHAR * len(query):
+        return None
+    return SUBSEQUENCE_SCORE + max(0, min(score + 15000, 29999))
+
+
+def bounded_edit_distance(a, b, limit):
+    """Edit distance between a and b, or None if it exceeds limit.
+
+    Swapping two neighbouring characters ("daedirc") counts as one edit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, char_b in enumerate(b, 1):
+            value = min(previous[j] + 1,
+                        current[j - 1] + 1,
+                        previous[j - 1] + (char_a != char_b))
+            if (before is not None and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == char_b and before[j - 2] + 1 < value):
+                value = before[j - 2] + 1
+            current.append(value)
+            if value < best:
+                best = value
+        if best > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def typo_limit(token):
+    """Number of edits tolerated for a query token of this length"""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) <= 6 else 2
+
+
+def typo_score(query_tokens, key, distances=None):
+    """Score key against query tokens allowing a few typos per token, or None.
+
+    Every query token must be within its edit limit of some word in key,
+    or of that word's prefix of the same length (so a half-typed last
+    word still matches). Names share most of their words, so pass the same
+    distances dict for one query to reuse each (token, word) distance.
+    """
+    if distances is None:
+        distances = {}
+    words = key.split()
+    total = 0
+    for token in query_tokens:
+        best = None
+        for word in words:
+            pair = (token, word)
+            distance = distances.get(pair, -1)
+            if distance == -1:
+                distance = _word_distance(token, word)
+                distances[pair] = distance
+            if distance is not None and (best is None or distance < best):
+                best = distance
+                if best == 0:
+                    break
+        if best is None:
+            return None
+        total += best
+    return TYPO_SCORE + max(0, 9000 - total * 1000 - min(len(key), 999))
+
+
+def _word_distance(token, word):
+    """Edit distance from token to word or to word's same-length prefix, or None"""
+    limit = typo_limit(token)
+    best = None
+    for candidate in (word, word[:len(token)]):
+        distance = bounded_edit_distance(token, candidate, limit)
+        if distance is not None and (best is None or distance < best):
+            best = distance
+    return best
+
+
+def subsequence_pattern(query):
+    """Compile a regex finding keys of a key blob that hold query's characters in order"""
+    # Each attempt starts at a key's leading newline, and "[^\nk]*k" can
+    # only match one way, so every key is scanned once without backtracking
+    return re.compile("\n" + "".join("[^\n%s]*%s" % (re.escape(char), re.escape(char))
+                                     for char in query))
@@ -0,0 +1,276 @@
+import os
+import threading
+import time
+
+from abc import ABC, abstractmethod
+
+from lazy_imports import lazy_import
+
+# Imported on first use; none is needed to start the app
+pyautogui = lazy_import("pyautogui")
+# Installed with pyautogui (through mouseinfo)
+pyperclip = lazy_import("pyperclip")
+
+# Set OCM_GAME_BACKEND=loopback to run the app without the game, e.g. on
+# Linux: commands are recorded instead of typed
+BACKEND_NAME = os.environ.get("OCM_GAME_BACKEND", "pyautogui")
+
+# The backend every console session goes through, created on first use
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class GameBackend(ABC):
+    """The input a console session sends to the game.
+
+    game_connector drives sessions (timing, retries, clipboard handling)
+    through these primitives only, so a backend decides where the input
+    goes. has_focus() returns True, False, or None where it can't tell;
+    a backend that can't tell, or can't move the pointer, keeps the
+    defaults.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def switch_window(self):
+        """Switch to the previously active window (Alt+Tab)"""
+
+    def has_focus(self):
+        return None
+
+    def pointer_position(self):
+        return None
+
+    def move_pointer(self, position):
+        pass
+
+    @abstractmethod
+    def open_console(self):
+        """Open the console (the tilde key)"""
+
+    @abstractmethod
+    def close_console(self):
+        """Close the console again"""
+
+    @abstractmethod
+    def type_text(self, text):
+        """Type text onto the console line"""
+
+    @abstractmethod
+    def paste(self):
+        """Paste the clipboard onto the console line"""
+
+    @abstractmethod
+    def submit(self):
+        """Run the console line (Enter)"""
+
+    @abstractmethod
+    def get_clipboard(self):
+        """Return the clipboard's text"""
+
+    @abstractmethod
+    def set_clipboard(self, text):
+        """Put text on the clipboard"""
+
+
+class PyAutoGuiBackend(GameBackend):
+    """Sends real keystrokes to the active window with pyautogui.
+
+    Takes the pyautogui and pyperclip modules (or stand-ins with the same
+    calls) so a fake desktop can be driven with the real key sequence.
+    """
+
+    name = "pyautogui"
+    window_title = "Oblivion Remastered"
+
+    def __init__(self, keyboard=None, clipboard=None):
+        self.keyboard = keyboard or pyautogui
+        self.clipboard = clipboard or pyperclip
+
+    def switch_window(self):
+        self.keyboard.keyDown('alt')
+        self.keyboard.press('tab')
+        self.keyboard.keyUp('alt')
+
+    def has_focus(self):
+        try:
+            window = self.keyboard.getActiveWindow()
+        except Exception:
+            return None
+        if window is None:
+            return False
+        return self.window_title in (window.title or "")
+
+    def pointer_position(self):
+        return self.keyboard.position()
+
+    def move_pointer(self, position):
+        if position is not None:
+            self.keyboard.moveTo(position)
+
+    def open_console(self):
+        self.keyboard.press('`')  # This is the tilde key
+
+    close_console = open_console
+
+    def type_text(self, text):
+        self.keyboard.write(text)
+
+    def paste(self):
+        self.keyboard.hotkey('ctrl', 'v')
+
+    def submit(self):
+        self.keyboard.press('enter')
+
+    def get_clipboard(self):
+        return self.clipboard.paste()
+
+    def set_clipboard(self, text):
+        self.clipboard.copy(text)
+
+
+class LoopbackBackend(GameBackend):
+    """An in-process game that records the command stream.
+
+    Models the desktop the app runs on: two windows, the app and the
+    game, with Alt+Tab switching between them, so a second Alt+Tab goes
+    back to the app as it would on Windows. The app starts active, and
+    click_app() makes it active again as when the user clicks in it.
+
+    The optional latencies make it as slow as the real game: the game
+    only has focus focus_latency seconds after the switch, the console
+    (one key toggles it) only opens open_latency seconds after the key,
+    and on the virtual clock every key takes key_time. Keys the game
+    would lose (without focus, or lines typed before the console is open)
+    are counted in dropped. Each line submitted to the open console is
+    appended to commands as (timestamp, command).
+
+    Timestamps come from clock (time.perf_counter by default). With
+    virtual_clock=True time only passes in sleep() (pass it to the
+    TimingProfile) and per key, so sessions run instantly.
+    """
+
+    name = "loopback"
+
+    def __init__(self, clock=None, focus_latency=0.0, open_latency=0.0, key_time=0.0,
+                 virtual_clock=False):
+        self.focus_latency = focus_latency
+        self.open_latency = open_latency
+        self.key_time = key_time
+        self.virtual_clock = virtual_clock
+        self.time = 0.0
+        self.clock = self.now if virtual_clock else (clock or time.perf_counter)
+        self.commands = []
+        self.dropped = 0
+        # When the game has focus and the console is open, if they will be
+        self.game_active = False
+        self.focused_at = None
+        self.open_at = None
+        self.line = ""
+        self.clipboard = ""
+        self._lock = threading.Lock()
+
+    def now(self):
+        """Return the virtual time in seconds"""
+        return self.time
+
+    def sleep(self, seconds):
+        if self.virtual_clock:
+            self.time += seconds
+        else:
+            time.sleep(seconds)
+
+    def received(self):
+        """Return the commands received so far, without their timestamps"""
+        with self._lock:
+            return [command for _, command in self.commands]
+
+    def clear(self):
+        with self._lock:
+            self.commands = []
+            self.dropped = 0
+
+    def click_app(self):
+        """Make the app the active window, as when the user clicks in it"""
+        self.game_active = False
+        self.focused_at = None
+
+    def console_open(self):
+        return self.has_focus() and self.open_at is not None and self.clock() >= self.open_at
+
+    def switch_window(self):
+        self._key()
+        self.game_active = not self.game_active
+        self.focused_at = self.clock() + self.focus_latency if self.game_active else None
+
+    def has_focus(self):
+        return self.focused_at is not None and self.clock() >= self.focused_at
+
+    def open_console(self):
+        if not self._key(needs_focus=True):
+            return
+        if self.open_at is None:
+            self.open_at = self.clock() + self.open_latency
+        else:
+            self.open_at = None
+            self.line = ""
+
+    close_console = open_console
+
+    def type_text(self, text):
+        for char in text:
+            if self._key(needs_focus=True, console=True):
+                self.line += char
+
+    def paste(self):
+        if self._key(needs_focus=True, console=True):
+            self.line += self.clipboard
+
+    def submit(self):
+        if self._key(needs_focus=True, console=True) and self.line:
+            with self._lock:
+                self.commands.append((self.clock(), self.line))
+        self.line = ""
+
+    def get_clipboard(self):
+        return self.clipboard
+
+    def set_clipboard(self, text):
+        self.clipboard = text
+
+    def _key(self, needs_focus=False, console=False):
+        """Take one key press; return whether the game got it"""
+        if self.virtual_clock:
+            self.time += self.key_time
+        if not needs_focus or (self.console_open() if console else self.has_focus()):
+            return True
+        with self._lock:
+            self.dropped += 1
+        return False
+
+
+BACKENDS = {
+    PyAutoGuiBackend.name: PyAutoGuiBackend,
+    LoopbackBackend.name: LoopbackBackend,
+}
+
+
+def get_backend():
+    """Return the game backend, creating the BACKEND_NAME one on first use"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            backend_class = BACKENDS.get(BACKEND_NAME)
+            if backend_class is None:
+                print(f"Unknown game backend '{BACKEND_NAME}' - using pyautogui")
+                backend_class = PyAutoGuiBackend
+            _backend = backend_class()
+        return _backend
+
+
+def set_backend(backend):
+    """Send every following console session through backend"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -1,64 +1,168 @@
-import pyautogui
-import psutil
+import atexit
+import itertools
+import threading
 import time
 import os
 import sys
 
+from game_backends import get_backend, pyautogui
+from input_timing import TimingProfile
+from lazy_imports import lazy_import
+from perf_metrics import metrics
+
+# Imported on first use; none is needed to start the app
+psutil = lazy_import("psutil")
+
 # Global variable to track last game status
 _last_game_status = None
 
+# Pauses of a console session, loaded on first use (see input_timing.py)
+_timing_profile = None
+# Harmless command sent while calibrating
+CALIBRATION_COMMAND = "player.getpos"
+
+# Lines at least this long are pasted from the clipboard in one keystroke
+# instead of typed a key per character; shorter ones are quicker to type
+PASTE_MIN_LENGTH = 12
+# Cleared once the clipboard fails, so later lines go straight to typing
+_clipboard_usable = True
+
+# How send_commands() delivers a command list: "type" types every line,
+# "script" writes scripts to the game directory and types "bat <name>",
+# "auto" uses scripts from SCRIPT_THRESHOLD commands on
+DISPATCH_MODE = "auto"
+SCRIPT_THRESHOLD = 5
+# Commands per script; a job can be stopped between two scripts
+SCRIPT_CHUNK_SIZE = 10
+# The result of a command whose script's bat line was entered: the game
+# runs the script itself, so this says less than True (typed)
+SENT_IN_SCRIPT = "script"
+# Generated scripts; the console's bat command adds the extension itself
+SCRIPT_PREFIX = "ocm_batch_"
+SCRIPT_EXTENSION = ".txt"
+# Scripts older than this are left over from an earlier session
+SCRIPT_MAX_AGE = 60.0
+_script_numbers = itertools.count(1)
+_written_scripts = set()
+
 def is_frozen():
     """Check if the application is running as a PyInstaller frozen executable"""
     return getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
 
+# Specific process names to search for
+GAME_PROCESS_NAMES = [
+    'OblivionRemastered',
+    'The Elder Scrolls IV: Oblivion Remastered'
+]
+GAME_WINDOW_TITLE = "Oblivion Remastered"
+
+# Name of our own application to exclude
+OUR_APP_NAME = "oblivion console manager"
+
+class ProcessTracker:
+    """
+    Remembers the game's process between checks.
+    
+    Once the game has been found, a check is one lookup of its PID and
+    create time (a reused PID has a different create time). Only when
+    that fails is every process scanned again.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self._create_time = None
+    
+    def find(self):
+        """Return the game's process object, or None if it isn't running"""
+        with self._lock:
+            if self._process is not None and self._still_running():
+                return self._process
+            
+            self._process = scan_for_game_process()
+            self._create_time = None
+            if self._process is not None:
+                try:
+                    self._create_time = self._process.create_time()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    self._process = None
+            return self._process
+    
+    def forget(self):
+        """Drop the remembered process so the next check scans again"""
+        with self._lock:
+            self._process = None
+            self._create_time = None
+    
+    def _still_running(self):
+        try:
+            return psutil.Process(self._process.pid).create_time() == self._create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+process_tracker = ProcessTracker()
+
 def find_oblivion_process():
     """
     Find the Oblivion Remastered process.
     Returns the process object if found, None otherwise.
-    Enhanced for reliability in compiled applications.
+    The process is remembered, so repeated calls are cheap while it runs.
     """
-    # Specific process names to search for
-    target_processes = [
-        'OblivionRemastered',
-        'The Elder Scrolls IV: Oblivion Remastered'
+    return process_tracker.find()
 
-    ]
-    
-    # Name of our own application to exclude
-    our_app_name = "oblivion console manager"
-    
+def scan_for_game_process():
+    """
+    Look through every process for the game: by process name first, then
+    by the process owning a game window. Windows are listed at most once.
+    """
+    candidates = []
     for proc in psutil.process_iter(['pid', 'name', 'exe']):
         try:
             # Get process name (case-sensitive for more accuracy)
             proc_name = proc.info['name'] if proc.info['name'] else ""
             
             # Skip our own application
-            if our_app_name.lower() in proc_name.lower():
+            if OUR_APP_NAME in proc_name.lower():
                 continue
             
             # Exact match for specified process names
-            for target in target_processes:
+            for target in GAME_PROCESS_NAMES:
                 if target in proc_name:
                     if is_frozen():
                         print(f"[Frozen] Found Oblivion process: {proc_name}")
                     return proc
-            
-            # Check window title if available (for processes with game window)
-            try:
-                window_titles = [w.title for w in pyautogui.getAllWindows() if w.title]
-                for title in window_titles:
-                    if "Oblivion Remastered" in title and proc.pid == pyautogui.getWindowsWithTitle(title)[0]._hWnd:
-                        if is_frozen():
-                            print(f"[Frozen] Found Oblivion window: {title}")
-                        return proc
-            except:
-                pass
-                
+            candidates.append(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
     
+    # No process by name; check for a process with a game window
+    window_pids = _game_window_pids()
+    for proc in candidates:
+        if proc.pid in window_pids:
+            if is_frozen():
+                print(f"[Frozen] Found Oblivion window for PID {proc.pid}")
+            return proc
+    
     return None
 
+def _game_window_pids():
+    """Return the PIDs owning a window titled like the game's (Windows only)"""
+    if os.name != "nt":
+        return set()
+    try:
+        import ctypes
+        from ctypes import wintypes
+        
+        get_pid = ctypes.windll.user32.GetWindowThreadProcessId
+        pids = set()
+        for window in pyautogui.getWindowsWithTitle(GAME_WINDOW_TITLE):
+            pid = wintypes.DWORD()
+            get_pid(window._hWnd, ctypes.byref(pid))
+            pids.add(pid.value)
+        return pids
+    except Exception:
+        return set()
+
 def is_game_running(verbose=False):
     """
     Check if Oblivion Remastered is running.
@@ -87,87 +191,357 @@ def is_game_running(verbose=False):
     _last_game_status = game_running
     
     return game_running
+def get_timing_profile():
+    """Return the input timing profile, loading this machine's on first use"""
+    global _timing_profile
+    if _timing_profile is None:
+        _timing_profile = TimingProfile.load()
+    return _timing_profile
+
+def set_timing_profile(profile):
+    """Use profile for every following console session"""
+    global _timing_profile
+    _timing_profile = profile
+
+def game_has_focus():
+    """
+    Return True if the game's window is the active one, False if another
+    window is, or None where the active window can't be told (not Windows).
+    """
+    return get_backend().has_focus()
+
 def switch_to_game():
     """
     Switch focus to the Oblivion game window.
+    Returns False if the game visibly didn't get focus, True otherwise.
     """
+    timing = get_timing_profile()
+    backend = get_backend()
     print("Switching focus to Oblivion...")
     
     # Save current mouse position
-    current_mouse_pos = pyautogui.position()
+    current_mouse_pos = backend.pointer_position()
     
     # Method 1: Alt+Tab to switch to the last active window (should be the game)
     print("Pressing Alt+Tab to focus on game window...")
-    pyautogui.keyDown('alt')
-    pyautogui.press('tab')
-    pyautogui.keyUp('alt')
+    switch_start = time.perf_counter()
+    backend.switch_window()
     
-    # Give the game time to come into focus
-    time.sleep(1.0)
+    # Give the game time to come into focus, moving on as soon as it has
+    focused = timing.wait_until("focus_switch", game_has_focus)
+    if focused is False:
+        # Too quick for this machine right now; wait once more
+        print("Game not focused yet - waiting longer...")
+        timing.record_late("focus_switch")
+        focused = timing.wait_until("focus_switch", game_has_focus)
+    if focused:
+        # How long the game took to take focus, where that can be told
+        metrics.record("focus", time.perf_counter() - switch_start)
     
     # Restore mouse position
-    pyautogui.moveTo(current_mouse_pos)
+    backend.move_pointer(current_mouse_pos)
     
     # Additional delay to ensure the game has focus
-    time.sleep(0.5)
+    timing.sleep("focus_settle")
+    return game_has_focus() is not False
 
 def send_command_to_game(command):
     """
-    Send a command to Oblivion Remastered's console using PyAutoGUI.
+    Send a command to Oblivion Remastered's console through the game backend.
     Returns True if the command was sent successfully, False otherwise.
     """
     if not command or not command.strip():
         print("Empty command - nothing to send")
         return False
     
+    # A session of one, with longer pauses for a single interactive command
+    results = send_commands_to_game([command], pace="single_line")
+    return results[0][1]
+
+def send_commands_to_game(commands, pace="line", progress=None, should_stop=None,
+                          checkpoint=None):
+    """
+    Send several commands in one console session: one switch to the game
+    (none if it already has focus), one console open and close, and the
+    timing profile's pace delay after typing each line and after pressing
+    Enter. The input calls of each stage are timed into
+    perf_metrics.metrics; the waits after them only count towards the
+    whole session.
+    
+    progress(done, total, command) is called after each command, and if
+    should_stop() returns True the rest are skipped. checkpoint(send_line),
+    if given, is called after each command while the console is still
+    open; it may type more lines with send_line(command). Returns a list
+    of (command, success) in order.
+    """
+    commands = [command for command in commands if command and command.strip()]
+    if not commands:
+        return []
+    session_start = time.perf_counter()
+    
     # Check if game is running (but always continue if it's detected as not running)
-    if not is_game_running():
-        print("WARNING: Oblivion not detected, but proceeding with command anyway...")
+    with metrics.timed("detection"):
+        game_running = is_game_running()
+    if not game_running:
+        print("WARNING: Oblivion not detected, but proceeding with commands anyway...")
     
+    timing = get_timing_profile()
+    backend = get_backend()
+    results = []
+    failed = False
+    switched = False
     try:
-        print(f"Preparing to send command: {command}")
+        print(f"Preparing to send {len(commands)} command(s)")
         
         # Store current mouse position to restore later
-        original_mouse_pos = pyautogui.position()
+        original_mouse_pos = backend.pointer_position()
         
-        # Switch focus to the game window
-        switch_to_game()
+        # Switch focus to the game window; another Alt+Tab while it has
+        # focus (after an earlier session) would switch away from it
+        switched = game_has_focus() is not True
+        focused = switch_to_game() if switched else True
+        if not focused:
+            # The keys would land in whichever window is active instead
+            print("ERROR: the game window did not get focus - not sending commands")
+            backend.move_pointer(original_mouse_pos)
+            timing.record_failure()
+            metrics.record("session", time.perf_counter() - session_start)
+            return [(command, False) for command in commands]
         
         # Open console with tilde key
         print("Opening console...")
-        pyautogui.press('`')  # This is the tilde key
-        time.sleep(0.7)  # Longer wait for console to open
+        with metrics.timed("console_open"):
+            backend.open_console()
+        timing.sleep("console_open")  # Longer wait for console to open
         
-        # Type the command
-        print(f"Typing command: {command}")
-        pyautogui.write(command)
-        time.sleep(0.4)
+        # What the clipboard held before the first paste, restored at the end
+        saved_clipboard = []
         
-        # Press Enter to execute
-        print("Executing command...")
-        pyautogui.press('enter')
-        time.sleep(0.4)
+        def send_line(command):
+            # Enter the command and press Enter to execute it
+            with metrics.timed("typing"):
+                pasted = enter_console_line(command, saved_clipboard)
+            if pasted:
+                timing.sleep("paste")
+            timing.sleep(pace)
+            with metrics.timed("submit"):
+                backend.submit()
+            timing.sleep(pace)
+            return True
+        
+        try:
+            for command in commands:
+                if should_stop is not None and should_stop():
+                    break
+                
+                send_line(command)
+                results.append((command, True))
+                if progress is not None:
+                    progress(len(results), len(commands), command)
+                if checkpoint is not None:
+                    checkpoint(send_line)
+        finally:
+            if saved_clipboard and saved_clipboard[0] is not None:
+                _set_clipboard(saved_clipboard[0])
         
         # Close console with another tilde
         print("Closing console...")
-        pyautogui.press('`')
-        time.sleep(0.3)
+        with metrics.timed("console_close"):
+            backend.close_console()
+        timing.sleep("console_close")
         
         # Restore original mouse position
-        pyautogui.moveTo(original_mouse_pos)
+        backend.move_pointer(original_mouse_pos)
         
-        print(f"Command executed successfully: {command}")
-        return True
+        print(f"Sent {len(results)} of {len(commands)} command(s)")
         
     except Exception as e:
-        print(f"Error sending command to game: {e}")
-        return False
+        print(f"Error sending commands to game: {e}")
+        failed = True
+    
+    # Shorter delays while sessions go through, longer ones after a failure.
+    # A session that found the game focused says nothing about the focus delays
+    if failed:
+        timing.record_failure()
+    elif switched:
+        timing.record_success()
+    metrics.record("session", time.perf_counter() - session_start)
+    
+    # Commands not typed (after an error, or when stopped) failed
+    results.extend((command, False) for command in commands[len(results):])
+    return results
+
+def enter_console_line(command, saved_clipboard):
+    """
+    Put command on the console line: pasted if it is at least
+    PASTE_MIN_LENGTH characters and the clipboard works, typed otherwise.
+    
+    saved_clipboard is a list shared by one session; before the first
+    paste the clipboard's text is appended to it so it can be restored.
+    Returns True if the command was pasted, when the caller should wait
+    for the console to take it.
+    """
+    global _clipboard_usable
+    backend = get_backend()
+    
+    if len(command) >= PASTE_MIN_LENGTH and _clipboard_usable:
+        try:
+            if not saved_clipboard:
+                saved_clipboard.append(backend.get_clipboard())
+            backend.set_clipboard(command)
+        except Exception as e:
+            print(f"Clipboard unavailable, typing commands instead: {e}")
+            _clipboard_usable = False
+        else:
+            print(f"Pasting command: {command}")
+            backend.paste()
+            return True
+    
+    print(f"Typing command: {command}")
+    backend.type_text(command)
+    return False
+
+def _set_clipboard(text):
+    """Put text back on the clipboard, ignoring a clipboard that went away"""
+    try:
+        get_backend().set_clipboard(text)
+    except Exception as e:
+        print(f"Could not restore the clipboard: {e}")
+
+def game_directory():
+    """
+    Return the directory of the running game's executable, where the
+    console's bat command looks for scripts, or None if it can't be found.
+    """
+    proc = find_oblivion_process()
+    if proc is None:
+        return None
+    try:
+        exe = proc.info.get('exe') or proc.exe()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+    return os.path.dirname(exe) if exe else None
+
+def send_commands(commands, mode=None, progress=None, should_stop=None, checkpoint=None):
+    """
+    Send a command list in the given dispatch mode (DISPATCH_MODE if None).
+    Takes the same progress, should_stop and checkpoint callbacks and
+    returns the same (command, success) list as send_commands_to_game.
+    """
+    mode = mode or DISPATCH_MODE
+    commands = [command for command in commands if command and command.strip()]
+    if mode == "script" or (mode == "auto" and len(commands) >= SCRIPT_THRESHOLD):
+        directory = game_directory()
+        if directory is not None:
+            return send_commands_as_script(commands, directory, progress, should_stop, checkpoint)
+        print("Game directory not found - typing the commands instead")
+    return send_commands_to_game(commands, progress=progress, should_stop=should_stop,
+                                 checkpoint=checkpoint)
+
+def send_commands_as_script(commands, directory, progress=None, should_stop=None,
+                            checkpoint=None):
+    """
+    Write commands to scripts in directory, SCRIPT_CHUNK_SIZE to a
+    script, and run them in one console session by typing only
+    "bat <script>" for each. Falls back to typing every command if a
+    script can't be written.
+    
+    progress, should_stop and checkpoint are called a script at a time,
+    and the commands of a script whose bat line was entered come back as
+    SENT_IN_SCRIPT.
+    """
+    if not commands or (should_stop is not None and should_stop()):
+        return [(command, False) for command in commands]
+    
+    cleanup_scripts(directory)
+    chunks = [commands[start:start + SCRIPT_CHUNK_SIZE]
+              for start in range(0, len(commands), SCRIPT_CHUNK_SIZE)]
+    lines = []
+    for chunk in chunks:
+        name = f"{SCRIPT_PREFIX}{os.getpid()}_{next(_script_numbers)}"
+        path = os.path.join(directory, name + SCRIPT_EXTENSION)
+        try:
+            with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+                f.write("\n".join(chunk) + "\n")
+        except OSError as e:
+            print(f"Could not write console script {path}: {e}")
+            return send_commands_to_game(commands, progress=progress, should_stop=should_stop,
+                                         checkpoint=checkpoint)
+        _written_scripts.add(path)
+        lines.append(f"bat {name}")
+    
+    def script_progress(done, total, line):
+        if progress is not None:
+            sent = sum(len(chunk) for chunk in chunks[:done])
+            progress(sent, len(commands), chunks[done - 1][-1])
+    
+    print(f"Running {len(commands)} command(s) from {len(lines)} script(s) in {directory}")
+    line_results = send_commands_to_game(lines, pace="single_line", progress=script_progress,
+                                         should_stop=should_stop, checkpoint=checkpoint)
+    results = []
+    for chunk, (line, sent) in zip(chunks, line_results):
+        results.extend((command, SENT_IN_SCRIPT if sent else False) for command in chunk)
+    # The scripts stay until the next cleanup; the game reads each when its bat line runs
+    return results
+
+def cleanup_scripts(directory=None, max_age=SCRIPT_MAX_AGE):
+    """
+    Delete generated scripts older than max_age seconds: every such file
+    in directory if given, and the ones this session wrote.
+    """
+    paths = set(_written_scripts)
+    if directory is not None:
+        try:
+            paths.update(os.path.join(directory, name) for name in os.listdir(directory)
+                         if name.startswith(SCRIPT_PREFIX) and name.endswith(SCRIPT_EXTENSION))
+        except OSError:
+            pass
+    
+    now = time.time()
+    for path in paths:
+        try:
+            if now - os.path.getmtime(path) < max_age:
+                continue
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Could not remove console script {path}: {e}")
+            continue
+        _written_scripts.discard(path)
+
+def calibrate_timing(attempts=2):
+    """
+    Calibrate the timing profile against the running game and save it.
+    Start it from the window the app normally runs in: each trial sends
+    CALIBRATION_COMMAND, checks the game had focus, then switches back.
+    Returns the chosen scale of the default delays.
+    """
+    timing = get_timing_profile()
+    
+    def trial():
+        results = send_commands_to_game([CALIBRATION_COMMAND], pace="single_line")
+        focused = game_has_focus() is not False
+        # Back to where we started, as after clicking a command in the app
+        get_backend().switch_window()
+        timing.sleep("focus_switch")
+        return results[0][1] and focused
+    
+    return timing.calibrate(trial, attempts)
+
+# Remove this session's scripts on exit; the game has run them by then
+atexit.register(cleanup_scripts, max_age=0)
 
 # For testing
 if __name__ == "__main__":
     # Print runtime environment info
     print(f"Running as frozen executable: {is_frozen()}")
     
+    if "--calibrate" in sys.argv:
+        scale = calibrate_timing()
+        print(f"Calibrated delays ({scale:.2f} x default): {get_timing_profile().delays}")
+        sys.exit(0)
+    
     # Show all running processes for debugging
     print("==== ALL RUNNING PROCESSES ====")
     for proc in psutil.process_iter(['pid', 'name']):
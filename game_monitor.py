@@ -0,0 +1,72 @@
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import game_connector
+
+
+class GameMonitor(QObject):
+    """Watches for the game starting and exiting on a background thread.
+
+    While the game runs, each check is a cheap PID liveness test (see
+    game_connector.ProcessTracker). While it doesn't, each check is a
+    full process scan, so the interval between scans grows from
+    min_interval to max_interval until something changes. statusChanged
+    is only emitted on a transition, and once for the first check.
+    """
+
+    statusChanged = pyqtSignal(bool)
+
+    def __init__(self, running_interval=2.0, min_interval=2.0, max_interval=10.0, parent=None):
+        super().__init__(parent)
+        self.running_interval = running_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self._running = None
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    @property
+    def game_running(self):
+        """The last known state: True, False, or None before the first check"""
+        return self._running
+
+    def start(self):
+        """Start watching; the first check happens right away"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="GameMonitor", daemon=True)
+            self._thread.start()
+
+    def check_now(self):
+        """Check again without waiting for the interval, and poll quickly again"""
+        self._wake.set()
+
+    def stop(self):
+        """Stop the monitor thread"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        interval = self.min_interval
+        while not self._stopped:
+            try:
+                running = bool(game_connector.is_game_running())
+            except Exception as e:
+                print(f"Checking the game status failed: {e}")
+                running = False
+
+            if running != self._running:
+                self._running = running
+                self.statusChanged.emit(running)
+                interval = self.min_interval
+            elif not running:
+                interval = min(interval * 2, self.max_interval)
+
+            woken = self._wake.wait(self.running_interval if running else interval)
+            self._wake.clear()
+            if woken:
+                interval = self.min_interval
@@ -0,0 +1,197 @@
+import json
+import os
+import platform
+import threading
+import time
+
+# Pauses of a console session in seconds, tuned for the slowest machines
+DEFAULT_DELAYS = {
+    "focus_switch": 1.0,    # after Alt+Tab, for the game to take focus
+    "focus_settle": 0.5,    # after restoring the mouse, before the console key
+    "console_open": 0.7,    # after the console key, for the console to open
+    "line": 0.1,            # after typing a line and after Enter, in a batch
+    "single_line": 0.4,     # the same for a lone interactive command
+    "paste": 0.05,          # after Ctrl+V, for the console to take the text
+    "console_close": 0.3,   # after closing the console
+}
+# Delays never go below MIN_SCALE or above MAX_SCALE times their default
+MIN_SCALE = 0.2
+MAX_SCALE = 3.0
+# Successful sessions in a row before the adaptive delays shrink by SHRINK_FACTOR
+SHRINK_AFTER = 10
+SHRINK_FACTOR = 0.9
+# Stages whose outcome a session can check (the game has focus or not).
+# The console can't be seen, so the other delays only move through
+# calibrate() and failures
+ADAPTIVE_STAGES = ("focus_switch", "focus_settle")
+# A failed session stretches every delay by BACKOFF_FACTOR, a late stage its own
+BACKOFF_FACTOR = 1.5
+# Scales tried by calibrate(), slowest first
+CALIBRATION_SCALES = (1.0, 0.75, 0.5, 0.35, 0.25, 0.2)
+# How often wait_until() checks whether a stage is done, in seconds
+POLL_INTERVAL = 0.01
+
+
+def default_profile_path():
+    """Return the per-user location of the timing profile"""
+    if os.name == "nt":
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base_dir = (os.environ.get("XDG_CONFIG_HOME")
+                    or os.path.join(os.path.expanduser("~"), ".config"))
+    return os.path.join(base_dir, "OblivionConsoleManager", "timing.json")
+
+
+class TimingProfile:
+    """Input delays for this machine, adjusted by how sessions go.
+
+    Starts from DEFAULT_DELAYS or the delays saved for this machine.
+    Every SHRINK_AFTER successful sessions in a row the ADAPTIVE_STAGES
+    shrink a little; a stage that turned out too short backs off at once,
+    and a failed session (no focus, an input error) backs off every
+    delay. calibrate() finds a good starting point by trying shorter and
+    shorter delays. The profile is saved as JSON whenever it changes,
+    keyed to the machine's name so a roaming profile isn't reused
+    elsewhere.
+    """
+
+    def __init__(self, path=None, sleep=None):
+        self.path = path
+        # Replaceable so a fake console can run on a virtual clock
+        self.sleep_function = sleep or time.sleep
+        self.delays = dict(DEFAULT_DELAYS)
+        self.calibrated = None
+        self._streak = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None):
+        """Return the profile saved at path (or the default path), or a default one"""
+        profile = cls(path or default_profile_path())
+        try:
+            with open(profile.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return profile
+
+        if saved.get("machine") != platform.node():
+            print("Timing profile belongs to another machine - using default delays")
+            return profile
+        for name, value in saved.get("delays", {}).items():
+            if name in DEFAULT_DELAYS and isinstance(value, (int, float)):
+                profile.delays[name] = profile._clamp(name, value)
+        profile.calibrated = saved.get("calibrated")
+        return profile
+
+    def save(self):
+        """Write the profile to its path, if it has one"""
+        if not self.path:
+            return
+        data = {
+            "machine": platform.node(),
+            "calibrated": self.calibrated,
+            "delays": {name: round(value, 4) for name, value in self.delays.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Could not save the timing profile: {e}")
+
+    def delay(self, name):
+        """Return the current delay for a stage, in seconds"""
+        return self.delays[name]
+
+    def sleep(self, name):
+        """Wait out the delay for a stage"""
+        self.sleep_function(self.delays[name])
+
+    def wait_until(self, name, condition, interval=POLL_INTERVAL):
+        """Wait out the delay for a stage, ending early once condition() is True.
+
+        condition() returns True, False, or None where it can't tell, in
+        which case the whole delay is waited. Returns its last answer.
+        """
+        remaining = self.delays[name]
+        answer = condition()
+        while answer is False and remaining > 0:
+            step = min(interval, remaining)
+            self.sleep_function(step)
+            remaining -= step
+            answer = condition()
+        if answer is None:
+            self.sleep_function(remaining)
+        return answer
+
+    def record_success(self):
+        """Note a session that went through; shrink the adaptive delays after a streak"""
+        with self._lock:
+            self._streak += 1
+            if self._streak < SHRINK_AFTER:
+                return
+            self._streak = 0
+            for name in ADAPTIVE_STAGES:
+                self.delays[name] = self._clamp(name, self.delays[name] * SHRINK_FACTOR)
+        self.save()
+
+    def record_late(self, name):
+        """Note a stage whose delay was too short this time and back it off"""
+        with self._lock:
+            self._streak = 0
+            self.delays[name] = self._clamp(name, self.delays[name] * BACKOFF_FACTOR)
+        self.save()
+
+    def record_failure(self):
+        """Note a session that failed and back the delays off"""
+        with self._lock:
+            self._streak = 0
+            self._scale_all(BACKOFF_FACTOR)
+        self.save()
+
+    def reset(self):
+        """Go back to the default delays"""
+        with self._lock:
+            self.delays = dict(DEFAULT_DELAYS)
+            self.calibrated = None
+            self._streak = 0
+        self.save()
+
+    def calibrate(self, trial, attempts=3, margin=1.25):
+        """Find the shortest reliable delays and keep them with a safety margin.
+
+        trial() runs one session with the current delays and returns
+        whether it worked. Each of CALIBRATION_SCALES is tried attempts
+        times, slowest first, until one fails. Returns the chosen scale.
+        """
+        best = None
+        for scale in CALIBRATION_SCALES:
+            self._set_scale(scale)
+            if not all(trial() for _ in range(attempts)):
+                break
+            best = scale
+
+        if best is None:
+            # Even the defaults failed; leave room to spare
+            chosen = MAX_SCALE
+        else:
+            chosen = min(best * margin, MAX_SCALE) if best < CALIBRATION_SCALES[0] else best
+        self._set_scale(chosen)
+        self.calibrated = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._streak = 0
+        self.save()
+        return chosen
+
+    def _set_scale(self, scale):
+        with self._lock:
+            self.delays = {name: self._clamp(name, value * scale)
+                           for name, value in DEFAULT_DELAYS.items()}
+
+    def _scale_all(self, factor):
+        self.delays = {name: self._clamp(name, value * factor)
+                       for name, value in self.delays.items()}
+
+    @staticmethod
+    def _clamp(name, value):
+        default = DEFAULT_DELAYS[name]
+        return max(default * MIN_SCALE, min(value, default * MAX_SCALE))
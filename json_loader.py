@@ -1,150 +1,100 @@
+import hashlib
 import json
 import os
+import pickle
+import threading
 
-class OblivionDataLoader:
-    """Class to load and organize all JSON data for the Oblivion Console Manager"""
+from catalog_records import CommandRecord
+from catalog_store import CatalogStore, CategoryView
+from formid_index import FormIdIndex
+from search_index import SearchCancelled, SearchIndex
+
+# Bump this whenever the layout of the cached structures changes
+CACHE_FORMAT_VERSION = 8
+
+# Categories whose files hold console commands rather than item IDs
+COMMAND_CATEGORIES = ("Useful Cheats", "Toggle", "Quest", "Targeted")
+
+# Data files adding up to at least this many bytes are compiled in worker
+# processes; for less, starting the workers costs more than they save
+PROCESS_POOL_MIN_BYTES = 8 * 1024 * 1024
+
+
+def default_cache_path():
+    """Return the per-user location of the compiled catalog cache"""
+    if os.name == "nt":
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "OblivionConsoleManager", "catalog.cache")
+
+def _read_json_file(file_path):
+    """Read and decode one data file, returning (data, error)"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f), None
+    except Exception as e:
+        return None, e
+
+def _compile_file(file_path, category):
+    """Read one data file and compile it into a _CatalogPart, returning (part, error).
     
-    def __init__(self, data_directory="data"):
-        self.data_directory = data_directory
-        self.categories = []
-        self.commands = {}
-        self.items = {}
-        self.category_map = {}
-        
-        # Define category icons and descriptions
-        self.category_info = {
-            "Useful Cheats": {"icon": "⭐", "description": "Commonly used cheats and commands"},
-            "Character": {"icon": "🧙", "description": "Commands affecting your character's abilities and stats"},
-            "Items": {"icon": "🎒", "description": "Commands for adding or removing items"},
-            "World": {"icon": "🌍", "description": "Commands affecting the game world and environment"},
-            "Toggle": {"icon": "🔄", "description": "Commands that toggle game features on/off"},
-            "Targeted": {"icon": "🎯", "description": "Commands that affect a specific target"},
-            "Quest": {"icon": "📜", "description": "Commands related to quests"},
-            "Weapons": {"icon": "⚔️", "description": "All weapon IDs in the game"},
-            "Armor": {"icon": "🛡️", "description": "All armor IDs in the game"},
-            "Spells": {"icon": "✨", "description": "All spell IDs in the game"},
-            "Potions": {"icon": "🧪", "description": "All potion and drink IDs in the game"},
-            "Books": {"icon": "📚", "description": "All book and scroll IDs in the game"},
-            "Clothing": {"icon": "👕", "description": "All clothing, amulet, and ring IDs in the game"},
-            "Miscellaneous": {"icon": "🔮", "description": "All miscellaneous item IDs in the game"},
-            "NPCs": {"icon": "👤", "description": "All NPC IDs in the game"},
-            "Locations": {"icon": "🏙️", "description": "All location IDs in the game"},
-            "Keys": {"icon": "🔑", "description": "All key IDs in the game"},
-            "Horses": {"icon": "🐴", "description": "All horse IDs in the game"},
-            "Soul Gems": {"icon": "💎", "description": "All soul gem IDs in the game"},
-            "Sigil Stones": {"icon": "🌟", "description": "All sigil stone IDs in the game"},
-            "Alchemy Equipment": {"icon": "⚗️", "description": "All alchemy equipment IDs in the game"},
-            "Alchemy Ingredients": {"icon": "🌿", "description": "All alchemy ingredient IDs in the game"},
-            "Arrows": {"icon": "🏹", "description": "All arrow IDs in the game"},
-            "Favorites": {"icon": "❤️", "description": "Your favorite commands and items"}
-        }
-        
-        # Map filename prefixes to categories
-        self.file_category_map = {
-            "useful cheats": "Useful Cheats",
-            "all toggle commands": "Toggle",
-            "all quest commands": "Quest",
-            "target commands": "Targeted",
-            "all weapons ids": "Weapons",
-            "all armor ids": "Armor",
-            "all spells ids": "Spells",
-            "all potions and drinks ids": "Potions",
-            "all books and scrolls ids": "Books",
-            "all clothing_amulets_and_rings ids": "Clothing",
-            "all clothing_ amulets_ and rings ids": "Clothing",  # Alternative spacing format
-            "all miscellaneous ids": "Miscellaneous",
-            "all npc ids": "NPCs",
-            "all locations ids": "Locations",
-            "all keys ids": "Keys",
-            "all horses ids": "Horses",
-            "all soul gems ids": "Soul Gems",
-            "all sigil stone ids": "Sigil Stones",
-            "all alchemy equipment ids": "Alchemy Equipment",
-            "all alchemy ingredients ids": "Alchemy Ingredients",
-            "all arrow ids": "Arrows"
-        }
-        
-    def load_all_json_data(self):
-        """Load all JSON files and organize them into appropriate structures"""
-        # Ensure the data directory exists
-        if not os.path.exists(self.data_directory):
-            print(f"Data directory not found: {self.data_directory}")
-            return False
-        
-        # List all JSON files in the directory
-        json_files = [f for f in os.listdir(self.data_directory) if f.endswith('.json')]
-        
-        for json_file in json_files:
-            file_path = os.path.join(self.data_directory, json_file)
-            file_base = json_file.lower().replace('.json', '')
-            
-            # Find the category for this file
-            category = None
-            
-            # First try direct mapping
-            for prefix, cat in self.file_category_map.items():
-                if file_base == prefix or file_base.startswith(prefix):
-                    category = cat
-                    break
-            
-            # If not found, try a more flexible approach by checking if key parts are in the filename
-            if category is None:
-                for prefix, cat in self.file_category_map.items():
-                    # Extract key parts from the prefix (excluding common words like "all" and "ids")
-                    key_parts = [p for p in prefix.split() if p not in ["all", "ids"]]
-                    
-                    # Check if all key parts are in the filename
-                    if all(part in file_base for part in key_parts):
-                        category = cat
-                        break
-            
-            if category is None:
-                print(f"Unknown category for file: {json_file}")
-                # Special handling for specific files we know about
-                if "clothing" in file_base and "amulets" in file_base and "rings" in file_base:
-                    category = "Clothing"
-                    print(f"  -> Assigning to Clothing category")
-                elif "potions" in file_base:
-                    category = "Potions"
-                    print(f"  -> Assigning to Potions category")
-                else:
-                    continue
-                
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Process based on category type
-                self._process_file_data(data, category, file_base)
-                
-            except Exception as e:
-                print(f"Error loading {json_file}: {e}")
-        
-        # Create category list for UI
-        for category, info in self.category_info.items():
-            if category != "Favorites":  # Skip Favorites - handled separately
-                self.categories.append({
-                    "name": category,
-                    "icon": info["icon"],
-                    "description": info["description"]
-                })
-        
-        return True
+    Kept at module level so it can run in a worker process.
+    """
+    data, error = _read_json_file(file_path)
+    if error is not None:
+        return None, error
+    
+    part = _CatalogPart()
+    try:
+        part.add_file_data(data, category)
+    except Exception as e:
+        return None, e
+    return part, None
+
+def _default_workers(file_paths):
+    """Return how many worker processes to compile the files in: one per CPU for a large catalog"""
+    cpus = os.cpu_count() or 1
+    if cpus < 2 or len(file_paths) < 2:
+        return 0
+    try:
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+    except OSError:
+        return 0
+    return min(cpus, len(file_paths)) if total_size >= PROCESS_POOL_MIN_BYTES else 0
+
+class _CatalogPart:
+    """Items and commands compiled from data files, not yet merged into a loader.
+    
+    Items go into the part's own CatalogStore and FormIdIndex, with rows
+    numbered from 0; commands are kept in file order. A part is all
+    arrays and interned strings, so it is cheap to send back from a
+    worker process.
+    """
+    
+    def __init__(self):
+        self.store = CatalogStore()
+        self.form_ids = FormIdIndex()
+        # [(cmd_name, CommandRecord), ...]
+        self.commands = []
     
-    def _process_file_data(self, data, category, file_base):
-        """Process data from a file based on its category"""
+    def __len__(self):
+        return len(self.store) + len(self.commands)
+    
+    def merge(self, other):
+        """Append another part's items and commands to this one"""
+        start = self.store.merge(other.store)
+        self.form_ids.merge(other.form_ids, start)
+        self.commands.extend(other.commands)
+    
+    def add_file_data(self, data, category):
+        """Compile the records of one data file, based on its category"""
         # Skip if empty data
         if not data:
             return
         
         # Handle different file types based on their content structure
-        if category == "Useful Cheats":
-            self._process_command_data(data, category)
-        elif category == "Toggle":
-            self._process_command_data(data, category)
-        elif category == "Quest":
-            self._process_command_data(data, category)
-        elif category == "Targeted":
+        if category in COMMAND_CATEGORIES:
             self._process_command_data(data, category)
         else:
             # Process item data (weapons, armor, spells, etc.)
@@ -162,22 +112,16 @@ class OblivionDataLoader:
             cmd_name = cmd_parts[0]
             
             # Build command structure
-            cmd_data = {
-                "description": item.get("Description", "No description available"),
-                "syntax": cmd_text,
-                "parameters": cmd_parts[1:] if len(cmd_parts) > 1 else [],
-                "category": category,
-                "example": item.get("Example", "")
-            }
+            cmd_data = CommandRecord(
+                description=item.get("Description", "No description available"),
+                syntax=cmd_text,
+                parameters=cmd_parts[1:] if len(cmd_parts) > 1 else [],
+                category=category,
+                example=item.get("Example", "")
+            )
             
             # Store command
-            self.commands[cmd_name] = cmd_data
-            
-            # Track which commands belong to which category
-            if category not in self.category_map:
-                self.category_map[category] = []
-            
-            self.category_map[category].append(cmd_name)
+            self.commands.append((cmd_name, cmd_data))
     
     def _process_item_data(self, data, category):
         """Process item data"""
@@ -238,27 +182,16 @@ class OblivionDataLoader:
             if not item_name or not item_id:
                 continue
             
-            # Build item structure
-            item_data = {
-                "name": item_name,
-                "id": item_id,
-                "command": command if command else self._get_default_command(category, item_id),
-                "category": category,
-                # Copy all original fields
-                "original_data": {k: v for k, v in item.items()}
-            }
-            
-            # Generate a unique key for this item
-            item_key = f"{category}_{item_name}"
-            
-            # Store item
-            self.items[item_key] = item_data
+            # Store item as a new row (the source record goes into the store's sidecar)
+            row = self.store.append(
+                category,
+                item_name,
+                item_id,
+                command if command else self._get_default_command(category, item_id),
+                item
+            )
             
-            # Track which items belong to which category
-            if category not in self.category_map:
-                self.category_map[category] = []
-            
-            self.category_map[category].append(item_key)
+            self.form_ids.add_row(row, item)
     
     def _get_default_command(self, category, item_id):
         """Get the default command for an item based on its category"""
@@ -271,6 +204,488 @@ class OblivionDataLoader:
         else:
             # Default for items (weapons, armor, etc.)
             return f"player.additem {item_id} 1"
+
+class OblivionDataLoader:
+    """Class to load and organize all JSON data for the Oblivion Console Manager
+    
+    With lazy=True only the command categories are merged into the
+    catalog by load_all_json_data(); each item category waits, compiled
+    or as its pickled cache entry, until get_category_items() first asks
+    for it or prefetch_categories() loads it in the background.
+    """
+    
+    def __init__(self, data_directory="data", use_cache=True, cache_path=None, lazy=False):
+        self.data_directory = data_directory
+        self.use_cache = use_cache
+        self.cache_path = cache_path or default_cache_path()
+        self.lazy = lazy
+        self._load_lock = threading.RLock()
+        self._reset_catalog()
+        
+        # Define category icons and descriptions
+        self.category_info = {
+            "Useful Cheats": {"icon": "⭐", "description": "Commonly used cheats and commands"},
+            "Character": {"icon": "🧙", "description": "Commands affecting your character's abilities and stats"},
+            "Items": {"icon": "🎒", "description": "Commands for adding or removing items"},
+            "World": {"icon": "🌍", "description": "Commands affecting the game world and environment"},
+            "Toggle": {"icon": "🔄", "description": "Commands that toggle game features on/off"},
+            "Targeted": {"icon": "🎯", "description": "Commands that affect a specific target"},
+            "Quest": {"icon": "📜", "description": "Commands related to quests"},
+            "Weapons": {"icon": "⚔️", "description": "All weapon IDs in the game"},
+            "Armor": {"icon": "🛡️", "description": "All armor IDs in the game"},
+            "Spells": {"icon": "✨", "description": "All spell IDs in the game"},
+            "Potions": {"icon": "🧪", "description": "All potion and drink IDs in the game"},
+            "Books": {"icon": "📚", "description": "All book and scroll IDs in the game"},
+            "Clothing": {"icon": "👕", "description": "All clothing, amulet, and ring IDs in the game"},
+            "Miscellaneous": {"icon": "🔮", "description": "All miscellaneous item IDs in the game"},
+            "NPCs": {"icon": "👤", "description": "All NPC IDs in the game"},
+            "Locations": {"icon": "🏙️", "description": "All location IDs in the game"},
+            "Keys": {"icon": "🔑", "description": "All key IDs in the game"},
+            "Horses": {"icon": "🐴", "description": "All horse IDs in the game"},
+            "Soul Gems": {"icon": "💎", "description": "All soul gem IDs in the game"},
+            "Sigil Stones": {"icon": "🌟", "description": "All sigil stone IDs in the game"},
+            "Alchemy Equipment": {"icon": "⚗️", "description": "All alchemy equipment IDs in the game"},
+            "Alchemy Ingredients": {"icon": "🌿", "description": "All alchemy ingredient IDs in the game"},
+            "Arrows": {"icon": "🏹", "description": "All arrow IDs in the game"},
+            "Favorites": {"icon": "❤️", "description": "Your favorite commands and items"}
+        }
+        
+        # Map filename prefixes to categories
+        self.file_category_map = {
+            "useful cheats": "Useful Cheats",
+            "all toggle commands": "Toggle",
+            "all quest commands": "Quest",
+            "target commands": "Targeted",
+            "all weapons ids": "Weapons",
+            "all armor ids": "Armor",
+            "all spells ids": "Spells",
+            "all potions and drinks ids": "Potions",
+            "all books and scrolls ids": "Books",
+            "all clothing_amulets_and_rings ids": "Clothing",
+            "all clothing_ amulets_ and rings ids": "Clothing",  # Alternative spacing format
+            "all miscellaneous ids": "Miscellaneous",
+            "all npc ids": "NPCs",
+            "all locations ids": "Locations",
+            "all keys ids": "Keys",
+            "all horses ids": "Horses",
+            "all soul gems ids": "Soul Gems",
+            "all sigil stone ids": "Sigil Stones",
+            "all alchemy equipment ids": "Alchemy Equipment",
+            "all alchemy ingredients ids": "Alchemy Ingredients",
+            "all arrow ids": "Arrows"
+        }
+        
+    def _reset_catalog(self):
+        """Start from an empty catalog"""
+        self.categories = []
+        self.commands = {}
+        # Items live in a columnar store and are addressed by integer row IDs;
+        # category_map holds a row range per item category
+        self.store = CatalogStore()
+        self.items = self.store
+        self.category_map = {}
+        
+        # Normalized FormID -> rows, covering every ID field of every item
+        self.form_ids = FormIdIndex()
+        
+        # N-gram index over command names/descriptions and item names/IDs
+        self.search_index = SearchIndex()
+        self._indexed_categories = set()
+        
+        # Which data files feed each category and how many records it
+        # has: category -> {"files": [...], "count": n}
+        self.category_index = {}
+        
+        # Categories not merged into the catalog yet: category -> compiled
+        # _CatalogPart, or its pickled bytes from the cache
+        self._pending_parts = {}
+    
+    def reload(self, workers=None, progress=None):
+        """Drop the loaded catalog and its indexes and load the data files again"""
+        with self._load_lock:
+            self._reset_catalog()
+            return self.load_all_json_data(workers, progress)
+    
+    def load_all_json_data(self, workers=None, progress=None):
+        """Load all JSON files and organize them into appropriate structures
+        
+        With workers > 0 the files are compiled in that many worker
+        processes; by default a catalog of PROCESS_POOL_MIN_BYTES or more
+        uses one per CPU. The compiled files are always merged in the same
+        order as the serial path, so the result is identical either way.
+        
+        If progress is given it is called as progress(stage, done, total)
+        for the "manifest" stage and then per file (or once, for a cached
+        catalog) for the "catalog" stage, from whichever thread is loading.
+        """
+        # Ensure the data directory exists
+        if not os.path.exists(self.data_directory):
+            print(f"Data directory not found: {self.data_directory}")
+            return False
+        
+        # List all JSON files in the directory (sorted so every mode merges in the same order)
+        json_files = sorted(f for f in os.listdir(self.data_directory) if f.endswith('.json'))
+        
+        # Build the light index: which files feed which category
+        self._build_category_index(json_files)
+        
+        # Try the compiled catalog cache before parsing anything
+        if progress is not None:
+            progress("manifest", 0, 1)
+        manifest = self._scan_manifest(json_files) if self.use_cache else None
+        parts = self._load_cache(manifest) if manifest is not None else None
+        if progress is not None:
+            progress("manifest", 1, 1)
+        
+        if parts is not None:
+            if progress is not None:
+                progress("catalog", 1, 1)
+        else:
+            parts = self._compile_files(workers, progress)
+            if manifest is not None:
+                self._save_cache(manifest, parts)
+        
+        with self._load_lock:
+            self._pending_parts = parts
+            # The window lists every command at once, so only item categories wait
+            for category in list(parts):
+                if not self.lazy or category in COMMAND_CATEGORIES:
+                    self._load_category(category)
+        
+        self._build_category_list()
+        
+        return True
+    
+    def _build_category_index(self, json_files):
+        """Map every known data file to its category without parsing it"""
+        self.category_index = {}
+        for json_file in json_files:
+            category = self._find_category(json_file)
+            if category is None:
+                continue
+            
+            if category not in self.category_index:
+                self.category_index[category] = {"files": [], "count": 0}
+            self.category_index[category]["files"].append(json_file)
+    
+    def _compile_files(self, workers=None, progress=None):
+        """Compile every data file, returning {category: _CatalogPart} in category order"""
+        file_jobs = [(json_file, category)
+                     for category, entry in self.category_index.items()
+                     for json_file in entry["files"]]
+        file_paths = [os.path.join(self.data_directory, json_file) for json_file, _ in file_jobs]
+        categories = [category for _, category in file_jobs]
+        
+        if workers is None:
+            workers = _default_workers(file_paths)
+        compiled = None
+        if workers and len(file_jobs) > 1:
+            compiled = self._compile_in_processes(file_paths, categories, workers, progress)
+        
+        # Combine per-file results in a fixed order
+        parts = {}
+        results = compiled if compiled is not None else map(_compile_file, file_paths, categories)
+        for done, ((json_file, category), (part, error)) in enumerate(zip(file_jobs, results), 1):
+            if error is not None:
+                print(f"Error loading {json_file}: {error}")
+            elif category in parts:
+                parts[category].merge(part)
+            else:
+                parts[category] = part
+            
+            if progress is not None and compiled is None:
+                progress("catalog", done, len(file_jobs))
+        
+        for category, part in parts.items():
+            self.category_index[category]["count"] = len(part)
+        return parts
+    
+    def _compile_in_processes(self, file_paths, categories, workers, progress=None):
+        """Compile the data files in a process pool.
+        
+        Returns [(part, error), ...] in file order, or None if the pool
+        could not run, in which case the caller compiles the files itself.
+        """
+        # Imported here so a serial load doesn't pay for it
+        from concurrent.futures import ProcessPoolExecutor
+        
+        results = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(_compile_file, file_paths, categories):
+                    results.append(result)
+                    if progress is not None:
+                        progress("catalog", len(results), len(file_paths))
+        except Exception as e:
+            print(f"Could not compile the data files in worker processes: {e}")
+            return None
+        return results
+    
+    def _load_category(self, category):
+        """Merge a pending category into the catalog; does nothing once it is loaded"""
+        if category not in self._pending_parts:
+            return
+        
+        with self._load_lock:
+            part = self._pending_parts.get(category)
+            if part is None:
+                return
+            if isinstance(part, bytes):
+                part = pickle.loads(part)
+            self._merge_part(category, part)
+            # Only now, so other threads never see it neither pending nor loaded
+            del self._pending_parts[category]
+    
+    def _load_categories(self, categories):
+        """Merge every pending category in categories"""
+        for category in categories:
+            self._load_category(category)
+    
+    def prefetch_categories(self, first=()):
+        """Load the pending categories on a background thread, those in first before the rest"""
+        pending = [category for category in first if category in self._pending_parts]
+        pending += [category for category in self.category_index
+                    if category in self._pending_parts and category not in pending]
+        if not pending:
+            return
+        
+        def prefetch():
+            try:
+                self._load_categories(pending)
+            except Exception as e:
+                print(f"Error prefetching categories: {e}")
+        
+        threading.Thread(target=prefetch, name="CategoryPrefetch", daemon=True).start()
+    
+    def _merge_part(self, category, part):
+        """Add a compiled part's items and commands to the catalog under category"""
+        if part.commands:
+            names = self.category_map.setdefault(category, [])
+            for cmd_name, cmd_data in part.commands:
+                self.commands[cmd_name] = cmd_data
+                names.append(cmd_name)
+        
+        if len(part.store):
+            start = self.store.merge(part.store)
+            self.form_ids.merge(part.form_ids, start)
+            self._add_category_rows(category, start, len(self.store))
+    
+    def _add_category_rows(self, category, start, stop):
+        """Add store rows start..stop-1 to a category, keeping contiguous rows as a range"""
+        rows = self.category_map.get(category)
+        if rows is None:
+            self.category_map[category] = range(start, stop)
+        elif isinstance(rows, range) and rows.stop == start:
+            self.category_map[category] = range(rows.start, stop)
+        else:
+            self.category_map[category] = list(rows) + list(range(start, stop))
+    
+    def get_category_count(self, category):
+        """Get the number of records in a category, whether it is loaded yet or not"""
+        entry = self.category_index.get(category)
+        return entry["count"] if entry else 0
+    
+    def _find_category(self, json_file):
+        """Find the category a JSON file belongs to, or None if unknown"""
+        file_base = json_file.lower().replace('.json', '')
+        
+        # First try direct mapping
+        for prefix, cat in self.file_category_map.items():
+            if file_base == prefix or file_base.startswith(prefix):
+                return cat
+        
+        # If not found, try a more flexible approach by checking if key parts are in the filename
+        for prefix, cat in self.file_category_map.items():
+            # Extract key parts from the prefix (excluding common words like "all" and "ids")
+            key_parts = [p for p in prefix.split() if p not in ["all", "ids"]]
+            
+            # Check if all key parts are in the filename
+            if all(part in file_base for part in key_parts):
+                return cat
+        
+        print(f"Unknown category for file: {json_file}")
+        # Special handling for specific files we know about
+        if "clothing" in file_base and "amulets" in file_base and "rings" in file_base:
+            print(f"  -> Assigning to Clothing category")
+            return "Clothing"
+        elif "potions" in file_base:
+            print(f"  -> Assigning to Potions category")
+            return "Potions"
+        
+        return None
+    
+    def _build_category_list(self):
+        """Create category list for UI"""
+        for category, info in self.category_info.items():
+            if category != "Favorites":  # Skip Favorites - handled separately
+                self.categories.append({
+                    "name": category,
+                    "icon": info["icon"],
+                    "description": info["description"]
+                })
+    
+    def _scan_manifest(self, json_files):
+        """Build the cache manifest (name, size, mtime) for the data files.
+        
+        Content hashes are filled in lazily, only when the cheap stat check
+        is not enough to decide whether the cache is still valid.
+        """
+        manifest = []
+        try:
+            for json_file in json_files:
+                stat = os.stat(os.path.join(self.data_directory, json_file))
+                manifest.append({
+                    "name": json_file,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime_ns,
+                    "sha1": None
+                })
+        except OSError as e:
+            print(f"Could not scan data files for the catalog cache: {e}")
+            return None
+        
+        return manifest
+    
+    def _hash_file(self, json_file):
+        """Return the SHA-1 of a data file's contents"""
+        digest = hashlib.sha1()
+        with open(os.path.join(self.data_directory, json_file), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _fill_hashes(self, manifest):
+        """Compute the content hash for every manifest entry that lacks one"""
+        for entry in manifest:
+            if entry["sha1"] is None:
+                entry["sha1"] = self._hash_file(entry["name"])
+    
+    def _manifest_matches(self, manifest, cached_manifest):
+        """Check a fresh manifest against the one stored in the cache.
+        
+        Matching names, sizes and mtimes are trusted as-is. If only the
+        mtimes differ (files copied or re-extracted), the content hashes
+        decide.
+        """
+        if len(manifest) != len(cached_manifest):
+            return False
+        
+        stat_match = True
+        for entry, cached in zip(manifest, cached_manifest):
+            if entry["name"] != cached["name"] or entry["size"] != cached["size"]:
+                return False
+            if entry["mtime"] != cached["mtime"]:
+                stat_match = False
+        
+        if stat_match:
+            for entry, cached in zip(manifest, cached_manifest):
+                entry["sha1"] = cached["sha1"]
+            return True
+        
+        self._fill_hashes(manifest)
+        return all(entry["sha1"] == cached["sha1"]
+                   for entry, cached in zip(manifest, cached_manifest))
+    
+    def _load_cache(self, manifest):
+        """Return the cached categories if the cache is still valid for the current data files.
+        
+        The cache holds every category compiled (its store's string table
+        and columns, its FormID index, its commands), pickled on its own so
+        that each can be unpickled when it is needed. Returns {category:
+        pickled _CatalogPart}, or None if the cache can't be used.
+        """
+        if not os.path.exists(self.cache_path):
+            return None
+        
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable catalog cache {self.cache_path}: {e}")
+            return None
+        
+        if not isinstance(cached, dict) or cached.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        
+        if not self._manifest_matches(manifest, cached["manifest"]):
+            return None
+        
+        if list(cached["counts"]) != list(self.category_index):
+            return None
+        
+        for category, count in cached["counts"].items():
+            self.category_index[category]["count"] = count
+        
+        # Refresh the stored mtimes so the next launch hits the fast path again
+        if any(entry["mtime"] != cached_entry["mtime"]
+               for entry, cached_entry in zip(manifest, cached["manifest"])):
+            self._write_cache(manifest, cached["counts"], cached["parts"])
+        
+        return cached["parts"]
+    
+    def build_search_index(self, progress=None):
+        """Add every category that isn't indexed yet to the search index, loading it if needed.
+        
+        Runs on the first search if nobody calls it earlier. If progress is
+        given it is called as progress("index", done, total) per category.
+        """
+        pending = [category for category in self.category_index
+                   if category not in self._indexed_categories]
+        for done, category in enumerate(pending, 1):
+            self._load_category(category)
+            # One category at a time, so other threads can load theirs in between
+            with self._load_lock:
+                if category not in self._indexed_categories:
+                    self._index_category(category)
+                    self._indexed_categories.add(category)
+            if progress is not None:
+                progress("index", done, len(pending))
+    
+    def _index_category(self, category):
+        """Add a loaded category to the search index"""
+        if category in COMMAND_CATEGORIES:
+            for cmd_name in self.category_map.get(category, []):
+                cmd_data = self.commands[cmd_name]
+                self.search_index.add_document(("command", category, cmd_name),
+                                               (cmd_name, cmd_data["description"]))
+        else:
+            store = self.store
+            for row in self.category_map.get(category, []):
+                self.search_index.add_document(("item", category, row),
+                                               (store.value("name", row), store.value("id", row)))
+    
+    def _save_cache(self, manifest, parts):
+        """Write the compiled categories to the cache file"""
+        try:
+            self._fill_hashes(manifest)
+        except OSError as e:
+            print(f"Could not hash data files for the catalog cache: {e}")
+            return
+        
+        counts = {category: entry["count"] for category, entry in self.category_index.items()}
+        blobs = {category: pickle.dumps(part, protocol=pickle.HIGHEST_PROTOCOL)
+                 for category, part in parts.items()}
+        self._write_cache(manifest, counts, blobs)
+    
+    def _write_cache(self, manifest, counts, blobs):
+        """Atomically write the cache file"""
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            
+            # Write to a temporary file first so a crash never leaves a torn cache
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump({
+                    "version": CACHE_FORMAT_VERSION,
+                    "manifest": manifest,
+                    "counts": counts,
+                    "parts": blobs
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            print(f"Could not write catalog cache {self.cache_path}: {e}")
     
     def get_all_commands(self):
         """Get all commands"""
@@ -278,10 +693,13 @@ class OblivionDataLoader:
     
     def get_all_items(self):
         """Get all items"""
+        self._load_categories(list(self.category_index))
         return self.items
     
     def get_category_commands(self, category):
         """Get all commands in a category"""
+        if category in COMMAND_CATEGORIES:
+            self._load_category(category)
         if category not in self.category_map:
             return []
         
@@ -293,16 +711,108 @@ class OblivionDataLoader:
         return result
     
     def get_category_items(self, category):
-        """Get all items in a category"""
+        """Get all items in a category as a view of (row_id, ItemRecord) pairs"""
+        if category in COMMAND_CATEGORIES:
+            return CategoryView(self.store, [])
+        self._load_category(category)
         if category not in self.category_map:
+            return CategoryView(self.store, [])
+        
+        return CategoryView(self.store, self.category_map[category])
+    
+    def get_item(self, row_id):
+        """Get a single item by its row ID"""
+        return self.store[row_id]
+    
+    def find_by_form_id(self, form_id):
+        """Get [(ItemRecord, field_name), ...] for every item using a FormID"""
+        self._load_categories(list(self.category_index))
+        return [(self.store[row], field) for row, field in self.form_ids.lookup(form_id)]
+    
+    def is_known_form_id(self, form_id):
+        """Check whether a FormID belongs to any item in the catalog"""
+        self._load_categories(list(self.category_index))
+        return self.form_ids.contains(form_id)
+    
+    def resolve_pasted_id(self, text):
+        """Resolve pasted text (a bare ID or a whole command) to its items.
+        
+        Returns [(ItemRecord, field_name), ...], empty if no known FormID
+        appears in the text.
+        """
+        self._load_categories(list(self.category_index))
+        resolved = self.form_ids.resolve(text)
+        if resolved is None:
             return []
+        return [(self.store[row], field) for row, field in resolved[1]]
+    
+    def search_catalog(self, query, is_cancelled=None, limit=None):
+        """Search command names/descriptions and item names/IDs for a substring.
         
-        result = []
-        for item_key in self.category_map[category]:
-            if item_key in self.items:
-                result.append((item_key, self.items[item_key]))
+        Returns (command_results, item_results) as lists of
+        {"type", "name", "category", "data"} dicts, grouped by category in
+        catalog order. Items whose FormID (any ID field) is the query, or
+        appears in it as in a pasted command, come first; see
+        FormIdIndex.resolve for what counts as a FormID. If is_cancelled
+        is given it is polled while results are built, and
+        SearchCancelled is raised once it returns True.
         
-        return result
+        With a limit, the search is fuzzy instead: typos and subsequences
+        match too, and only the best limit matches are returned, best first.
+        """
+        self.build_search_index()
+        
+        if is_cancelled is not None and is_cancelled():
+            raise SearchCancelled()
+        
+        command_results = []
+        item_results = []
+        
+        # Exact FormID matches go first - this also finds the Sigil Stone tiers
+        # that aren't shown as the item's main ID
+        resolved = self.form_ids.resolve(query)
+        matched_rows = set()
+        for row, id_field in (resolved[1] if resolved is not None else ()):
+            if row in matched_rows:
+                continue
+            matched_rows.add(row)
+            record = self.store[row]
+            item_results.append({
+                "type": "item",
+                "name": record["name"],
+                "category": record["category"],
+                "data": record
+            })
+        
+        if limit is not None:
+            ranked = self.search_index.search_ranked(query, limit, is_cancelled)
+            documents = [document for score, document in ranked]
+        else:
+            category_rank = {category: rank for rank, category in enumerate(self.category_index)}
+            documents = sorted(self.search_index.search(query),
+                               key=lambda document: category_rank.get(document[1], 0))
+        
+        for position, (kind, category, key) in enumerate(documents):
+            if is_cancelled is not None and position % 512 == 0 and is_cancelled():
+                raise SearchCancelled()
+            
+            if kind == "command":
+                command_results.append({
+                    "type": "command",
+                    "name": key,
+                    "category": category,
+                    "data": self.commands[key]
+                })
+            elif key not in matched_rows:
+                record = self.store[key]
+                item_results.append({
+                    "type": "item",
+                    "name": record["name"],
+                    "category": category,
+                    "data": record
+                })
+        
+        return command_results, item_results
     
     def get_categories(self):
         """Get all categories"""
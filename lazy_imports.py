@@ -0,0 +1,64 @@
+import importlib
+import os
+import threading
+
+# Set OCM_EAGER_IMPORTS=1 to import everything up front, e.g. to check a
+# frozen build for missing hidden imports without sending a command
+EAGER_IMPORTS = os.environ.get("OCM_EAGER_IMPORTS", "") not in ("", "0")
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    pyautogui and psutil are slow to import and not needed until the game
+    is checked or a command is sent, so modules hold one of these instead
+    of the module itself. Call sites use it exactly like the module.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        if EAGER_IMPORTS:
+            self.load()
+
+    def load(self):
+        """Import the module if needed and return it"""
+        module = self._module
+        if module is None:
+            # import_module takes the import lock, so concurrent first uses are safe
+            module = self._module = importlib.import_module(self._name)
+        return module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for name"""
+    return LazyModule(name)
+
+
+def preload(*modules):
+    """Import lazy modules on a background thread, ahead of their first use"""
+    pending = [module for module in modules if not module.loaded]
+    if not pending:
+        return None
+
+    def run():
+        for module in pending:
+            try:
+                module.load()
+            except Exception as e:
+                print(f"Preloading {module._name} failed: {e}")
+
+    thread = threading.Thread(target=run, name="ModulePreload", daemon=True)
+    thread.start()
+    return thread
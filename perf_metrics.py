@@ -0,0 +1,158 @@
+import csv
+import json
+import threading
+import time
+
+from contextlib import contextmanager
+
+# Stages of sending commands, in session order; "session" is the whole of it.
+# The others time the game's input calls, and "focus" until the game has focus;
+# the timing profile's waits after each call only count towards "session"
+STAGES = ("detection", "focus", "console_open", "typing", "submit", "console_close", "session")
+STAGE_LABELS = {
+    "detection": "Process detection",
+    "focus": "Focus switch",
+    "console_open": "Console open",
+    "typing": "Typing",
+    "submit": "Submit",
+    "console_close": "Console close",
+    "session": "Whole session",
+}
+# Upper bounds of the histogram buckets in milliseconds; one more bucket
+# holds everything slower
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """Counts of durations in fixed buckets, with count, sum, min and max.
+
+    Percentiles are estimated as the upper bound of the bucket the
+    sample falls in (the maximum for the last bucket), which is plenty
+    to see which stage a slow command spends its time in.
+    """
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        bucket = len(self.bounds)
+        for index, bound in enumerate(self.bounds):
+            if ms <= bound:
+                bucket = index
+                break
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else None
+
+    def percentile_ms(self, percent):
+        """Return the estimated duration below which percent of samples fall"""
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(self.bounds):
+                    return float(min(self.bounds[index], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+
+    def bucket_labels(self):
+        """Return a label per bucket, e.g. "<= 50 ms" and "> 5000 ms" """
+        return [f"<= {bound} ms" for bound in self.bounds] + [f"> {self.bounds[-1]} ms"]
+
+    def to_dict(self):
+        def rounded(value):
+            return None if value is None else round(value, 2)
+
+        return {
+            "count": self.count,
+            "mean_ms": rounded(self.mean_ms()),
+            "p50_ms": rounded(self.percentile_ms(50)),
+            "p95_ms": rounded(self.percentile_ms(95)),
+            "min_ms": rounded(self.min_ms),
+            "max_ms": rounded(self.max_ms),
+            "buckets": dict(zip(self.bucket_labels(), self.counts)),
+        }
+
+
+class StageMetrics:
+    """A latency histogram per stage, shared by every sending thread.
+
+    game_connector times each stage of a console session into the
+    module-level metrics instance; the Performance tab shows and exports
+    snapshots of it.
+    """
+
+    def __init__(self, stages=STAGES):
+        self.stages = tuple(stages)
+        self.histograms = {stage: LatencyHistogram() for stage in self.stages}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def timed(self, stage):
+        """Record the time spent in the with block under stage, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Return {stage: histogram dict} for every stage"""
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in self.histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            for histogram in self.histograms.values():
+                histogram.reset()
+            self.started = time.time()
+
+    def export_json(self, path):
+        data = {
+            "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+            "stages": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def export_csv(self, path):
+        """Write one row per stage: the summary columns, then the bucket counts"""
+        snapshot = self.snapshot()
+        labels = LatencyHistogram().bucket_labels()
+        summary = ["count", "mean_ms", "p50_ms", "p95_ms", "min_ms", "max_ms"]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage"] + summary + labels)
+            for stage, data in snapshot.items():
+                writer.writerow([stage] + [data[key] for key in summary]
+                                + [data["buckets"][label] for label in labels])
+
+
+# The timings of this run of the app
+metrics = StageMetrics()
@@ -0,0 +1,293 @@
+import bisect
+import heapq
+
+from collections import Counter
+from itertools import chain
+
+from fuzzy_search import (normalize_key, subsequence_pattern, subsequence_score,
+                          substring_score, typo_limit, typo_score)
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when a newer query has superseded it"""
+
+
+class SearchIndex:
+    """Inverted n-gram index over command and item text.
+
+    Every 1-, 2- and 3-character substring of a document's searchable
+    fields maps to the IDs of the documents containing it. A query of up
+    to three characters is answered straight from its posting list; a
+    longer query only checks the documents in the shortest posting list
+    of its trigrams. Either way the cost follows the size of the result,
+    not the size of the catalog, and matches are exactly those of a plain
+    case-insensitive substring test.
+
+    search_ranked() adds fuzzy matching on top: subsequences ("akavri")
+    and small typos are found too, and only the best N results are kept.
+
+    Typing one more character can only shrink a substring or subsequence
+    match set, so the last candidate set of each kind is kept and, when
+    the new query contains the old one, only those candidates are tested
+    again. Any other edit (backspace, replacing the text) goes back to
+    the index.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self):
+        self.documents = []
+        self._texts = []
+        self._postings = {}
+        # Normalized primary field per document, for fuzzy ranking
+        self._keys = []
+        self._key_blob = ""
+        self._key_line_starts = []
+        # kind -> (query, candidate IDs, document count when computed)
+        self._last_candidates = {}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def clear(self):
+        """Drop every document"""
+        self.documents = []
+        self._texts = []
+        self._postings = {}
+        self._keys = []
+        self._key_blob = ""
+        self._key_line_starts = []
+        self._last_candidates = {}
+
+    def add_document(self, document, fields):
+        """Index a document under the text of its searchable fields.
+
+        document is any value identifying the match; it is handed back by
+        search(). Returns the new document ID.
+        """
+        doc_id = len(self.documents)
+        lowered = [field.lower() for field in fields if field]
+
+        grams = set()
+        for text in lowered:
+            for size in range(1, self.NGRAM_SIZE + 1):
+                for start in range(len(text) - size + 1):
+                    grams.add(text[start:start + size])
+
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [doc_id]
+            else:
+                posting.append(doc_id)
+
+        self.documents.append(document)
+        # Fields are joined with a separator a query never contains
+        self._texts.append("\n".join(lowered))
+        self._keys.append(normalize_key(fields[0] if fields else ""))
+        return doc_id
+
+    def search_ids(self, query):
+        """Return the IDs of documents whose fields contain query, in ascending order"""
+        query = query.lower()
+        if not query:
+            return []
+
+        texts = self._texts
+        previous = self._previous_candidates("text", query)
+
+        if len(query) <= self.NGRAM_SIZE:
+            posting = self._postings.get(query, [])
+            if previous is not None and len(previous) < len(posting):
+                matches = [doc_id for doc_id in previous if query in texts[doc_id]]
+            else:
+                matches = list(posting)
+            return self._remember_candidates("text", query, matches)
+
+        # Only documents holding the rarest trigram of the query can match
+        size = self.NGRAM_SIZE
+        shortest = previous
+        for start in range(len(query) - size + 1):
+            posting = self._postings.get(query[start:start + size])
+            if posting is None:
+                return self._remember_candidates("text", query, [])
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+
+        matches = [doc_id for doc_id in shortest if query in texts[doc_id]]
+        return self._remember_candidates("text", query, matches)
+
+    def search(self, query):
+        """Return the documents whose fields contain query"""
+        documents = self.documents
+        return [documents[doc_id] for doc_id in self.search_ids(query)]
+
+    def search_ranked(self, query, limit=50, is_cancelled=None):
+        """Return up to limit (score, document) pairs for query, best first.
+
+        Matches are scored in bands: names containing the query (at the
+        start, at a word start, anywhere), other fields containing it,
+        in-order subsequences of the name, then names within a few typos.
+        Every band scores below the one before it, so once a bounded heap
+        holds limit results the remaining bands are never searched.
+        If is_cancelled is given it is polled and SearchCancelled raised.
+        """
+        normalized = normalize_key(query)
+        if not normalized or limit <= 0:
+            return []
+
+        keys = self._keys
+        texts = self._texts
+        heap = []
+        seen = set()
+
+        def offer(score, doc_id):
+            entry = (score, -doc_id)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        def check_cancelled(count):
+            if is_cancelled is not None and count % 1024 == 0 and is_cancelled():
+                raise SearchCancelled()
+
+        # Names containing the query, best position first
+        names = self._name_candidates(normalized)
+        word_start = " " + normalized
+        tiers = ([doc_id for doc_id in names if keys[doc_id].startswith(normalized)],
+                 [doc_id for doc_id in names if word_start in keys[doc_id]],
+                 names)
+        for tier in tiers:
+            if len(heap) >= limit:
+                break
+            for count, doc_id in enumerate(tier):
+                check_cancelled(count)
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    offer(substring_score(normalized, keys[doc_id], texts[doc_id]), doc_id)
+
+        # Other fields (IDs, descriptions) containing the query. These all
+        # score alike apart from name length, so only the shortest names
+        # that can still make the cut are scored
+        if len(heap) < limit:
+            check_cancelled(0)
+            candidates = [doc_id for doc_id in self.search_ids(query) if doc_id not in seen]
+            seen.update(candidates)
+            for doc_id in heapq.nsmallest(limit - len(heap), candidates,
+                                          key=lambda doc_id: len(keys[doc_id])):
+                offer(substring_score(normalized, keys[doc_id], texts[doc_id]), doc_id)
+
+        # The query's characters in order somewhere in the name
+        if len(heap) < limit:
+            check_cancelled(0)
+            for count, doc_id in enumerate(self._subsequence_candidates(normalized)):
+                check_cancelled(count)
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = subsequence_score(normalized, keys[doc_id])
+                if score is not None:
+                    offer(score, doc_id)
+
+        # Every query word within a couple of edits of a name word
+        if len(heap) < limit:
+            tokens = normalized.split()
+            distances = {}
+            for count, doc_id in enumerate(self._typo_candidates(tokens)):
+                check_cancelled(count)
+                if doc_id in seen:
+                    continue
+                score = typo_score(tokens, keys[doc_id], distances)
+                if score is not None:
+                    offer(score, doc_id)
+
+        documents = self.documents
+        return [(score, documents[-negative_id])
+                for score, negative_id in sorted(heap, reverse=True)]
+
+    def _name_candidates(self, normalized):
+        """Return the IDs of documents whose name key contains normalized.
+
+        Only documents in the shortest posting list of the query's n-grams
+        are tested. Grams spanning a space are skipped: the key collapses
+        punctuation into spaces, so those need not appear in the indexed
+        text, but every gram within a word does.
+        """
+        keys = self._keys
+        candidates = self._previous_candidates("name", normalized)
+        size = self.NGRAM_SIZE
+        for word in normalized.split():
+            for start in range(max(1, len(word) - size + 1)):
+                posting = self._postings.get(word[start:start + size])
+                if posting is None:
+                    return self._remember_candidates("name", normalized, [])
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+        matches = [doc_id for doc_id in candidates if normalized in keys[doc_id]]
+        return self._remember_candidates("name", normalized, matches)
+
+    def _subsequence_candidates(self, normalized):
+        """Return the IDs of documents whose name key holds normalized's characters in order"""
+        keys = self._keys
+        pattern = subsequence_pattern(normalized)
+        previous = self._previous_candidates("subsequence", normalized)
+        if previous is None:
+            self._refresh_key_blob()
+            line_starts = self._key_line_starts
+            # Matches start at a key's leading newline, so each key matches at most once
+            matches = [bisect.bisect_left(line_starts, match.start())
+                       for match in pattern.finditer(self._key_blob)]
+        else:
+            matches = [doc_id for doc_id in previous if pattern.match("\n" + keys[doc_id])]
+        return self._remember_candidates("subsequence", normalized, matches)
+
+    def _previous_candidates(self, kind, query):
+        """Return the last candidate IDs of a kind if they cover every match for query"""
+        last = self._last_candidates.get(kind)
+        if last is None:
+            return None
+        last_query, candidates, document_count = last
+        if document_count != len(self.documents) or last_query not in query:
+            return None
+        return candidates
+
+    def _remember_candidates(self, kind, query, candidates):
+        """Keep candidates as the set to narrow for the next, longer query"""
+        self._last_candidates[kind] = (query, candidates, len(self.documents))
+        return candidates
+
+    def _refresh_key_blob(self):
+        """Rebuild the key blob if documents were added.
+
+        The blob is every key preceded by a newline, and _key_line_starts
+        holds the offset of each of those newlines, so a regex match
+        anywhere in the blob maps back to its document with one bisect.
+        """
+        if len(self._key_line_starts) == len(self._keys):
+            return
+        line_starts = []
+        offset = 0
+        for key in self._keys:
+            line_starts.append(offset)
+            offset += len(key) + 1
+        self._key_line_starts = line_starts
+        self._key_blob = "".join("\n" + key for key in self._keys)
+
+    def _typo_candidates(self, tokens):
+        """Return documents sharing enough bigrams with the longest query word.
+
+        A word within k edits of the query word keeps at least
+        (len - 1) - 2k of its bigrams, so documents below that count can't
+        match and are never scored.
+        """
+        tokens = [token for token in tokens if typo_limit(token) > 0]
+        if not tokens:
+            return []
+        token = max(tokens, key=len)
+        needed = max(1, (len(token) - 1) - 2 * typo_limit(token))
+
+        bigrams = {token[i:i + 2] for i in range(len(token) - 1)}
+        counts = Counter(chain.from_iterable(self._postings.get(bigram, ()) for bigram in bigrams))
+        return sorted(doc_id for doc_id, count in counts.items() if count >= needed)
@@ -0,0 +1,120 @@
+import threading
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from search_index import SearchCancelled
+
+
+class SearchWorker(QObject):
+    """Runs global catalog searches on a background thread.
+
+    Keystrokes are debounced on the GUI thread; once typing pauses, the
+    latest query is handed to a single worker thread. Each request bumps a
+    generation counter, so a search that is still running when a newer
+    query arrives stops at its next check and its results are dropped.
+    Results come back to the GUI thread in one resultsReady signal.
+
+    With a limit, searches are fuzzy and only the best limit matches are
+    returned (see OblivionDataLoader.search_catalog).
+    """
+
+    # generation, query, (command_results, item_results)
+    resultsReady = pyqtSignal(int, str, object)
+
+    def __init__(self, data_loader, debounce_ms=150, limit=None, parent=None):
+        super().__init__(parent)
+        self.data_loader = data_loader
+        self.limit = limit
+
+        self._generation = 0
+        self._pending_query = None
+        self._prepare_pending = False
+        self._condition = threading.Condition()
+        self._running = True
+
+        # Debounce timer lives on the GUI thread
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self._dispatch)
+        self._latest_query = ""
+
+        self._thread = threading.Thread(target=self._run, name="SearchWorker", daemon=True)
+        self._thread.start()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def request(self, query):
+        """Queue a search for query, cancelling any older one"""
+        with self._condition:
+            self._generation += 1
+            self._pending_query = None
+        self._latest_query = query
+        self._debounce_timer.start()
+
+    def prepare(self):
+        """Build the search index on the worker thread before the first search needs it"""
+        with self._condition:
+            self._prepare_pending = True
+            self._condition.notify()
+
+    def cancel(self):
+        """Cancel the pending and running searches without starting a new one"""
+        self._debounce_timer.stop()
+        with self._condition:
+            self._generation += 1
+            self._pending_query = None
+
+    def stop(self):
+        """Stop the worker thread"""
+        self.cancel()
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
+
+    def _dispatch(self):
+        """Hand the debounced query to the worker thread"""
+        with self._condition:
+            self._pending_query = (self._generation, self._latest_query)
+            self._condition.notify()
+
+    def _run(self):
+        """Worker loop: always search for the newest dispatched query"""
+        while True:
+            with self._condition:
+                while self._running and self._pending_query is None and not self._prepare_pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                if self._prepare_pending:
+                    self._prepare_pending = False
+                    job = None
+                else:
+                    job = self._pending_query
+                    self._pending_query = None
+
+            if job is None:
+                try:
+                    self.data_loader.build_search_index()
+                except Exception as e:
+                    print(f"Building the search index failed: {e}")
+                continue
+
+            generation, query = job
+
+            def is_cancelled():
+                return generation != self._generation
+
+            try:
+                results = self.data_loader.search_catalog(query, is_cancelled, self.limit)
+            except SearchCancelled:
+                continue
+            except Exception as e:
+                print(f"Search failed for '{query}': {e}")
+                continue
+
+            if not is_cancelled():
+                self.resultsReady.emit(generation, query, results)
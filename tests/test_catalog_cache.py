@@ -0,0 +1,136 @@
+"""The compiled catalog cache and the manifest that decides when it is stale.
+
+Each test loads a copy of a few stock data files into a scratch directory,
+so edits and deletions don't touch data/.
+
+    python -m pytest tests
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import json_loader
+from json_loader import OblivionDataLoader
+
+DATA_FILES = ("all armor ids.json", "all sigil stone ids.json", "all weapons ids.json",
+              "useful cheats.json")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(ROOT, "data", name), data_dir / name)
+    return data_dir
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count the loads that parsed the data files rather than using the cache"""
+    calls = []
+    compile_files = OblivionDataLoader._compile_files
+
+    def counting_compile_files(self, *args, **kwargs):
+        calls.append(self)
+        return compile_files(self, *args, **kwargs)
+
+    monkeypatch.setattr(OblivionDataLoader, "_compile_files", counting_compile_files)
+    return calls
+
+
+def load(data_dir):
+    loader = OblivionDataLoader(str(data_dir), cache_path=str(data_dir.parent / "catalog.cache"))
+    assert loader.load_all_json_data()
+    return loader
+
+
+def catalog(loader):
+    """Return everything the UI reads from the loader, as plain values"""
+    items = {category: [record.to_dict() for _, record in loader.get_category_items(category)]
+             for category in loader.category_index}
+    commands = {name: data.to_dict() for name, data in loader.commands.items()}
+    return items, commands
+
+
+def test_second_launch_uses_the_cache(data_dir, parses):
+    first = load(data_dir)
+    second = load(data_dir)
+
+    assert len(parses) == 1
+    assert catalog(second) == catalog(first)
+    assert second.find_by_form_id("0001EFCE") == first.find_by_form_id("0001EFCE")
+
+
+def test_cache_keeps_the_source_records(data_dir, parses):
+    load(data_dir)
+    loader = load(data_dir)
+
+    assert len(parses) == 1
+    _, armor = loader.get_category_items("Armor")[1]
+    assert set(armor["original_data"]) >= {"Rating", "Weight", "Value", "Enchantment", "Armor ID"}
+    _, stone = loader.get_category_items("Sigil Stones")[0]
+    assert [field for field in stone["original_data"] if field.endswith(" ID")] == [
+        "Descendent ID", "Subjacent ID", "Latent ID", "Ascendent ID", "Transcendent ID"]
+
+
+def test_new_mtime_with_same_content_is_a_hit(data_dir, parses, monkeypatch):
+    load(data_dir)
+    path = data_dir / "all weapons ids.json"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+    load(data_dir)
+    assert len(parses) == 1
+
+    # The hit refreshed the stored mtimes, so the next launch needs no hashing
+    monkeypatch.setattr(OblivionDataLoader, "_hash_file",
+                        lambda self, json_file: pytest.fail(f"hashed {json_file}"))
+    load(data_dir)
+    assert len(parses) == 1
+
+
+def test_same_size_edit_is_a_miss(data_dir, parses):
+    load(data_dir)
+    path = data_dir / "all weapons ids.json"
+    text = path.read_text(encoding="utf-8")
+    edited = text.replace('"Glass Claymore"', '"Glass Clayroom"')
+    assert edited != text and len(edited) == len(text)
+    path.write_text(edited, encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+    loader = load(data_dir)
+    assert len(parses) == 2
+    names = [record["name"] for _, record in loader.get_category_items("Weapons")]
+    assert "Glass Clayroom" in names and "Glass Claymore" not in names
+
+
+def test_deleted_file_is_a_miss(data_dir, parses):
+    load(data_dir)
+    os.remove(data_dir / "all armor ids.json")
+
+    loader = load(data_dir)
+    assert len(parses) == 2
+    assert "Armor" not in loader.category_index
+    assert len(loader.get_category_items("Armor")) == 0
+
+
+def test_old_cache_version_is_a_miss(data_dir, parses, monkeypatch):
+    load(data_dir)
+    monkeypatch.setattr(json_loader, "CACHE_FORMAT_VERSION", json_loader.CACHE_FORMAT_VERSION + 1)
+
+    load(data_dir)
+    assert len(parses) == 2
+
+
+def test_unreadable_cache_is_a_miss(data_dir, parses):
+    load(data_dir)
+    (data_dir.parent / "catalog.cache").write_bytes(b"not a pickle")
+
+    loader = load(data_dir)
+    assert len(parses) == 2
+    assert len(loader.get_category_items("Weapons")) > 0
@@ -0,0 +1,91 @@
+"""How OblivionDataLoader compiles the data files into its catalog.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from json_loader import COMMAND_CATEGORIES, OblivionDataLoader
+
+DATA_DIR = os.path.join(ROOT, "data")
+
+
+def catalog(loader):
+    """Return everything the UI reads from the loader, as plain values"""
+    items = {category: [record.to_dict() for _, record in loader.get_category_items(category)]
+             for category in loader.category_index}
+    commands = {category: [(name, data.to_dict()) for name, data in loader.get_category_commands(category)]
+                for category in loader.category_index}
+    form_ids = {form_id: [(loader.get_item(row)["name"], field) for row, field in matches]
+                for form_id, matches in loader.form_ids._entries.items()}
+    return items, commands, form_ids
+
+
+def test_worker_processes_give_the_same_catalog():
+    serial = OblivionDataLoader(DATA_DIR, use_cache=False)
+    assert serial.load_all_json_data(workers=0)
+    pooled = OblivionDataLoader(DATA_DIR, use_cache=False)
+    assert pooled.load_all_json_data(workers=2)
+
+    assert catalog(pooled) == catalog(serial)
+    assert len(pooled.items) == len(serial.items) > 0
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_lazy_load_merges_only_the_commands(tmp_path):
+    loader = OblivionDataLoader(DATA_DIR, cache_path=str(tmp_path / "catalog.cache"), lazy=True)
+    assert loader.load_all_json_data()
+
+    assert len(loader.items) == 0
+    assert loader.get_category_commands("Toggle")
+    # Counts come from the index, before anything is loaded
+    assert loader.get_category_count("Weapons") > 0
+
+    weapons = loader.get_category_items("Weapons")
+    assert len(weapons) == loader.get_category_count("Weapons")
+    assert len(loader.items) == len(weapons)
+
+
+def test_lazy_load_gives_the_same_catalog(tmp_path):
+    cache_path = str(tmp_path / "catalog.cache")
+    eager = OblivionDataLoader(DATA_DIR, cache_path=cache_path)
+    assert eager.load_all_json_data()
+
+    for use_cache in (False, True):
+        lazy = OblivionDataLoader(DATA_DIR, use_cache=use_cache, cache_path=cache_path, lazy=True)
+        assert lazy.load_all_json_data()
+        # Fault categories in out of catalog order
+        lazy.get_category_items("Sigil Stones")
+        lazy.get_category_items("Armor")
+        assert catalog(lazy) == catalog(eager)
+
+
+def test_lookups_load_every_category(tmp_path):
+    loader = OblivionDataLoader(DATA_DIR, cache_path=str(tmp_path / "catalog.cache"), lazy=True)
+    assert loader.load_all_json_data()
+
+    # A Sigil Stone tier ID, before Sigil Stones was asked for
+    assert [field for _, field in loader.find_by_form_id("00041FB1")] == ["Descendent ID"]
+    _, items = loader.search_catalog("glass longsword")
+    assert "Glass Longsword" in [result["name"] for result in items]
+
+
+def test_prefetch_loads_the_rest_in_the_background(tmp_path):
+    loader = OblivionDataLoader(DATA_DIR, cache_path=str(tmp_path / "catalog.cache"), lazy=True)
+    assert loader.load_all_json_data()
+    total = sum(loader.get_category_count(category) for category in loader.category_index
+                if category not in COMMAND_CATEGORIES)
+
+    loader.prefetch_categories(["Keys"])
+    wait_for(lambda: len(loader.items) == total)
+    assert loader.get_category_items("Keys")[0][0] == 0
@@ -0,0 +1,201 @@
+"""Console sessions sent one after another into the loopback game.
+
+The game keeps focus after a session, so the next one must not Alt+Tab
+away from it. Runs on the loopback backend's virtual clock with the
+game's latencies; nothing is typed anywhere.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QEventLoop
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_backends
+import game_connector
+from command_dispatcher import BULK, CommandDispatcher
+from game_backends import LoopbackBackend
+from input_timing import TimingProfile
+from perf_metrics import StageMetrics
+
+SKILLS = [f'player.setav "{name}" 100' for name in (
+    "Acrobatics", "Alchemy", "Alteration", "Armorer", "Athletics", "Blade", "Block",
+    "Blunt", "Conjuration", "Destruction")]
+
+
+@pytest.fixture
+def game(monkeypatch):
+    game = LoopbackBackend(focus_latency=0.3, open_latency=0.25, key_time=0.002,
+                           virtual_clock=True)
+    switches = []
+    switch_window = game.switch_window
+    game.switch_window = lambda: (switches.append(game.now()), switch_window())
+    game.switches = switches
+
+    monkeypatch.setattr(game_backends, "_backend", game)
+    monkeypatch.setattr(game_connector, "_timing_profile",
+                        TimingProfile(path=None, sleep=game.sleep))
+    monkeypatch.setattr(game_connector, "is_game_running", lambda *args, **kwargs: True)
+    monkeypatch.setattr(game_connector, "DISPATCH_MODE", "type")
+    return game
+
+
+def sent(results):
+    return [success for _, success in results]
+
+
+def run_dispatcher(dispatcher, finished, count):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    deadline = time.perf_counter() + 10
+    while len(finished) < count and time.perf_counter() < deadline:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+
+def test_back_to_back_sessions(game):
+    first = game_connector.send_commands_to_game(SKILLS)
+    second = game_connector.send_commands_to_game(["tgm", "tcl"])
+
+    assert sent(first + second) == [True] * (len(SKILLS) + 2)
+    assert game.received() == SKILLS + ["tgm", "tcl"]
+    assert game.dropped == 0
+    # The second session found the game focused and stayed there
+    assert len(game.switches) == 1
+    assert game.has_focus()
+
+
+def test_session_after_clicking_the_app(game):
+    game_connector.send_commands_to_game(["tgm"])
+    game.click_app()
+    game_connector.send_commands_to_game(["tcl"])
+
+    assert game.received() == ["tgm", "tcl"]
+    assert game.dropped == 0
+    assert len(game.switches) == 2
+
+
+def test_no_focus_sends_nothing(game):
+    # Slower than every focus delay: the switch never visibly lands
+    game.focus_latency = 60.0
+    results = game_connector.send_commands_to_game(["tgm", "tcl"])
+
+    assert sent(results) == [False, False]
+    assert game.received() == []
+    assert game.dropped == 0
+
+
+def test_bulk_job_with_interactive_job_is_one_session(game):
+    dispatcher = CommandDispatcher()
+    finished = {}
+    jobs = {}
+
+    # Click a command in the app while the third bulk line is being sent
+    submit = game.submit
+
+    def submit_line():
+        submit()
+        if len(game.commands) == 3 and "tgm" not in jobs:
+            jobs["tgm"] = dispatcher.submit(["tgm"])
+
+    game.submit = submit_line
+    dispatcher.jobFinished.connect(lambda job_id, results, context: finished.update({job_id: results}))
+    try:
+        jobs["bulk"] = dispatcher.submit(SKILLS, lane=BULK)
+        run_dispatcher(dispatcher, finished, 2)
+    finally:
+        dispatcher.stop()
+
+    assert sent(finished[jobs["bulk"]]) == [True] * len(SKILLS)
+    assert sent(finished[jobs["tgm"]]) == [True]
+    assert game.received() == SKILLS[:3] + ["tgm"] + SKILLS[3:]
+    assert game.dropped == 0
+    assert len(game.switches) == 1
+
+
+def test_stages_leave_out_the_waits(monkeypatch):
+    # A real clock this time, with every wait far longer than any input call
+    game = LoopbackBackend()
+    timing = TimingProfile(path=None)
+    timing.delays = dict.fromkeys(timing.delays, 0.1)
+    stages = StageMetrics()
+    monkeypatch.setattr(game_backends, "_backend", game)
+    monkeypatch.setattr(game_connector, "_timing_profile", timing)
+    monkeypatch.setattr(game_connector, "metrics", stages)
+    monkeypatch.setattr(game_connector, "is_game_running", lambda *args, **kwargs: True)
+    monkeypatch.setattr(game_connector, "DISPATCH_MODE", "type")
+
+    assert sent(game_connector.send_commands_to_game(["tgm", "tcl"])) == [True, True]
+
+    snapshot = stages.snapshot()
+    for stage in ("focus", "console_open", "typing", "submit", "console_close"):
+        assert snapshot[stage]["count"] > 0
+        assert snapshot[stage]["max_ms"] < 50, stage
+    # focus_settle, console_open, 4 paces and console_close
+    assert snapshot["session"]["min_ms"] >= 700
+
+
+@pytest.fixture
+def script_game(game, monkeypatch, tmp_path):
+    monkeypatch.setattr(game_connector, "DISPATCH_MODE", "auto")
+    monkeypatch.setattr(game_connector, "game_directory", lambda: str(tmp_path))
+    game.directory = tmp_path
+    return game
+
+
+def test_long_jobs_run_as_scripts(script_game):
+    commands = SKILLS * 2 + ["tgm"]
+    results = game_connector.send_commands(commands)
+
+    assert sent(results) == [game_connector.SENT_IN_SCRIPT] * len(commands)
+    lines = script_game.received()
+    assert len(lines) == 3 and all(line.startswith("bat ") for line in lines)
+    scripts = [(script_game.directory / (line[4:] + game_connector.SCRIPT_EXTENSION))
+               .read_text(encoding="utf-8").splitlines() for line in lines]
+    assert scripts == [SKILLS, SKILLS, ["tgm"]]
+
+
+def test_cancel_stops_between_scripts(script_game):
+    dispatcher = CommandDispatcher()
+    finished = {}
+    dispatcher.jobFinished.connect(lambda job_id, results, context: finished.update({job_id: results}))
+
+    # Cancel once the first script's bat line has gone in
+    submit = script_game.submit
+
+    def submit_line():
+        submit()
+        dispatcher.cancel_bulk()
+
+    script_game.submit = submit_line
+    try:
+        job_id = dispatcher.submit(SKILLS * 3, lane=BULK)
+        run_dispatcher(dispatcher, finished, 1)
+    finally:
+        dispatcher.stop()
+
+    assert sent(finished[job_id]) == [game_connector.SENT_IN_SCRIPT] * 10 + [None] * 20
+    assert len(script_game.received()) == 1
+
+
+def test_both_lanes_are_bounded():
+    release = threading.Event()
+
+    def send_batch(commands, **callbacks):
+        release.wait(10)
+        return [(command, True) for command in commands]
+
+    dispatcher = CommandDispatcher(send_batch, max_pending=20, max_interactive=3)
+    try:
+        assert dispatcher.submit(["tgm"]) is not None
+        assert dispatcher.submit(["tcl", "tmm 1"]) is not None
+        assert dispatcher.submit(["tai"]) is None
+        assert dispatcher.submit(SKILLS * 2, lane=BULK) is not None
+        assert dispatcher.submit(["tgm"], lane=BULK) is None
+        assert dispatcher.pending() == 23
+    finally:
+        release.set()
+        dispatcher.stop()
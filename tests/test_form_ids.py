@@ -0,0 +1,74 @@
+"""FormID lookups, and which queries the search takes for a FormID.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from formid_index import looks_like_form_id, normalize_form_id
+from json_loader import OblivionDataLoader
+
+
+@pytest.fixture(scope="module")
+def loader():
+    loader = OblivionDataLoader(os.path.join(ROOT, "data"), use_cache=False)
+    assert loader.load_all_json_data()
+    return loader
+
+
+def names(matches):
+    return [(record["name"], field) for record, field in matches]
+
+
+def test_normalize_form_id():
+    assert normalize_form_id("000ca154") == normalize_form_id(" 0xCA154 ") == "CA154"
+    assert normalize_form_id("00000000") == "0"
+    assert normalize_form_id("player") is None
+    assert normalize_form_id("123456789") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0xF", True), ("0000000F", True), ("ca154", True), ("0007588e", True),
+    ("f", False), ("a", False), ("bed", False), ("dead", False), ("face", False),
+    ("faced", False), ("1234", False), ("0x", False), ("tgm", False),
+])
+def test_looks_like_form_id(text, expected):
+    assert looks_like_form_id(text) is expected
+
+
+def test_every_sigil_stone_tier_resolves(loader):
+    _, stone = loader.get_category_items("Sigil Stones")[0]
+    for field, value in stone["original_data"].items():
+        if field.endswith(" ID"):
+            assert names(loader.find_by_form_id(value)) == [(stone["name"], field)]
+            assert loader.is_known_form_id(value.lower().lstrip("0"))
+
+
+def test_typed_form_id_goes_first(loader):
+    for query in ("0000000f", "0xF"):
+        _, items = loader.search_catalog(query)
+        assert items[0]["name"] == "Gold"
+
+
+def test_short_hex_words_are_text_searches(loader):
+    # "f" and "a" are the FormIDs of Gold and Lockpick
+    for query, name in (("f", "Gold"), ("a", "Lockpick")):
+        _, items = loader.search_catalog(query)
+        assert items[0]["name"] != name
+
+
+def test_pasted_command_resolves(loader):
+    assert names(loader.resolve_pasted_id("player.additem 0007588E 5")) == [
+        ("Orange", "Ingredient ID")]
+    # Neither the count nor a word that happens to be hex is an ID
+    assert loader.resolve_pasted_id("player.additem f 1") == []
+
+    # The search box ranks fuzzily, with a limit
+    for limit in (None, 50):
+        _, items = loader.search_catalog("player.additem 0007588E 5", limit=limit)
+        assert items[0]["name"] == "Orange"
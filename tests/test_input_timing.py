@@ -0,0 +1,114 @@
+"""TimingProfile: how the input delays adapt, with sleeps recorded instead of waited.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import input_timing
+from input_timing import (BACKOFF_FACTOR, CALIBRATION_SCALES, DEFAULT_DELAYS, MAX_SCALE,
+                          MIN_SCALE, SHRINK_AFTER, SHRINK_FACTOR, TimingProfile)
+
+
+@pytest.fixture
+def slept():
+    return []
+
+
+@pytest.fixture
+def profile(slept):
+    return TimingProfile(path=None, sleep=slept.append)
+
+
+def test_sleep_uses_the_current_delay(profile, slept):
+    profile.sleep("console_open")
+    profile.delays["console_open"] = 0.2
+    profile.sleep("console_open")
+    assert slept == [DEFAULT_DELAYS["console_open"], 0.2]
+
+
+def test_shrinks_after_a_streak(profile):
+    for _ in range(SHRINK_AFTER - 1):
+        profile.record_success()
+    assert profile.delays == DEFAULT_DELAYS
+
+    profile.record_success()
+    assert profile.delay("focus_switch") == pytest.approx(DEFAULT_DELAYS["focus_switch"] * SHRINK_FACTOR)
+    assert profile.delay("focus_settle") == pytest.approx(DEFAULT_DELAYS["focus_settle"] * SHRINK_FACTOR)
+    # The console can't be watched, so its delays stay put
+    assert profile.delay("console_open") == DEFAULT_DELAYS["console_open"]
+
+
+def test_late_stage_backs_off_and_restarts_the_streak(profile):
+    for _ in range(SHRINK_AFTER - 1):
+        profile.record_success()
+    profile.record_late("focus_switch")
+    assert profile.delay("focus_switch") == pytest.approx(DEFAULT_DELAYS["focus_switch"] * BACKOFF_FACTOR)
+    assert profile.delay("focus_settle") == DEFAULT_DELAYS["focus_settle"]
+
+    profile.record_success()
+    assert profile.delay("focus_switch") == pytest.approx(DEFAULT_DELAYS["focus_switch"] * BACKOFF_FACTOR)
+
+
+def test_failures_clamp_at_the_maximum(profile):
+    for _ in range(20):
+        profile.record_failure()
+    assert profile.delays == pytest.approx({name: value * MAX_SCALE
+                                            for name, value in DEFAULT_DELAYS.items()})
+
+
+def test_successes_clamp_at_the_minimum(profile):
+    for _ in range(SHRINK_AFTER * 50):
+        profile.record_success()
+    assert profile.delay("focus_switch") == pytest.approx(DEFAULT_DELAYS["focus_switch"] * MIN_SCALE)
+
+
+def test_wait_until_ends_early(profile, slept):
+    answers = iter([False, False, True])
+    assert profile.wait_until("focus_switch", lambda: next(answers), interval=0.1) is True
+    assert slept == [0.1, 0.1]
+
+
+def test_wait_until_waits_out_an_unknown(profile, slept):
+    assert profile.wait_until("focus_switch", lambda: None) is None
+    assert slept == [DEFAULT_DELAYS["focus_switch"]]
+
+
+def test_calibrate_keeps_a_margin(profile):
+    # Every scale from 0.35 down fails
+    def trial():
+        return profile.delay("line") >= DEFAULT_DELAYS["line"] * 0.5
+
+    chosen = profile.calibrate(trial, attempts=2, margin=1.25)
+    assert chosen == pytest.approx(0.5 * 1.25)
+    assert profile.delay("console_open") == pytest.approx(DEFAULT_DELAYS["console_open"] * 0.625)
+    assert profile.calibrated is not None
+
+
+def test_calibrate_keeps_the_defaults_without_margin(profile):
+    # Only the defaults work: they are already the slowest scale tried
+    chosen = profile.calibrate(lambda: profile.delay("line") >= DEFAULT_DELAYS["line"])
+    assert chosen == CALIBRATION_SCALES[0]
+    assert profile.delays == pytest.approx(DEFAULT_DELAYS)
+
+
+def test_calibrate_falls_back_to_the_slowest(profile):
+    chosen = profile.calibrate(lambda: False)
+    assert chosen == MAX_SCALE
+    assert profile.delays == pytest.approx({name: value * MAX_SCALE
+                                            for name, value in DEFAULT_DELAYS.items()})
+
+
+def test_saved_profile_is_per_machine(tmp_path, monkeypatch):
+    path = str(tmp_path / "timing.json")
+    profile = TimingProfile(path)
+    profile.record_failure()
+    # Saved to four decimal places
+    assert TimingProfile.load(path).delays == pytest.approx(profile.delays, abs=1e-4)
+
+    monkeypatch.setattr(input_timing.platform, "node", lambda: "another-machine")
+    assert TimingProfile.load(path).delays == DEFAULT_DELAYS
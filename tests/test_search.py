@@ -0,0 +1,153 @@
+"""The global search index: substring parity, fuzzy ranking and typo matching.
+
+Search results are checked against brute-force scans of the same
+documents, so the posting lists, candidate narrowing and score bands
+must never lose or reorder a match.
+
+    python -m pytest tests
+"""
+import heapq
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fuzzy_search import (SUBSEQUENCE_SCORE, SUBSTRING_SCORE, bounded_edit_distance,
+                          normalize_key, subsequence_score, substring_score, typo_score)
+from json_loader import OblivionDataLoader
+from search_index import SearchIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    loader = OblivionDataLoader(os.path.join(ROOT, "data"), use_cache=False)
+    assert loader.load_all_json_data()
+    loader.build_search_index()
+    return loader.search_index
+
+
+def brute_force_ids(index, query):
+    query = query.lower()
+    return [doc_id for doc_id, text in enumerate(index._texts) if query in text]
+
+
+def brute_force_score(index, normalized, doc_id):
+    """The best band a document qualifies for, scored on its own"""
+    key, text = index._keys[doc_id], index._texts[doc_id]
+    if normalized in key or normalized in text:
+        return substring_score(normalized, key, text)
+    position = -1
+    for char in normalized:
+        position = key.find(char, position + 1)
+        if position < 0:
+            break
+    else:
+        # The characters are all in the name, in order: a subsequence
+        # match, or none at all if they are too scattered
+        return subsequence_score(normalized, key)
+    return typo_score(normalized.split(), key)
+
+
+def brute_force_ranked(index, query, limit):
+    normalized = normalize_key(query)
+    scored = ((brute_force_score(index, normalized, doc_id), doc_id)
+              for doc_id in range(len(index)))
+    best = heapq.nlargest(limit, ((score, -doc_id) for score, doc_id in scored
+                                  if score is not None))
+    return [(score, index.documents[-negative_id]) for score, negative_id in best]
+
+
+def typed(text):
+    """Every prefix of text, as it is typed"""
+    return [text[:end] for end in range(1, len(text) + 1)]
+
+
+def test_substring_search_matches_a_scan(index):
+    # Typing, backspacing, then replacing the text
+    sequence = (typed("glass longsword") + typed("glass longsword")[::-1]
+                + typed("iron") + ["ro", "r", "0001", "x"] + typed("potion of"))
+    for query in sequence:
+        assert index.search_ids(query) == brute_force_ids(index, query), query
+
+
+def test_name_candidates_match_a_scan(index):
+    for query in typed("elven bow") + ["elv", "bow", "n b"]:
+        normalized = normalize_key(query)
+        expected = [doc_id for doc_id, key in enumerate(index._keys) if normalized in key]
+        assert index._name_candidates(normalized) == expected, query
+
+
+@pytest.mark.parametrize("query", ["glass", "akavri", "daedirc", "potn of hlth", "iron dagger"])
+@pytest.mark.parametrize("limit", [5, 50, 100000])
+def test_ranking_matches_a_scan(index, query, limit):
+    assert index.search_ranked(query, limit) == brute_force_ranked(index, query, limit)
+
+
+def test_bands_are_ordered(index):
+    results = index.search_ranked("iron", 100000)
+    scores = [score for score, _ in results]
+    assert scores == sorted(scores, reverse=True)
+    # Substring matches first, then subsequences, then typos
+    bands = [2 if score >= SUBSTRING_SCORE else 1 if score >= SUBSEQUENCE_SCORE else 0
+             for score in scores]
+    assert bands == sorted(bands, reverse=True)
+    assert bands[0] == 2
+
+
+def test_fuzzy_queries_find_their_items(index):
+    def ranked(query):
+        return [(score, index._keys[index.documents.index(document)])
+                for score, document in index.search_ranked(query, 10)]
+
+    # A subsequence of "Akaviri" (and of the game's own "Akavari")
+    results = ranked("akavri")
+    assert results and all(SUBSEQUENCE_SCORE <= score < SUBSTRING_SCORE for score, _ in results)
+    assert all(key.startswith("akav") for _, key in results)
+    # Two letters swapped: only the typo band finds it
+    results = ranked("daedirc")
+    assert results and all(score < SUBSEQUENCE_SCORE for score, _ in results)
+    assert all(key.startswith("daedric ") for _, key in results)
+
+
+def test_added_documents_invalidate_the_last_candidates():
+    index = SearchIndex()
+    index.add_document("iron", ["Iron Dagger"])
+    assert index.search_ids("iro") == [0]
+    assert [document for _, document in index.search_ranked("iro", 10)] == ["iron"]
+
+    index.add_document("ironwood", ["Ironwood Bow"])
+    # Longer queries can't narrow candidates from before the new document
+    assert index.search_ids("iron") == [0, 1]
+    assert sorted(document for _, document in index.search_ranked("iron", 10)) == ["iron", "ironwood"]
+    assert index._subsequence_candidates("irnw") == [1]
+
+
+def test_unrelated_query_does_not_narrow():
+    index = SearchIndex()
+    index.add_document("dagger", ["Iron Dagger"])
+    index.add_document("bow", ["Elven Bow"])
+    assert index.search_ids("dag") == [0]
+    # "bow" doesn't contain "dag", so the last candidates are not reused
+    assert index._previous_candidates("text", "bow") is None
+    assert index.search_ids("bow") == [1]
+    assert index._previous_candidates("text", "dagx") is None
+    assert index._previous_candidates("text", "bowl") == [1]
+
+
+@pytest.mark.parametrize("a, b, limit, expected", [
+    ("daedric", "daedric", 2, 0),
+    ("daedirc", "daedric", 2, 1),     # one swap of neighbours
+    ("akaviri", "akavrii", 1, 1),
+    ("abcd", "badc", 2, 2),           # two separate swaps
+    ("kitten", "sitting", 3, 3),
+    ("kitten", "sitting", 2, None),
+    ("glass", "gls", 2, 2),
+    ("glass", "g", 2, None),          # too far apart in length alone
+    ("", "ab", 2, 2),
+])
+def test_bounded_edit_distance(a, b, limit, expected):
+    assert bounded_edit_distance(a, b, limit) == expected
+    assert bounded_edit_distance(b, a, limit) == expected